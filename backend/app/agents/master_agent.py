@@ -1,31 +1,86 @@
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel
-from typing import Annotated
+from typing import Annotated, Callable, Dict, List, Optional
+import asyncio
 import json
 import operator
+import uuid
 from app.utils.schemas import RouterOutput, SynthOutput
 from app.utils.prompts import MASTER_AGENT_ROUTER_PROMPT, SYNTH_PROMPT
 from app.agents import (report_generator_agent, web_intel_agent)
 from app.config.settings import settings
-from openai import OpenAI
-# Initialize OpenAI client with Gemini API
-client = OpenAI(
-    api_key=settings.GOOGLE_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+from app.utils.progress_events import emit_progress
+from app.utils.metrics import track_node
+from app.utils.llm_gateway import llm_gateway
 
 
 
+# Router agent names -> graph nodes, and the result key each node writes
+AGENT_NODES = {
+    "Web Intelligence Agent": "web_intel",
+    "Report Generator Agent": "report_generator",
+}
+RESULT_KEYS = {
+    "web_intel": "web_intel",
+    "report_generator": "report",
+}
+# Nodes that consume another node's results; everything else fans out in parallel
+AGENT_DEPENDENCIES = {
+    "report_generator": ["web_intel"],
+}
+
+# Web intel runs started speculatively by the router, keyed by run_id
+_speculative_web_intel: Dict[str, asyncio.Task] = {}
+
+
 class MasterState(BaseModel):
     """State for the master agent workflow"""
+    run_id: str = ""
     query: str = ""
+    # Bypass the connector result cache
+    fresh: bool = False
     selected_agents: list = []
     routing_reason: str = ""
-    results: dict = {}
+    # Parallel agent branches each contribute their own key
+    results: Annotated[dict, operator.or_] = {}
     final_output: SynthOutput | None = None
 
 
-def router_node(state: MasterState) -> dict:
+def _start_speculative_web_intel(state: MasterState):
+    """
+    Starts the web intelligence agent (tool-call LLM + connector scrape)
+    before routing is decided, since it only needs the raw query.
+    """
+    if not settings.SPECULATIVE_WEB_INTEL or not state.run_id:
+        return
+    _speculative_web_intel[state.run_id] = asyncio.create_task(
+        web_intel_agent.run_web_intel_agent(state.query, fresh=state.fresh)
+    )
+
+
+def _cancel_speculative_web_intel(run_id: str):
+    task = _speculative_web_intel.pop(run_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+
+
+async def router_node(state: MasterState) -> dict:
+    """
+    Routes the query while the web intelligence agent is already running
+    speculatively; the speculative run is cancelled if it is not selected.
+    """
+    _start_speculative_web_intel(state)
+    try:
+        routing = await _route_query(state)
+    except BaseException:
+        _cancel_speculative_web_intel(state.run_id)
+        raise
+    if "Web Intelligence Agent" not in routing["selected_agents"]:
+        _cancel_speculative_web_intel(state.run_id)
+    return routing
+
+
+async def _route_query(state: MasterState) -> dict:
     """
     Routes the query to appropriate agents based on content analysis.
     Returns selected agents and reasoning.
@@ -45,12 +100,16 @@ Query: {state.query}
 
 {MASTER_AGENT_ROUTER_PROMPT}"""
     
-    response = client.chat.completions.create(
+    # Routing should not vary between runs of the same query; temperature 0
+    # also lets the gateway cache it
+    response = await llm_gateway.chat(
+        "router",
         model="gemini-3-flash-preview",
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message}
-        ]
+        ],
+        temperature=0.0
     )
     
     try:
@@ -81,47 +140,77 @@ Query: {state.query}
         }
 
 
-def web_intel_node(state: MasterState) -> dict:
+async def web_intel_node(state: MasterState) -> dict:
     """
-    Calls the web intelligence agent to gather web-based information.
+    Calls the web intelligence agent to gather web-based information,
+    reusing the run the router started speculatively when there is one.
     """
-    if "Web Intelligence Agent" not in state.selected_agents:
-        return {"results": state.results}
-    
-    # Call web intelligence agent
-    web_result = web_intel_agent.run_web_intel_agent(state.query)
+    task = _speculative_web_intel.pop(state.run_id, None)
+    if task is not None:
+        web_result = await task
+    else:
+        web_result = await web_intel_agent.run_web_intel_agent(state.query, fresh=state.fresh)
     
-    results = state.results.copy()
-    # Convert SynthOutput to dict for JSON serialization
-    results["web_intel"] = web_result
-    
-    return {"results": results}
+    return {"results": {"web_intel": web_result}}
 
 
-def report_generator_node(state: MasterState) -> dict:
+async def report_generator_node(state: MasterState) -> dict:
     """
     Calls the report generator agent to create a comprehensive report.
     """
-    if "Report Generator Agent" not in state.selected_agents:
-        return {"results": state.results}
-    
     # Prepare context from previous results
     context = json.dumps(state.results) if state.results else "No previous data"
     
     # Call report generator agent
-    report_result = report_generator_agent.run_report_generator_agent(
+    report_result = await report_generator_agent.run_report_generator_agent(
         state.query, 
         context
     )
     
-    results = state.results.copy()
     # Convert SynthOutput to dict for JSON serialization
-    results["report"] = report_result.model_dump()
+    return {"results": {"report": report_result.model_dump()}}
+
+
+def _parse_synth_content(content: str) -> SynthOutput:
+    """Builds a SynthOutput from model text that should contain a JSON object"""
+    # CRITICAL: Defensive null check prevents NoneType.find() crash
+    if not content:
+        return SynthOutput(
+            final_summary="No response from model",
+            recommendations="Please try again.",
+            tables=[],
+            charts=[]
+        )
     
-    return {"results": results}
+    try:
+        # Try to extract JSON
+        start_idx = content.find('{')
+        end_idx = content.rfind('}') + 1
+        if start_idx >= 0 and end_idx > start_idx:
+            json_str = content[start_idx:end_idx]
+            result = json.loads(json_str)
+            return SynthOutput(
+                final_summary=result.get("final_summary", content),
+                recommendations=result.get("recommendations", ""),
+                tables=result.get("tables", []),
+                charts=result.get("charts", [])
+            )
+        return SynthOutput(
+            final_summary=content,
+            recommendations="",
+            tables=[],
+            charts=[]
+        )
+    except (json.JSONDecodeError, ValueError):
+        return SynthOutput(
+            final_summary=content or "Error processing query",
+            recommendations="",
+            tables=[],
+            charts=[]
+        )
 
 
-def synthesizer_node(state: MasterState) -> dict:
+async def synthesizer_node(state: MasterState) -> dict:
     """
     Synthesizes results from all agents into final output.
     """
@@ -143,7 +232,14 @@ Agent Results:
 
 Provide a comprehensive final summary with recommendations."""
     
-    response = client.chat.completions.create(
+    # Stream the completion so partial tokens reach the progress stream. The
+    # prompt carries every agent result, so a cache hit means the same
+    # evidence; replaying the earlier synthesis keeps a repeated analysis
+    # consistent while the model keeps its default sampling
+    content = await llm_gateway.stream_chat(
+        "synth",
+        lambda delta: emit_progress({"event": "token", "node": "synthesizer", "delta": delta}),
+        cache=True,
         model="gemini-3-flash-preview",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -151,91 +247,151 @@ Provide a comprehensive final summary with recommendations."""
         ]
     )
     
-    try:
-        content = response.choices[0].message.content
-        
-        # CRITICAL: Defensive null check prevents NoneType.find() crash
-        if not content:
-            return {
-                "final_output": SynthOutput(
-                    final_summary="No response from model",
-                    recommendations="Please try again.",
-                    tables=[],
-                    charts=[]
-                )
-            }
-        
-        # Try to extract JSON
-        start_idx = content.find('{')
-        end_idx = content.rfind('}') + 1
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = content[start_idx:end_idx]
-            result = json.loads(json_str)
-            final_output = SynthOutput(
-                final_summary=result.get("final_summary", content),
-                recommendations=result.get("recommendations", ""),
-                tables=result.get("tables", []),
-                charts=result.get("charts", [])
-            )
-        else:
-            final_output = SynthOutput(
-                final_summary=content,
-                recommendations="",
-                tables=[],
-                charts=[]
-            )
-        
-        return {"final_output": final_output}
-    except (json.JSONDecodeError, ValueError):
-        return {
-            "final_output": SynthOutput(
-                final_summary=response.choices[0].message.content or "Error processing query",
-                recommendations="",
-                tables=[],
-                charts=[]
-            )
-        }
+    return {"final_output": _parse_synth_content(content)}
+
+
+async def collect_node(state: MasterState) -> dict:
+    """Join point: deferred until every selected agent branch has finished."""
+    return {}
+
+
+async def single_output_node(state: MasterState) -> dict:
+    """
+    Used instead of the synthesizer when exactly one agent produced
+    output: there is nothing to combine, so that output is final.
+    """
+    if "report" in state.results:
+        return {"final_output": SynthOutput(**state.results["report"])}
+    
+    web_result = state.results.get("web_intel", {})
+    content = web_result.get("result") or web_result.get("response") or ""
+    return {"final_output": _parse_synth_content(content)}
+
+
+def _selected_nodes(state: MasterState) -> List[str]:
+    nodes = []
+    for agent in state.selected_agents:
+        node = AGENT_NODES.get(agent)
+        if node and node not in nodes:
+            nodes.append(node)
+    return nodes
+
+
+def route_after_router(state: MasterState) -> List[str]:
+    """Fans out to every selected agent whose dependencies are not selected"""
+    selected = _selected_nodes(state)
+    ready = [
+        node for node in selected
+        if not any(dep in selected for dep in AGENT_DEPENDENCIES.get(node, []))
+    ]
+    return ready or ["collect"]
+
+
+def _route_after(finished: str):
+    """Routes a finished agent to the selected agents that depend on it"""
+    def route(state: MasterState) -> List[str]:
+        selected = _selected_nodes(state)
+        dependents = [node for node in selected if finished in AGENT_DEPENDENCIES.get(node, [])]
+        return dependents or ["collect"]
+    return route
+
+
+def route_to_output(state: MasterState) -> str:
+    return "single_output" if len(state.results) == 1 else "synthesizer"
+
+
+def _tracked(name: str, node_fn):
+    """
+    Wraps a node so that it reports start/finish events on the graph's
+    custom stream and records its latency.
+    """
+    async def wrapper(state: MasterState) -> dict:
+        emit_progress({"event": "node_started", "node": name})
+        try:
+            with track_node(name):
+                return await node_fn(state)
+        finally:
+            emit_progress({"event": "node_finished", "node": name})
+
+    wrapper.__name__ = node_fn.__name__
+    return wrapper
 
 
 # Build the graph
 graph = StateGraph(MasterState)
 
 # Add nodes
-graph.add_node("router", router_node)
-graph.add_node("web_intel", web_intel_node)
-graph.add_node("report_generator", report_generator_node)
-graph.add_node("synthesizer", synthesizer_node)
+graph.add_node("router", _tracked("router", router_node))
+graph.add_node("web_intel", _tracked("web_intel", web_intel_node))
+graph.add_node("report_generator", _tracked("report_generator", report_generator_node))
+graph.add_node("collect", collect_node, defer=True)
+graph.add_node("synthesizer", _tracked("synthesizer", synthesizer_node))
+graph.add_node("single_output", _tracked("single_output", single_output_node))
 
-# Add edges
+# Add edges: the router's selection drives which agents run
 graph.set_entry_point("router")
-graph.add_edge("router", "web_intel")
-graph.add_edge("web_intel", "report_generator")
-graph.add_edge("report_generator", "synthesizer")
+graph.add_conditional_edges("router", route_after_router, ["web_intel", "report_generator", "collect"])
+graph.add_conditional_edges("web_intel", _route_after("web_intel"), ["report_generator", "collect"])
+graph.add_conditional_edges("report_generator", _route_after("report_generator"), ["collect"])
+graph.add_conditional_edges("collect", route_to_output, ["synthesizer", "single_output"])
 graph.add_edge("synthesizer", END)
+graph.add_edge("single_output", END)
 
 # Compile the graph
 master_chain = graph.compile()
 
 
+async def _stream_graph(state: MasterState, on_stage=None, on_event=None):
+    """
+    Runs the graph through LangGraph's async streaming interface,
+    forwarding custom progress events and returning the final state.
+    """
+    final_state = None
+    async for mode, chunk in master_chain.astream(state, stream_mode=["values", "custom"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        if on_stage and chunk.get("event") in ("node_started", "node_finished"):
+            on_stage(chunk["node"], chunk["event"].split("_", 1)[1])
+        if on_event:
+            on_event(chunk)
+    return final_state
+
+
 # PUBLIC ENTRY FUNCTION
-async def run_master_agent(query: str):
+async def run_master_agent(
+    query: str,
+    on_stage: Optional[Callable[[str, str], None]] = None,
+    on_event: Optional[Callable[[dict], None]] = None,
+    fresh: bool = False
+):
     """
     Main entry point for the master agent.
     
     Args:
         query: The user query to process
+        on_stage: Optional callback invoked as on_stage(node_name, event)
+            with event "started" or "finished" for every graph node
+        on_event: Optional callback receiving every progress event (node
+            start/finish, per-source scrape counts, synthesizer tokens)
+        fresh: Re-scrape every source instead of using cached results
         
     Returns:
         Final SynthOutput with results
     """
-    state = MasterState(query=query)
+    state = MasterState(run_id=str(uuid.uuid4()), query=query, fresh=fresh)
     
     try:
-        # Run the workflow synchronously and return result
-        final_state = master_chain.invoke(state)
+        # Every node awaits its LLM and scraping calls, so the workflow
+        # runs on the event loop without blocking other requests
+        final_state = await _stream_graph(state, on_stage, on_event)
         
         # Handle both dict and object returns from invoke
-        if isinstance(final_state, dict):
+        if final_state is None:
+            final_output = None
+        elif isinstance(final_state, dict):
             final_output = final_state.get("final_output")
         else:
             final_output = final_state.final_output
@@ -259,4 +415,6 @@ async def run_master_agent(query: str):
             tables=[],
             charts=[]
         )
-
+    finally:
+        # Never leave a speculative run behind (e.g. when the graph errored)
+        _cancel_speculative_web_intel(state.run_id)
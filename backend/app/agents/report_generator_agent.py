@@ -2,14 +2,7 @@ from pydantic import BaseModel
 from typing import List
 import json
 from app.utils.schemas import SynthOutput, TableSpec, ChartSpec
-from app.config.settings import settings
-from openai import OpenAI
-
-
-client = OpenAI(
-    api_key=settings.GOOGLE_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+from app.utils.llm_gateway import llm_gateway
 
 
 class ReportState(BaseModel):
@@ -20,7 +13,7 @@ class ReportState(BaseModel):
     final_report: str = ""
 
 
-def run_report_generator_agent(query: str, context: str = "") -> SynthOutput:
+async def run_report_generator_agent(query: str, context: str = "") -> SynthOutput:
     """
     Report Generator Agent - Creates comprehensive reports based on data.
     
@@ -50,7 +43,11 @@ Format the response as JSON with:
 {{"final_summary": "summary text", "recommendations": "recommendations text", "tables": [], "charts": []}}
 """
         
-        response = client.chat.completions.create(
+        # Cached like the synthesizer: the context carries the evidence, so an
+        # identical request replays the report written from it
+        response = await llm_gateway.chat(
+            "report",
+            cache=True,
             model="gemini-3-flash-preview",
             messages=[
                 {"role": "user", "content": message}
@@ -1,16 +1,13 @@
-from openai import OpenAI
-from app.config.settings import settings
+import asyncio
 import json
-from app.tools.web_tools import search_all
+from app.tools.web_tools import astream_search_all, merge_source_results
 from app.utils.prompts import WEB_INTEL_SYSTEM_PROMPT, WEB_INTEL_SUMMARY_PROMPT, MASTER_PROMPT
+from app.utils.llm_gateway import llm_gateway
+from app.tools.relevance import relevance_ranker
+from app.config.settings import settings
 from .base_agent import BaseAgent
 
 
-client = OpenAI(
-    api_key=settings.GOOGLE_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
 tools = [
     {
         "type": "function",
@@ -60,7 +57,7 @@ def _choose_quotes_from_docs(docs, max_quotes=2, max_words=25):
             break
     return quotes[:max_quotes]
 
-def synthesize_summary(query: str, documents: list):
+async def synthesize_summary(query: str, documents: list):
     # Build docs_payload including full_text when available
     docs_payload = []
     for d in documents:
@@ -71,7 +68,8 @@ def synthesize_summary(query: str, documents: list):
             "full_text": d.get("full_text", ""),
             "source": d.get("source"),
             "type": d.get("type"),
-            "date": d.get("date")
+            "date": d.get("date"),
+            "relevance_score": d.get("relevance_score")
         })
 
     messages = [
@@ -80,7 +78,8 @@ def synthesize_summary(query: str, documents: list):
         {"role": "assistant", "content": json.dumps(docs_payload)}
     ]
 
-    response = client.chat.completions.create(
+    response = await llm_gateway.chat(
+        "synthesize_summary",
         model="gemini-2.5-flash",
         messages=messages,
         temperature=0.0
@@ -121,21 +120,24 @@ def synthesize_summary(query: str, documents: list):
     }
     return out
 
-def handle_user_query(user_query: str):
+async def handle_user_query(user_query: str, fresh: bool = False):
     """
     Orchestrator:
     - Ask the LLM (system prompt) to call search_web tool
-    - Execute search_web when requested by the LLM
+    - Execute search_web when requested by the LLM (fresh=True skips the scrape cache)
     - Call LLM synthesizer for final structured summary
     """
-    response = client.chat.completions.create(
+    response = await llm_gateway.chat(
+        "web_intel_tool_call",
         model="gemini-2.5-flash",
         messages=[
             {"role": "system", "content": WEB_INTEL_SYSTEM_PROMPT},
             {"role": "user", "content": user_query}
         ],
         tools=tools,
-        tool_choice="auto"
+        tool_choice="auto",
+        # Same query, same search arguments; also makes the call cacheable
+        temperature=0.0
     )
     message = response.choices[0].message
 
@@ -149,15 +151,37 @@ def handle_user_query(user_query: str):
         print("LLM called tool: search_web")
         print("Args:", args)
 
-        docs = search_all(query, limit=limit, types=types)
-        print(f"Retrieved {len(docs)} documents from connectors")
-        summary = synthesize_summary(query, docs)
+        # Sources stream in as they finish. Once SEARCH_FIRST_K have reported,
+        # the summary starts on those while slower ones keep arriving for the
+        # final prompt; stragglers past the search deadline are left out
+        by_source = {}
+        summary_task = None
+        stream = astream_search_all(query, limit, types, fresh, deadline=settings.SEARCH_DEADLINE or None)
+        try:
+            async for source, results in stream:
+                by_source[source] = results
+                if summary_task is None and settings.SEARCH_FIRST_K and len(by_source) >= settings.SEARCH_FIRST_K:
+                    partial, _ = relevance_ranker.select(query, merge_source_results(by_source))
+                    summary_task = asyncio.create_task(synthesize_summary(query, partial))
+            retrieved = merge_source_results(by_source)
+            print(f"Retrieved {len(retrieved)} documents from connectors")
+            # Only the documents most relevant to the query, within the token budget, reach the LLM
+            docs, ranking = relevance_ranker.select(query, retrieved)
+            summary = await summary_task if summary_task is not None else await synthesize_summary(query, docs)
+        finally:
+            # A failed or cancelled search must not leave the early summary
+            # running, nor the stream's sources unhanded to the background
+            if summary_task is not None and not summary_task.done():
+                summary_task.cancel()
+            await stream.aclose()
+        # The summary's documents_used repeats docs_array
         final_prompt = MASTER_PROMPT.format(
-            docs_array=json.dumps(docs, indent=2),
-            summary_array=json.dumps(summary, indent=2)
+            docs_array=json.dumps(docs),
+            summary_array=json.dumps({k: v for k, v in summary.items() if k != "documents_used"}, indent=2)
         )
 
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
+            "master_prompt",
             model="gemini-2.5-flash",
             messages=[
                 {"role": "user", "content": final_prompt}
@@ -167,25 +191,27 @@ def handle_user_query(user_query: str):
         final_result = response.choices[0].message.content
         return {
             "query": query,
-            "documents_count": len(docs),
+            "documents_retrieved": len(retrieved),
+            "documents_selected": len(docs),
+            "ranking": ranking,
             "result": final_result
         }
     
     # If no tool used, return LLM content (unlikely with strict prompt)
     return {"response": message.content}
 
-def run_web_intel_agent(query: str):
+async def run_web_intel_agent(query: str, fresh: bool = False):
     """
     Main entry point for the web intelligence agent.
     Called by master agent to process queries.
     """
-    return handle_user_query(query)
+    return await handle_user_query(query, fresh=fresh)
 
 class WebIntelligenceAgent(BaseAgent):
 
     async def run(self, query: str, context=None):
         # print("Web Intelligence Agent CALLED")
-        result = handle_user_query(query)
+        result = await handle_user_query(query)
         return {
             "agent": "Web Intelligence Agent",
             "output": result.model_dump()
@@ -195,7 +221,7 @@ class WebIntelligenceAgent(BaseAgent):
 def main():
     print("\nWeb Intelligence Agent ")
     q = input("\nEnter your query: ")
-    out = handle_user_query(q)
+    out = asyncio.run(handle_user_query(q))
     print("\nRESULT:  ")
     print(out["result"])
 
@@ -0,0 +1,69 @@
+"""
+Microbenchmark of the HTML parser backends on saved Devpost pages.
+
+Runs the Devpost connector's own extraction code on each fixture with
+every installed backend (bs4 with and without targeted parsing), checks
+that all of them extract the same fields as BeautifulSoup on the full
+page, and prints the time per page.
+
+    python -m app.benchmarks.html_parsers [--rounds 50]
+"""
+import argparse
+import os
+import time
+from app.tools.html_parser import HtmlParser, available_backends
+from app.tools.web_tools import DevpostConnector
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# (fixture, what the connector extracts from it)
+CASES = [
+    ("devpost_search.html", lambda connector, html: connector._project_links(html, 24)),
+    ("devpost_project.html", lambda connector, html: connector._parse_project(html, "https://devpost.com/software/x")),
+]
+
+
+def _time_per_page(extract, connector, html: str, rounds: int) -> float:
+    """Best of three runs of `rounds` extractions, in milliseconds per page"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract(connector, html)
+        best = min(best, (time.perf_counter() - start) / rounds)
+    return best * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rounds", type=int, default=50, help="extractions per timing run")
+    args = arg_parser.parse_args()
+
+    backends = available_backends()
+    print(f"Backends installed: {', '.join(backends)}\n")
+    print(f"{'fixture':<24}{'backend':<12}{'mode':<10}{'ms/page':>9}{'speedup':>9}")
+
+    for fixture, extract in CASES:
+        with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+            html = f.read()
+
+        baseline = DevpostConnector()
+        baseline.parser = HtmlParser("bs4", targeted=False)
+        expected = extract(baseline, html)
+        baseline_ms = _time_per_page(extract, baseline, html, args.rounds)
+
+        for backend in backends:
+            # Only bs4 can parse just the target subtrees
+            for targeted in (False, True) if HtmlParser(backend).targeted else (False,):
+                connector = DevpostConnector()
+                connector.parser = HtmlParser(backend, targeted=targeted)
+                if extract(connector, html) != expected:
+                    raise SystemExit(f"{fixture}: {backend} ({'targeted' if targeted else 'full'}) extracted different fields")
+                ms = baseline_ms if backend == "bs4" and not targeted else _time_per_page(extract, connector, html, args.rounds)
+                mode = "targeted" if targeted else "full"
+                print(f"{fixture:<24}{backend:<12}{mode:<10}{ms:>9.2f}{baseline_ms / ms:>8.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,15 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _int_map(name: str) -> dict:
+    """Reads an env var like "router=3600,report=86400" into a dict of ints"""
+    values = {}
+    for part in os.getenv(name, "").split(","):
+        key, sep, value = part.partition("=")
+        if sep and value.strip().isdigit():
+            values[key.strip()] = int(value)
+    return values
+
 class Settings:
     def __init__(self):
         self.GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -10,4 +19,61 @@ class Settings:
         self.SUPABASE_KEY = os.getenv("SUPABASE_KEY")
         self.PROMPTS_PATH = os.getenv("PROMPTS_PATH")  
         self.PH_API_TOKEN = os.getenv("PH_API_TOKEN")
+        self.ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+        self.ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "20"))
+        self.ANALYSIS_MAX_PER_CLIENT = int(os.getenv("ANALYSIS_MAX_PER_CLIENT", "3"))
+        self.SPECULATIVE_WEB_INTEL = os.getenv("SPECULATIVE_WEB_INTEL", "true").lower() == "true"
+        self.LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+        self.LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH")
+        self.LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+        self.LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+        self.LLM_CACHE_TTLS = _int_map("LLM_CACHE_TTLS")
+        self.LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+        self.LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+        self.LLM_RPM = int(os.getenv("LLM_RPM", "60"))
+        self.LLM_RPM_OVERRIDES = _int_map("LLM_RPM_OVERRIDES")
+        self.LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+        self.LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+        self.ANALYSIS_STORE_BACKEND = os.getenv("ANALYSIS_STORE_BACKEND", "sqlite")
+        self.ANALYSIS_DB_PATH = os.getenv("ANALYSIS_DB_PATH")
+        self.ANALYSIS_RETENTION_DAYS = int(os.getenv("ANALYSIS_RETENTION_DAYS", "30"))
+        self.ANALYSIS_MAX_ROWS = int(os.getenv("ANALYSIS_MAX_ROWS", "10000"))
+        self.BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+        self.BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+        self.BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "1024"))
+        self.HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")
+        self.HTML_PARSER_TARGETED = os.getenv("HTML_PARSER_TARGETED", "true").lower() == "true"
+        self.SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "140"))
+        self.SEARCH_FIRST_K = int(os.getenv("SEARCH_FIRST_K", "3"))
+        self.SYNTHESIS_TOP_K = int(os.getenv("SYNTHESIS_TOP_K", "40"))
+        self.SYNTHESIS_TOKEN_BUDGET = int(os.getenv("SYNTHESIS_TOKEN_BUDGET", "12000"))
+        self.CONNECTOR_HEALTH_WINDOW = int(os.getenv("CONNECTOR_HEALTH_WINDOW", "50"))
+        self.CONNECTOR_FAILURE_THRESHOLD = int(os.getenv("CONNECTOR_FAILURE_THRESHOLD", "5"))
+        self.CONNECTOR_COOLDOWN = float(os.getenv("CONNECTOR_COOLDOWN", "300"))
+        self.CONNECTOR_TIMEOUT_MULTIPLIER = float(os.getenv("CONNECTOR_TIMEOUT_MULTIPLIER", "2.0"))
+        self.CONNECTOR_MIN_TIMEOUT = float(os.getenv("CONNECTOR_MIN_TIMEOUT", "10"))
+        self.CONNECTOR_BUDGETS = _int_map("CONNECTOR_BUDGETS")
+        self.CONNECTOR_RPM_OVERRIDES = _int_map("CONNECTOR_RPM_OVERRIDES")
+        self.SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+        self.SCRAPE_CACHE_DB_PATH = os.getenv("SCRAPE_CACHE_DB_PATH")
+        self.SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "256"))
+        self.SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "21600"))
+        self.SCRAPE_CACHE_TTLS = _int_map("SCRAPE_CACHE_TTLS")
+        self.SCRAPE_CACHE_STALE_TTL = int(os.getenv("SCRAPE_CACHE_STALE_TTL", "604800"))
+        self.HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+        self.HTTP_CACHE_DB_PATH = os.getenv("HTTP_CACHE_DB_PATH")
+        self.HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+        self.HTTP_CACHE_HEURISTIC_TTL = int(os.getenv("HTTP_CACHE_HEURISTIC_TTL", "300"))
+        self.HTTP_CACHE_RETENTION = int(os.getenv("HTTP_CACHE_RETENTION", "604800"))
+        self.DIRECTORY_HTTP_FIRST = os.getenv("DIRECTORY_HTTP_FIRST", "true").lower() == "true"
+        self.DIRECTORY_INDEX_ENABLED = os.getenv("DIRECTORY_INDEX_ENABLED", "true").lower() == "true"
+        self.DIRECTORY_INDEX_DB_PATH = os.getenv("DIRECTORY_INDEX_DB_PATH")
+        self.DIRECTORY_INDEX_MAX_AGE = int(os.getenv("DIRECTORY_INDEX_MAX_AGE", "172800"))
+        self.DIRECTORY_INDEX_MIN_RELEVANCE = float(os.getenv("DIRECTORY_INDEX_MIN_RELEVANCE", "0.3"))
+        self.DIRECTORY_CRAWL_INTERVAL = int(os.getenv("DIRECTORY_CRAWL_INTERVAL", "86400"))
+        self.DIRECTORY_CRAWL_LIMIT = int(os.getenv("DIRECTORY_CRAWL_LIMIT", "1000"))
+        self.BROWSER_BLOCKED_RESOURCES = [
+            t.strip() for t in os.getenv("BROWSER_BLOCKED_RESOURCES", "image,font,media,stylesheet").split(",") if t.strip()
+        ]
 settings = Settings()
\ No newline at end of file
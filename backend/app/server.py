@@ -1,10 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 import asyncio
+import json
 import uuid
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 from app.agents.master_agent import run_master_agent
+from app.config.settings import settings
+from app.utils.job_queue import AdmissionError, AnalysisJob, AnalysisJobQueue
+from app.utils.progress_events import ProgressBroker
+from app.utils.analysis_store import create_analysis_store
+from app.utils.metrics import QUEUE_DEPTH, render_metrics
+from app.utils.llm_cache import llm_cache
+from app.tools.browser_pool import browser_pool
+from app.utils.scrape_cache import scrape_cache
+from app.utils.http_cache import http_cache
+from app.tools.directory_index import directory_index
+from app.tools.web_tools import SOURCE_TIMEOUT, directory_crawler
+from app.tools.connector_registry import connector_registry
+from app.tools.html_parser import html_parser
+from app.tools.entity_resolution import entity_resolver
+from app.utils.connector_health import connector_health
 
 app = FastAPI(
     title="NIRNAY.AI Backend API",
@@ -21,13 +39,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for analysis results (temporary solution)
-analysis_store = {}
-analysis_history = []
+# Persistent storage for analysis results (SQLite by default)
+analysis_store = create_analysis_store()
 
 # Request models
 class AnalysisRequest(BaseModel):
     query: str
+    # Re-scrape every source instead of using cached connector results
+    fresh: bool = False
 
 class AnalysisResponse(BaseModel):
     analysis_id: str
@@ -37,7 +56,7 @@ class AnalysisResponse(BaseModel):
 class ReportResponse(BaseModel):
     analysis_id: str
     query: str
-    result: str
+    result: Dict[str, Any] | str
     timestamp: str
 
 class HistoryItem(BaseModel):
@@ -45,15 +64,73 @@ class HistoryItem(BaseModel):
     query: str
     timestamp: str
 
+class HistoryPage(BaseModel):
+    items: List[HistoryItem]
+    next_cursor: Optional[str] = None
+
+class StatusResponse(BaseModel):
+    analysis_id: str
+    status: str
+    queued_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    stages: Dict[str, Dict[str, str]] = {}
+    error: Optional[str] = None
+    coalesced_with: Optional[str] = None
+
+
+def store_analysis_result(job: AnalysisJob, result):
+    """
+    Persists a finished job's result so /report and /history can serve it.
+    The job queue calls it in a worker thread: the SQLite write (and the
+    eviction it periodically triggers) never blocks the event loop.
+    """
+    analysis_store.save(
+        analysis_id=job.analysis_id,
+        query=job.query,
+        result=result,
+        timestamp=datetime.now().isoformat()
+    )
+
+
+progress_broker = ProgressBroker()
+
+job_queue = AnalysisJobQueue(
+    runner=run_master_agent,
+    on_complete=store_analysis_result,
+    num_workers=settings.ANALYSIS_WORKERS,
+    events=progress_broker,
+    max_queue_size=settings.ANALYSIS_QUEUE_SIZE,
+    max_per_client=settings.ANALYSIS_MAX_PER_CLIENT
+)
+
+QUEUE_DEPTH.set_function(job_queue.depth)
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+    # The browser pool starts on the first scrape that needs it
+    await directory_crawler.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    await directory_crawler.stop()
+    await browser_pool.stop()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "NIRNAY.AI Backend API is running", "status": "active"}
 
-@app.post("/analyze")
-async def analyze(request: AnalysisRequest):
+@app.post("/analyze", status_code=202, response_model=AnalysisResponse)
+async def analyze(request: AnalysisRequest, http_request: Request):
     """
-    Submit a problem for analysis
+    Submit a problem for analysis. The analysis runs in the background;
+    poll /status/{analysis_id} and fetch /report/{analysis_id} once done.
+    Responds 429 (per-client limit) or 503 (queue full) with Retry-After
+    when the request cannot be admitted. Set "fresh" to re-scrape every
+    source instead of serving cached connector results.
     
     Returns:
         - analysis_id: Unique ID for tracking the analysis
@@ -65,33 +142,121 @@ async def analyze(request: AnalysisRequest):
     
     # Generate unique analysis ID
     analysis_id = str(uuid.uuid4())
-    
+    client_id = http_request.client.host if http_request.client else None
     try:
-        # Run the master agent with the query
-        result = await run_master_agent(request.query)
-        
-        # Store the result
-        analysis_data = {
-            "analysis_id": analysis_id,
-            "query": request.query,
-            "result": result,
-            "timestamp": datetime.now().isoformat()
-        }
-        analysis_store[analysis_id] = analysis_data
-        analysis_history.append({
-            "analysis_id": analysis_id,
-            "query": request.query,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return AnalysisResponse(
+        job = job_queue.submit(analysis_id, request.query, client_id=client_id, fresh=request.fresh)
+    except AdmissionError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    return AnalysisResponse(
+        analysis_id=analysis_id,
+        status=job.status,
+        message="Analysis queued"
+    )
+
+@app.get("/status/{analysis_id}", response_model=StatusResponse)
+async def get_status(analysis_id: str):
+    """
+    Get the progress of a submitted analysis
+    
+    Returns:
+        - status: queued, running, done or failed
+        - queued_at / started_at / finished_at: Job timestamps
+        - stages: Start and finish timestamps for each pipeline stage
+        - error: Failure reason, if any
+    """
+    job = job_queue.get(analysis_id)
+    if job is None:
+        # Job records are pruned after a while; the stored result still counts
+        analysis = await asyncio.to_thread(analysis_store.get, analysis_id)
+        if analysis is None:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        return StatusResponse(
             analysis_id=analysis_id,
-            status="completed",
-            message="Analysis completed successfully"
+            status="done",
+            queued_at=analysis["timestamp"],
+            finished_at=analysis["timestamp"]
         )
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    return StatusResponse(**job.model_dump(exclude={"query"}))
+
+@app.get("/analyze/{analysis_id}/events")
+async def stream_analysis_events(analysis_id: str):
+    """
+    Server-Sent Events stream of an analysis' progress
+    
+    Events (the SSE event name is the "event" field):
+        - status: queued / running / done / failed
+        - node_started / node_finished: LangGraph node lifecycle
+        - source_done / source_failed: Per-connector scrape counts
+        - token: Partial synthesizer output
+    """
+    if not progress_broker.has(analysis_id):
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    async def event_source():
+        events = progress_broker.subscribe(analysis_id).__aiter__()
+        while True:
+            try:
+                event = await asyncio.wait_for(events.__anext__(), timeout=15)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            except StopAsyncIteration:
+                return
+            yield f"event: {event.get('event', 'message')}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/stats")
+async def get_stats():
+    """
+    Job queue counters
+    
+    Returns:
+        - submitted: Analyses accepted by /analyze
+        - runs: Pipeline runs actually executed
+        - coalesced: Analyses served by attaching to an identical in-flight run
+        - rejected_queue_full / rejected_client_limit: Admission rejections
+        - queue_wait_avg_s / queue_wait_max_s: Time jobs spent waiting for a worker
+        - queue_depth: Jobs waiting for a free worker
+        - llm_cache: LLM response cache hits, misses and hit rate
+        - scrape_cache: Connector result cache fresh/stale hits and refreshes
+        - http_cache: Connector HTTP responses served fresh or revalidated, bytes saved and parse memo hits
+        - directory_index: Indexed YC / T-Hub entries and crawl age per source
+        - connectors: Per-source circuit state, success and empty-result rates, p50/p95 latency and current timeout
+        - scheduler: Live fetches in flight and waiting per connector and per cost budget
+        - browser_pool: Warm browsers, their use counts and Chromium memory
+        - html_parser: Parser backend in use and how many parses were targeted
+        - entity_resolution: Search results seen, entities kept, exact duplicates dropped and records merged
+    """
+    return {
+        **job_queue.snapshot(),
+        "llm_cache": llm_cache.snapshot(),
+        "scrape_cache": scrape_cache.snapshot(),
+        "http_cache": http_cache.snapshot(),
+        "directory_index": directory_index.snapshot(),
+        "connectors": connector_health.snapshot(default_timeout=SOURCE_TIMEOUT),
+        "scheduler": connector_registry.snapshot(),
+        "browser_pool": browser_pool.snapshot(),
+        "html_parser": html_parser.snapshot(),
+        "entity_resolution": entity_resolver.snapshot(),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage, connector and LLM latency histograms, counters and queue depth"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 @app.get("/report/{analysis_id}", response_model=ReportResponse)
 async def get_report(analysis_id: str):
@@ -107,10 +272,16 @@ async def get_report(analysis_id: str):
         - result: The analysis result
         - timestamp: When the analysis was performed
     """
-    if analysis_id not in analysis_store:
+    # Store calls block on SQLite, so they run off the event loop
+    analysis = await asyncio.to_thread(analysis_store.get, analysis_id)
+    if analysis is None:
+        job = job_queue.get(analysis_id)
+        if job is not None and job.status in ("queued", "running"):
+            raise HTTPException(status_code=409, detail=f"Analysis is still {job.status}")
+        if job is not None and job.status == "failed":
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {job.error}")
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    analysis = analysis_store[analysis_id]
     return ReportResponse(
         analysis_id=analysis["analysis_id"],
         query=analysis["query"],
@@ -118,15 +289,40 @@ async def get_report(analysis_id: str):
         timestamp=analysis["timestamp"]
     )
 
-@app.get("/history", response_model=list[HistoryItem])
-async def get_history():
+@app.get("/history", response_model=HistoryPage)
+async def get_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
     """
-    Get the history of all analyses performed
+    Get the history of analyses performed, newest first, one page at a time
+    
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
+        q: Only include analyses whose query contains this text
+        since / until: ISO timestamp bounds (inclusive / exclusive)
     
     Returns:
-        List of analysis history items with ID, query, and timestamp
+        - items: Analysis history items with ID, query, and timestamp
+        - next_cursor: Cursor for the next page, null on the last page
     """
-    return analysis_history
+    try:
+        items, next_cursor = await asyncio.to_thread(
+            analysis_store.list_history,
+            limit=limit,
+            cursor=cursor,
+            query_contains=q,
+            since=since,
+            until=until
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return HistoryPage(items=items, next_cursor=next_cursor)
 
 if __name__ == "__main__":
     import uvicorn
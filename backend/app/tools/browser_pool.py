@@ -0,0 +1,260 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright
+from app.config.settings import settings
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is skipped without psutil
+    psutil = None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Third-party trackers that never carry directory data
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.com",
+    "segment.io",
+    "hotjar.com",
+    "facebook.net",
+    "intercom.io",
+    "clarity.ms",
+)
+
+
+def _chromium_rss_mb() -> Optional[float]:
+    """Total resident memory of Chromium processes started by this server"""
+    if psutil is None:
+        return None
+    total = 0
+    try:
+        for proc in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                name = proc.name().lower()
+                if "chrom" in name or "headless_shell" in name:
+                    total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    except psutil.Error:
+        return None
+    return total / (1024 * 1024)
+
+
+async def _close_quietly(target):
+    """Closes a context or browser even if the caller is being cancelled"""
+    try:
+        await asyncio.shield(target.close())
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        pass
+
+
+async def _new_context(browser, blocked_resource_types: Iterable[str]):
+    """Fresh context that aborts requests for non-essential resources"""
+    context = await browser.new_context(user_agent=USER_AGENT)
+    blocked = frozenset(blocked_resource_types)
+
+    async def handle(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in blocked or host.endswith(BLOCKED_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+    return context
+
+
+class _PooledBrowser:
+    def __init__(self, index: int):
+        self.name = f"browser-{index}"
+        self.browser = None
+        self.uses = 0
+        self.launches = 0
+
+
+class BrowserPool:
+    """
+    Long-lived pool of headless browsers for the Playwright connectors.
+
+    Built on async Playwright, so scrapes run on the event loop and are
+    cancelled like any other task. Each page() gets a fresh context on an
+    idle browser, and the context is closed when the block exits, also on
+    cancellation or timeout. A browser is relaunched after `max_uses`
+    scrapes or when its share of Chromium memory exceeds `max_rss_mb`.
+    Requests for `blocked_resource_types` (images, fonts, ...) and known
+    analytics hosts are aborted, since the scrapers only read the DOM.
+
+    Nothing runs until the first page(): Playwright starts then, and each
+    browser is launched by the first scrape that needs it, so a server whose
+    directory connectors answer over HTTP never launches one. start() warms
+    the whole pool up front instead.
+
+    The pool is bound to the event loop that starts it (the server's);
+    callers on any other loop get a one-off browser instead.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_uses: int = 50,
+        max_rss_mb: int = 1024,
+        blocked_resource_types: Iterable[str] = ("image", "font", "media", "stylesheet"),
+    ):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.blocked_resource_types = tuple(blocked_resource_types)
+        self._reset()
+
+    def _reset(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._playwright = None
+        self._slots: List[_PooledBrowser] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def start(self):
+        """Starts Playwright and launches every browser now; failures are logged, not raised"""
+        try:
+            await self._ensure_started()
+        except Exception as e:
+            print(f"[Browser Pool] Failed to start: {e}")
+            return
+        # Only idle slots, taken off the queue so no scrape launches them too;
+        # a browser that fails to launch now is retried when it is next used
+        idle = self._idle
+        slots = [idle.get_nowait() for _ in range(idle.qsize())]
+        try:
+            unlaunched = [slot for slot in slots if slot.browser is None]
+            results = await asyncio.gather(*(self._launch(slot) for slot in unlaunched), return_exceptions=True)
+            for slot, result in zip(unlaunched, results):
+                if isinstance(result, Exception):
+                    print(f"[Browser Pool] Could not launch {slot.name}: {result}")
+        finally:
+            for slot in slots:
+                idle.put_nowait(slot)
+
+    async def stop(self):
+        if self._ready is None or self._loop is not asyncio.get_running_loop():
+            return
+        slots, playwright = self._slots, self._playwright
+        self._reset()
+        for slot in slots:
+            if slot.browser is not None:
+                await _close_quietly(slot.browser)
+        if playwright is not None:
+            await playwright.stop()
+
+    @asynccontextmanager
+    async def page(self):
+        """Yields a page in a fresh context; the context is always closed on exit"""
+        if not self._usable_here():
+            async with _standalone_page(self.blocked_resource_types) as page:
+                yield page
+            return
+
+        await self._ensure_started()
+        idle = self._idle
+        slot = await idle.get()
+        context = None
+        try:
+            if slot.browser is None or not slot.browser.is_connected():
+                await self._launch(slot)
+            context = await _new_context(slot.browser, self.blocked_resource_types)
+            yield await context.new_page()
+        finally:
+            try:
+                slot.uses += 1
+                if context is not None:
+                    await _close_quietly(context)
+                if slot.browser is not None and self._should_recycle(slot):
+                    print(f"[Browser Pool] Recycling {slot.name} after {slot.uses} uses")
+                    await _close_quietly(slot.browser)
+                    slot.browser = None
+            finally:
+                idle.put_nowait(slot)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "started": bool(self._slots),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "browsers": [
+                {
+                    "name": slot.name,
+                    "connected": slot.browser is not None and slot.browser.is_connected(),
+                    "uses": slot.uses,
+                    "launches": slot.launches,
+                }
+                for slot in self._slots
+            ],
+            "chromium_rss_mb": _chromium_rss_mb(),
+        }
+
+    def _usable_here(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop.is_closed():
+            # Bound to a loop that has since finished (e.g. a CLI asyncio.run)
+            self._reset()
+        return self._loop is None or self._loop is loop
+
+    async def _ensure_started(self):
+        if self._ready is None:
+            self._loop = asyncio.get_running_loop()
+            self._ready = asyncio.ensure_future(self._start())
+        try:
+            await asyncio.shield(self._ready)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._reset()
+            raise
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._slots = [_PooledBrowser(i) for i in range(self.size)]
+        # Last in, first out: scrapes reuse a launched browser while one is
+        # idle, so the others are only launched under concurrent load
+        self._idle = asyncio.LifoQueue()
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        print(f"[Browser Pool] Started with {self.size} browser slots")
+
+    async def _launch(self, slot: _PooledBrowser):
+        slot.browser = await self._playwright.chromium.launch(headless=True)
+        slot.launches += 1
+        slot.uses = 0
+
+    def _should_recycle(self, slot: _PooledBrowser) -> bool:
+        if slot.uses >= self.max_uses:
+            return True
+        rss = _chromium_rss_mb()
+        # RSS is measured across the pool, so compare the per-browser share
+        return rss is not None and rss / self.size > self.max_rss_mb
+
+
+@asynccontextmanager
+async def _standalone_page(blocked_resource_types: Iterable[str]):
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            context = await _new_context(browser, blocked_resource_types)
+            yield await context.new_page()
+        finally:
+            await _close_quietly(browser)
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_uses=settings.BROWSER_MAX_USES,
+    max_rss_mb=settings.BROWSER_MAX_RSS_MB,
+    blocked_resource_types=settings.BROWSER_BLOCKED_RESOURCES,
+)
@@ -0,0 +1,154 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from app.config.settings import settings
+from app.utils.metrics import CONNECTOR_SCHEDULER_WAIT
+from app.utils.rate_limit import TokenBucket
+
+# Concurrent live fetches per cost kind across all analyses; browser
+# scrapes are bounded by the pool, "none" (no I/O) is never limited
+DEFAULT_BUDGETS = {
+    "browser": settings.BROWSER_POOL_SIZE,
+    "http": 8,
+    "api": 4,
+}
+
+
+class ConnectorRegistry:
+    """
+    Long-lived connector instances plus the scheduler that paces them.
+
+    Connectors declare their `cost` kind, `requests_per_minute` and
+    `max_concurrency` (see BaseConnector). Every live fetch runs inside
+    slot(), which enforces, across all in-flight analyses: the
+    connector's own concurrency cap, its token-bucket rate and the global
+    budget for its cost kind (e.g. browser scrapes <= browser pool size).
+    Sources are resolved by name or alias, so adding a connector is one
+    register() call. Index and cache hits never reach the scheduler.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        rpm_overrides: Optional[Dict[str, int]] = None,
+    ):
+        self.budgets = budgets or {}
+        self.rpm_overrides = rpm_overrides or {}
+        self._connectors: Dict[str, object] = {}
+        self._aliases: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        # Asyncio primitives per event loop: the server's loop keeps its own,
+        # a CLI asyncio.run gets a fresh set that goes away with the loop
+        self._schedulers = weakref.WeakKeyDictionary()
+
+    def register(self, connector):
+        self._connectors[connector.name] = connector
+        for alias in (connector.name, *connector.aliases):
+            self._aliases[alias.lower()] = connector.name
+        return connector
+
+    def get(self, source: str):
+        name = self._aliases.get(source.lower())
+        return self._connectors.get(name) if name else None
+
+    def resolve(self, sources: Optional[List[str]] = None) -> List:
+        """Connectors for `sources` (names or aliases) in request order; all when None"""
+        if sources is None:
+            return list(self._connectors.values())
+        resolved = []
+        for source in sources:
+            connector = self.get(source)
+            if connector is None:
+                print(f"[Connector Registry] Unknown source: {source}")
+            elif connector not in resolved:
+                resolved.append(connector)
+        return resolved
+
+    def rate_for(self, connector) -> int:
+        return self.rpm_overrides.get(connector.name, connector.requests_per_minute)
+
+    @asynccontextmanager
+    async def slot(self, connector):
+        """Waits for the connector's concurrency cap, rate limit and cost budget"""
+        loop = asyncio.get_running_loop()
+        limits, budgets, buckets = self._scheduler(loop)
+        limit = limits.get(connector.name)
+        budget = budgets.get(connector.cost)
+        bucket = buckets.get(connector.name)
+
+        stats = self._stats_for(connector.name)
+        started = loop.time()
+        stats["waiting"] += 1
+        acquired = []
+        try:
+            if limit is not None:
+                await limit.acquire()
+                acquired.append(limit)
+            # Rate-limited fetches wait for a token before taking a shared budget slot
+            if bucket is not None:
+                await bucket.acquire()
+            if budget is not None:
+                await budget.acquire()
+                acquired.append(budget)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            stats["waiting"] -= 1
+
+        waited = loop.time() - started
+        stats["wait_total_s"] += waited
+        stats["fetches"] += 1
+        stats["in_flight"] += 1
+        CONNECTOR_SCHEDULER_WAIT.labels(connector.name).observe(waited)
+        try:
+            yield
+        finally:
+            stats["in_flight"] -= 1
+            for semaphore in acquired:
+                semaphore.release()
+
+    def snapshot(self) -> Dict:
+        return {
+            "budgets": {
+                cost: {
+                    "limit": self.budgets[cost],
+                    "in_flight": sum(
+                        self._stats_for(c.name)["in_flight"] for c in self._connectors.values() if c.cost == cost
+                    ),
+                }
+                for cost in self.budgets
+            },
+            "connectors": {
+                name: {
+                    "cost": connector.cost,
+                    "requests_per_minute": self.rate_for(connector),
+                    "max_concurrency": connector.max_concurrency,
+                    **self._stats_for(name),
+                }
+                for name, connector in self._connectors.items()
+            },
+        }
+
+    def _stats_for(self, name: str) -> Dict[str, float]:
+        # Unregistered connectors run unthrottled but are still counted
+        return self._stats.setdefault(name, {"fetches": 0, "in_flight": 0, "waiting": 0, "wait_total_s": 0.0})
+
+    def _scheduler(self, loop: asyncio.AbstractEventLoop) -> tuple:
+        scheduler = self._schedulers.get(loop)
+        if scheduler is None:
+            scheduler = (
+                {name: asyncio.Semaphore(c.max_concurrency) for name, c in self._connectors.items() if c.max_concurrency},
+                {cost: asyncio.Semaphore(limit) for cost, limit in self.budgets.items() if limit > 0},
+                {name: TokenBucket(self.rate_for(c)) for name, c in self._connectors.items() if self.rate_for(c) > 0},
+            )
+            self._schedulers[loop] = scheduler
+        return scheduler
+
+
+connector_registry = ConnectorRegistry(
+    budgets={**DEFAULT_BUDGETS, **settings.CONNECTOR_BUDGETS},
+    rpm_overrides=settings.CONNECTOR_RPM_OVERRIDES,
+)
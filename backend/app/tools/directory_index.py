@@ -0,0 +1,349 @@
+import asyncio
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.config.settings import settings
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "directory_index.db")
+
+# Connector output fields per source, besides source/type/name/description/url
+EXTRA_FIELDS = {
+    "YC": ("batch",),
+    "T-Hub": ("category",),
+}
+
+
+# Query words that match nearly every row and say nothing about relevance
+STOPWORDS = frozenset((
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "into",
+    "is", "it", "of", "on", "or", "that", "the", "their", "this", "to", "what", "which", "with",
+))
+# Single characters are dropped; two keeps "ai", "ml", "vr"
+MIN_TERM_LENGTH = 2
+
+
+def _query_terms(query: str) -> List[str]:
+    terms = re.findall(r"\w+", query.lower())
+    return list(dict.fromkeys(t for t in terms if len(t) >= MIN_TERM_LENGTH and t not in STOPWORDS))
+
+
+def _fts_query(query: str) -> str:
+    """Turns free text into an FTS5 OR-query of its quoted content terms"""
+    return " OR ".join(f'"{term}"' for term in _query_terms(query))
+
+
+class DirectoryIndex:
+    """
+    Local full-text index of startup directories (YC, T-Hub).
+
+    A background crawler harvests each directory and upserts it here; rows
+    are only rewritten when their content hash changes. Connectors then
+    answer queries from the index, ranked by BM25, instead of driving a
+    browser, as long as the source was crawled within `max_age` seconds.
+    A row only counts as a match when its BM25 score reaches
+    `min_relevance` of the query's total term weight (the summed IDF of
+    its terms), so a hit on one common word out of several doesn't stop
+    the connector from scraping live. Falls back to LIKE matching when
+    SQLite is built without FTS5.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        max_age: int = 172800,
+        min_relevance: float = 0.3,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_age = max_age
+        self.min_relevance = min_relevance
+        self.fts = False
+        self._lock = threading.Lock()
+        self._conn = None
+        if not enabled:
+            return
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS startups (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                name TEXT NOT NULL,
+                description TEXT NOT NULL DEFAULT '',
+                batch TEXT,
+                category TEXT,
+                content_hash TEXT NOT NULL,
+                last_seen REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                UNIQUE (source, url)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                source TEXT PRIMARY KEY,
+                crawled_at REAL NOT NULL,
+                entries INTEGER NOT NULL
+            );
+        """)
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS startups_fts USING fts5(name, description, batch, category)"
+            )
+            self.fts = True
+        except sqlite3.OperationalError:
+            print("[Directory Index] SQLite has no FTS5, using LIKE matching")
+        self._conn.commit()
+
+    def is_fresh(self, source: str) -> bool:
+        crawled_at = self.crawled_at(source)
+        return crawled_at is not None and time.time() - crawled_at < self.max_age
+
+    def crawled_at(self, source: str) -> Optional[float]:
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT crawled_at FROM crawl_state WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, source: str, query: str, limit: int) -> Optional[List[Dict]]:
+        """Ranked matches from a fresh index, or None when it is disabled or stale"""
+        if not self.enabled or not self.is_fresh(source):
+            return None
+        return self.search(source, query, limit)
+
+    def search(self, source: str, query: str, limit: int) -> List[Dict]:
+        if self._conn is None:
+            return []
+        with self._lock:
+            if self.fts:
+                match = _fts_query(query)
+                if match:
+                    # bm25() is negative, better matches lower
+                    rows = self._conn.execute("""
+                        SELECT s.*, -bm25(startups_fts, 10.0, 1.0, 0.5, 0.5) AS score
+                        FROM startups_fts f JOIN startups s ON s.id = f.rowid
+                        WHERE startups_fts MATCH ? AND s.source = ?
+                        ORDER BY score DESC LIMIT ?
+                    """, (match, source, limit)).fetchall()
+                    floor = self.min_relevance * self._term_weight(_query_terms(query))
+                    rows = [row for row in rows if row["score"] >= floor]
+                else:
+                    rows = self._conn.execute(
+                        "SELECT * FROM startups WHERE source = ? ORDER BY updated_at DESC LIMIT ?", (source, limit)
+                    ).fetchall()
+            else:
+                pattern = f"%{query.strip().lower()}%"
+                rows = self._conn.execute("""
+                    SELECT * FROM startups
+                    WHERE source = ? AND (lower(name) LIKE ? OR lower(description) LIKE ?)
+                    ORDER BY lower(name) LIKE ? DESC LIMIT ?
+                """, (source, pattern, pattern, pattern, limit)).fetchall()
+        return [self._to_signal(row) for row in rows]
+
+    def _term_weight(self, terms: List[str]) -> float:
+        """Summed IDF of `terms`, computed as FTS5's bm25() does (caller holds the lock)"""
+        total = self._conn.execute("SELECT COUNT(*) FROM startups_fts").fetchone()[0]
+        weight = 0.0
+        for term in terms:
+            hits = self._conn.execute(
+                "SELECT COUNT(*) FROM startups_fts WHERE startups_fts MATCH ?", (f'"{term}"',)
+            ).fetchone()[0]
+            weight += max(math.log((total - hits + 0.5) / (hits + 0.5)), 1e-6)
+        return weight
+
+    def upsert(self, source: str, records: List[Dict]) -> Dict[str, int]:
+        """Adds new entries and rewrites changed ones; unchanged rows only get last_seen bumped"""
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        if self._conn is None or not records:
+            return counts
+        now = time.time()
+        with self._lock:
+            for record in records:
+                if not record.get("name") or not record.get("url"):
+                    continue
+                fields = {
+                    "name": record["name"].strip(),
+                    "description": (record.get("description") or "").strip(),
+                    "batch": record.get("batch"),
+                    "category": record.get("category"),
+                }
+                content_hash = hashlib.sha1(repr(sorted(fields.items())).encode("utf-8")).hexdigest()
+                row = self._conn.execute(
+                    "SELECT id, content_hash FROM startups WHERE source = ? AND url = ?", (source, record["url"])
+                ).fetchone()
+
+                if row is not None and row["content_hash"] == content_hash:
+                    self._conn.execute("UPDATE startups SET last_seen = ? WHERE id = ?", (now, row["id"]))
+                    counts["unchanged"] += 1
+                    continue
+
+                if row is None:
+                    cursor = self._conn.execute("""
+                        INSERT INTO startups (source, url, name, description, batch, category, content_hash, last_seen, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (source, record["url"], *fields.values(), content_hash, now, now))
+                    row_id = cursor.lastrowid
+                    counts["added"] += 1
+                else:
+                    row_id = row["id"]
+                    self._conn.execute("""
+                        UPDATE startups SET name = ?, description = ?, batch = ?, category = ?,
+                            content_hash = ?, last_seen = ?, updated_at = ?
+                        WHERE id = ?
+                    """, (*fields.values(), content_hash, now, now, row_id))
+                    counts["updated"] += 1
+
+                if self.fts:
+                    self._conn.execute("DELETE FROM startups_fts WHERE rowid = ?", (row_id,))
+                    self._conn.execute(
+                        "INSERT INTO startups_fts (rowid, name, description, batch, category) VALUES (?, ?, ?, ?, ?)",
+                        (row_id, *(value or "" for value in fields.values()))
+                    )
+            self._conn.commit()
+        return counts
+
+    def prune(self, source: str, seen_before: float) -> int:
+        """Removes entries of `source` last seen before `seen_before`; returns how many"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            if self.fts:
+                self._conn.execute(
+                    "DELETE FROM startups_fts WHERE rowid IN (SELECT id FROM startups WHERE source = ? AND last_seen < ?)",
+                    (source, seen_before)
+                )
+            removed = self._conn.execute(
+                "DELETE FROM startups WHERE source = ? AND last_seen < ?", (source, seen_before)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def mark_crawled(self, source: str):
+        if self._conn is None:
+            return
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM startups WHERE source = ?", (source,)).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_state (source, crawled_at, entries) VALUES (?, ?, ?)",
+                (source, time.time(), entries)
+            )
+            self._conn.commit()
+
+    def snapshot(self) -> Dict:
+        if self._conn is None:
+            return {"enabled": False}
+        with self._lock:
+            rows = self._conn.execute("SELECT source, crawled_at, entries FROM crawl_state").fetchall()
+        now = time.time()
+        return {
+            "enabled": True,
+            "fts5": self.fts,
+            "sources": {
+                row["source"]: {
+                    "entries": row["entries"],
+                    "age_s": round(now - row["crawled_at"]),
+                    "fresh": now - row["crawled_at"] < self.max_age,
+                }
+                for row in rows
+            },
+        }
+
+    @staticmethod
+    def _to_signal(row: sqlite3.Row) -> Dict:
+        signal = {
+            "source": "Y Combinator" if row["source"] == "YC" else row["source"],
+            "type": "supply_signal",
+            "name": row["name"],
+            "description": row["description"],
+        }
+        for field in EXTRA_FIELDS.get(row["source"], ()):
+            signal[field] = row[field]
+        signal["url"] = row["url"]
+        return signal
+
+
+class DirectoryCrawler:
+    """
+    Background task that keeps the directory index current: every
+    `check_interval` seconds it re-harvests each source last crawled more
+    than `crawl_interval` seconds ago, one source at a time.
+
+    A harvester returns its records and whether it reached the end of the
+    directory; only a complete harvest counts as a crawl.
+    """
+
+    def __init__(
+        self,
+        index: DirectoryIndex,
+        harvesters: Dict[str, Callable[[int], Awaitable[Tuple[List[Dict], bool]]]],
+        crawl_interval: int = 86400,
+        check_interval: int = 3600,
+        crawl_limit: int = 1000,
+    ):
+        self.index = index
+        self.harvesters = harvesters
+        self.crawl_interval = crawl_interval
+        self.check_interval = check_interval
+        self.crawl_limit = crawl_limit
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.index.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def crawl(self, source: str) -> Dict[str, int]:
+        started = time.time()
+        records, complete = await self.harvesters[source](self.crawl_limit)
+        counts = self.index.upsert(source, records)
+        if complete and records:
+            # The harvest covered the whole directory, so what it didn't see
+            # has left it
+            counts["removed"] = self.index.prune(source, started)
+            self.index.mark_crawled(source)
+        else:
+            # A truncated or failed harvest only ages out entries that no crawl
+            # or live search has seen for max_age, and leaves the source due
+            counts["removed"] = self.index.prune(source, started - self.index.max_age)
+        print(f"[Directory Index] {source}: {len(records)} harvested ({'complete' if complete else 'partial'}), {counts}")
+        return counts
+
+    async def _loop(self):
+        while True:
+            for source in self.harvesters:
+                crawled_at = self.index.crawled_at(source)
+                if crawled_at is not None and time.time() - crawled_at < self.crawl_interval:
+                    continue
+                try:
+                    await self.crawl(source)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[Directory Index] {source} crawl failed: {str(e)}")
+            await asyncio.sleep(self.check_interval)
+
+
+directory_index = DirectoryIndex(
+    db_path=settings.DIRECTORY_INDEX_DB_PATH or DEFAULT_DB_PATH,
+    max_age=settings.DIRECTORY_INDEX_MAX_AGE,
+    min_relevance=settings.DIRECTORY_INDEX_MIN_RELEVANCE,
+    enabled=settings.DIRECTORY_INDEX_ENABLED,
+)
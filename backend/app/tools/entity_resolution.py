@@ -0,0 +1,155 @@
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Hosts the connectors link to for profile pages; they say nothing about
+# which company a record is, so they never count as its domain
+DIRECTORY_HOSTS = ("ycombinator.com", "producthunt.com", "devpost.com", "t-hub.co", "reddit.com")
+
+# Platforms that host pages for many unrelated products; two records
+# linking to the same one are not the same company, so the host alone is
+# never a domain key (the full URL still is)
+SHARED_HOSTS = frozenset((
+    "github.com", "gitlab.com", "bitbucket.org", "apps.apple.com", "play.google.com",
+    "chrome.google.com", "chromewebstore.google.com", "sites.google.com", "docs.google.com",
+    "medium.com", "substack.com", "notion.site", "linktr.ee", "linkedin.com", "twitter.com",
+    "x.com", "facebook.com", "instagram.com", "youtube.com", "bit.ly",
+))
+
+# Trailing words dropped from names before matching ("Acme, Inc." == "Acme")
+LEGAL_SUFFIXES = frozenset(("inc", "llc", "ltd", "corp", "co", "gmbh", "plc", "pvt", "private", "limited"))
+
+# Placeholder values a connector writes when a card had no such field
+_MISSING = (None, "", "N/A", "Unknown")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Case, accents, punctuation, spacing and legal suffixes removed: "Open-AI, Inc." -> "openai" """
+    if not name:
+        return ""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    words = re.findall(r"[a-z0-9]+", ascii_name.replace("&", " and "))
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    # Names with no Latin letters at all are still matched on their exact text
+    return "".join(words) or name.strip().casefold()
+
+
+# The placeholders as normalize_name() returns them ("na", "unknown")
+_MISSING_NAMES = frozenset(normalize_name(value) for value in _MISSING if value)
+
+
+def company_domain(url: Optional[str]) -> Optional[str]:
+    """Host of a company's own site, None for directory, profile and shared platform links"""
+    host = (urlsplit(url).hostname or "") if url else ""
+    host = host.removeprefix("www.")
+    if not host or host in SHARED_HOSTS or any(host == d or host.endswith("." + d) for d in DIRECTORY_HOSTS):
+        return None
+    return host
+
+
+def _url_key(url: Optional[str]) -> Optional[str]:
+    parts = urlsplit(url) if url else None
+    if not parts or not parts.hostname:
+        return None
+    return parts.hostname.removeprefix("www.") + parts.path.rstrip("/").lower()
+
+
+class EntityResolver:
+    """
+    Collapses the aggregated connector results into one record per entity.
+
+    Exact copies are dropped by a hash of the record. The rest are grouped
+    when they share a normalized name, a company domain or a profile URL,
+    using hashed keys, so the whole pass is linear in the number of records.
+    Placeholder names ("Unknown", "N/A") and shared hosts such as
+    github.com or app stores are never keys.
+    The first record of a group (results are in source order) is kept, and
+    the others fill its missing fields and extend its list fields. Merged
+    records gain `sources` and a `provenance` entry per contributing record.
+    Records without a name or URL, such as the Reddit dorks, pass through.
+    """
+
+    def __init__(self):
+        self.stats = {"records": 0, "entities": 0, "exact_duplicates": 0, "merged": 0}
+
+    def keys(self, record: Dict) -> List[str]:
+        keys = []
+        name = normalize_name(record.get("name"))
+        if len(name) > 1 and name not in _MISSING_NAMES:
+            keys.append(f"name:{name}")
+        url = record.get("url")
+        domain = company_domain(url)
+        if domain:
+            keys.append(f"domain:{domain}")
+        url_key = _url_key(url)
+        if url_key:
+            keys.append(f"url:{url_key}")
+        return keys
+
+    def resolve(self, records: List[Dict]) -> List[Dict]:
+        unique, hashes = [], set()
+        for record in records:
+            digest = hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            if digest not in hashes:
+                hashes.add(digest)
+                unique.append(record)
+
+        # Union-find over records: any shared key puts two records in one entity
+        parent = list(range(len(unique)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        owners: Dict[str, int] = {}
+        for i, record in enumerate(unique):
+            for key in self.keys(record):
+                j = owners.setdefault(key, i)
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    # The earlier record stays the root, so groups keep source order
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        groups: Dict[int, List[Dict]] = {}
+        for i, record in enumerate(unique):
+            groups.setdefault(find(i), []).append(record)
+        entities = [self._merge(group) if len(group) > 1 else group[0] for group in groups.values()]
+
+        self.stats["records"] += len(records)
+        self.stats["entities"] += len(entities)
+        self.stats["exact_duplicates"] += len(records) - len(unique)
+        self.stats["merged"] += len(unique) - len(entities)
+        if len(entities) < len(records):
+            print(f"[Entity Resolution] {len(records)} records -> {len(entities)} entities")
+        return entities
+
+    def snapshot(self) -> Dict:
+        return dict(self.stats)
+
+    @staticmethod
+    def _merge(group: List[Dict]) -> Dict:
+        merged = dict(group[0])
+        for record in group[1:]:
+            for field, value in record.items():
+                if field in ("source", "type"):
+                    continue
+                current = merged.get(field)
+                if isinstance(current, list) and isinstance(value, list):
+                    merged[field] = current + [item for item in value if item not in current]
+                elif current in _MISSING and value not in _MISSING:
+                    merged[field] = value
+        merged["sources"] = list(dict.fromkeys(record.get("source") for record in group))
+        merged["provenance"] = [
+            {"source": record.get("source"), "type": record.get("type"), "name": record.get("name"), "url": record.get("url")}
+            for record in group
+        ]
+        return merged
+
+
+entity_resolver = EntityResolver()
@@ -0,0 +1,248 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.filter import ElementFilter
+from app.config.settings import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional; the next backend is used without it
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator
+except ImportError:  # lxml backend also needs cssselect
+    HTMLTranslator = None
+
+# Fastest first; "auto" picks the first one that is installed
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+# Root compound of a selector: "#id", ".a.b" or "tag#id.a", no pseudo-classes
+_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*)?((?:[#.][\w-]+)+)$")
+
+
+@lru_cache(maxsize=128)
+def _root_rule(selector: str) -> Optional[Tuple[Optional[str], Optional[str], frozenset]]:
+    """(tag, id, classes) of the selector's first compound, or None if it can't be strained on"""
+    if any(token in selector for token in ("+", "~", ":", "[", ",")):
+        return None
+    compound = _COMPOUND.match(selector.split()[0].split(">")[0])
+    if compound is None:
+        return None
+    ids = re.findall(r"#([\w-]+)", compound.group(2))
+    classes = frozenset(re.findall(r"\.([\w-]+)", compound.group(2)))
+    if len(ids) > 1:
+        return None
+    return (compound.group(1) or "").lower() or None, ids[0] if ids else None, classes
+
+
+def _has_classes(classes: frozenset):
+    # While parsing, bs4 hands over the raw class attribute, not yet split into a list
+    def match(value) -> bool:
+        if value is None:
+            return False
+        return classes <= set(value.split() if isinstance(value, str) else value)
+    return match
+
+
+class _AnyStrainer(ElementFilter):
+    """Lets BeautifulSoup build a top-level subtree when any of `strainers` admits its root tag"""
+
+    def __init__(self, strainers: List[SoupStrainer]):
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        # Text outside every target subtree is never read
+        return False
+
+
+@lru_cache(maxsize=64)
+def target_strainer(targets: Tuple[str, ...]) -> Optional[ElementFilter]:
+    """
+    A parse_only filter keeping the subtrees rooted at the first compound
+    of each selector in `targets`, or None when a target has no id or
+    class to strain on (bare tag roots, sibling combinators,
+    pseudo-classes); the caller then parses everything.
+    """
+    rules = [_root_rule(selector) for selector in targets]
+    if not rules or any(rule is None or not (rule[1] or rule[2]) for rule in rules):
+        return None
+    strainers = []
+    for tag, tag_id, classes in rules:
+        attrs = {"class": _has_classes(classes)} if classes else {}
+        if tag_id:
+            attrs["id"] = tag_id
+        strainers.append(SoupStrainer(tag, attrs=attrs))
+    return _AnyStrainer(strainers)
+
+
+class HtmlDocument:
+    """Backend-neutral read access to a parsed page: text and attributes by CSS selector"""
+
+    def __init__(self, backend: "_Backend", root):
+        self._backend = backend
+        self._root = root
+
+    def select(self, selector: str) -> List:
+        return self._backend.select(self._root, selector) if self._root is not None else []
+
+    def text(self, selector: str, default: str = "") -> str:
+        """Stripped text of the first match, `default` when nothing matches"""
+        nodes = self.select(selector)
+        return self._backend.text(nodes[0]).strip() if nodes else default
+
+    def texts(self, selector: str) -> List[str]:
+        return [self._backend.text(node).strip() for node in self.select(selector)]
+
+    def attrs(self, selector: str, name: str) -> List[str]:
+        """Values of attribute `name` on every match that has it"""
+        values = (self._backend.attr(node, name) for node in self.select(selector))
+        return [value for value in values if value is not None]
+
+    def each(self, selector: str) -> List["HtmlDocument"]:
+        """Every match as a document of its own, e.g. one per result card"""
+        return [HtmlDocument(self._backend, node) for node in self.select(selector)]
+
+    def attr(self, name: str) -> Optional[str]:
+        """Attribute `name` of this document's root element (see each())"""
+        return self._backend.attr(self._root, name) if self._root is not None else None
+
+
+class _Backend:
+    name = ""
+    # Whether parse() can build only the target subtrees (see target_strainer)
+    strains_targets = False
+
+    def parse(self, html: str, strainer: Optional[ElementFilter] = None):
+        raise NotImplementedError
+
+    def select(self, root, selector: str) -> List:
+        raise NotImplementedError
+
+    def text(self, node) -> str:
+        raise NotImplementedError
+
+    def attr(self, node, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class _SelectolaxBackend(_Backend):
+    name = "selectolax"
+
+    def parse(self, html: str, strainer: Optional[ElementFilter] = None):
+        return LexborHTMLParser(html)
+
+    def select(self, root, selector: str) -> List:
+        matches = root.css(selector)
+        if isinstance(root, LexborHTMLParser):
+            return matches
+        # Descendants only: a node's css() also matches the node itself
+        return [node for node in matches if node.mem_id != root.mem_id]
+
+    def text(self, node) -> str:
+        return node.text(deep=True)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+
+class _LxmlBackend(_Backend):
+    name = "lxml"
+
+    def parse(self, html: str, strainer: Optional[ElementFilter] = None):
+        return lxml.html.document_fromstring(html) if html.strip() else None
+
+    def select(self, root, selector: str) -> List:
+        return _compiled(selector)(root)
+
+    def text(self, node) -> str:
+        return node.text_content()
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+
+class _SoupBackend(_Backend):
+    name = "bs4"
+    strains_targets = True
+
+    def parse(self, html: str, strainer: Optional[ElementFilter] = None):
+        return BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+    def select(self, root, selector: str) -> List:
+        return root.select(selector)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+    def attr(self, node, name: str) -> Optional[str]:
+        value = node.get(name)
+        # bs4 splits multi-valued attributes such as class
+        return " ".join(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=128)
+def _compiled(selector: str):
+    # Descendants only, like bs4 and selectolax; lxml's CSSSelector also matches the node itself
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix="descendant::"))
+
+
+_BACKEND_TYPES = {
+    "selectolax": _SelectolaxBackend,
+    "lxml": _LxmlBackend,
+    "bs4": _SoupBackend,
+}
+
+
+def available_backends() -> List[str]:
+    installed = {
+        "selectolax": LexborHTMLParser is not None,
+        "lxml": HTMLTranslator is not None,
+        "bs4": True,
+    }
+    return [name for name in BACKENDS if installed[name]]
+
+
+class HtmlParser:
+    """
+    Pluggable HTML parsing for the HTTP connectors.
+
+    `backend` is "selectolax", "lxml", "bs4" (pure-Python html.parser) or
+    "auto" for the fastest one installed; an unavailable choice falls back
+    to auto. parse() takes the selectors the caller is going to read: with
+    targeted parsing BeautifulSoup is given a SoupStrainer for the subtrees
+    those selectors are rooted in and builds nothing else, which skips the
+    scripts, navigation and footers that dominate a scraped page. The C
+    parsers have no partial parse and always read the whole page, so
+    `targeted` only applies to bs4.
+    """
+
+    def __init__(self, backend: str = "auto", targeted: bool = True):
+        available = available_backends()
+        if backend not in available:
+            if backend != "auto":
+                print(f"[HTML Parser] Backend {backend!r} unavailable, using {available[0]}")
+            backend = available[0]
+        self.backend = _BACKEND_TYPES[backend]()
+        self.targeted = targeted and self.backend.strains_targets
+        self.stats = {"parses": 0, "targeted_parses": 0}
+
+    def parse(self, html: str, targets: Sequence[str] = ()) -> HtmlDocument:
+        self.stats["parses"] += 1
+        strainer = target_strainer(tuple(targets)) if self.targeted and targets else None
+        if strainer is not None:
+            self.stats["targeted_parses"] += 1
+        return HtmlDocument(self.backend, self.backend.parse(html, strainer))
+
+    def snapshot(self) -> Dict:
+        return {"backend": self.backend.name, "targeted": self.targeted, **self.stats}
+
+
+html_parser = HtmlParser(backend=settings.HTML_PARSER_BACKEND, targeted=settings.HTML_PARSER_TARGETED)
@@ -0,0 +1,121 @@
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config.settings import settings
+
+# Record fields read per part of a document, across the connectors' schemas
+TITLE_FIELDS = ("title", "name")
+DESCRIPTION_FIELDS = ("description", "pitch", "tagline", "snippet", "dork")
+TAG_FIELDS = ("tags", "tech_stack", "category", "batch")
+
+# A title term counts this many times over a description term (a simple BM25F)
+FIELD_WEIGHTS = {"title": 3, "description": 1, "tags": 2}
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rough prompt cost of a document: JSON characters per token
+CHARS_PER_TOKEN = 4
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with",
+))
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in _TOKEN.findall(text.lower()) if term not in _STOPWORDS]
+
+
+def _field_text(doc: Dict, fields: Tuple[str, ...]) -> str:
+    parts = []
+    for field in fields:
+        value = doc.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+def estimate_tokens(doc: Dict) -> int:
+    return len(json.dumps(doc)) // CHARS_PER_TOKEN + 1
+
+
+class RelevanceRanker:
+    """
+    Picks the documents worth sending to the LLM for a query.
+
+    Documents are scored with BM25 over their title, description and tag
+    fields (title and tag terms weighted up), computed for all documents at
+    once as a NumPy term-frequency matrix over the query's terms. The best
+    scoring are kept, most relevant first, up to `top_k` documents and
+    `token_budget` estimated prompt tokens; a document that would overrun
+    the budget is skipped for smaller ones behind it. Documents sharing no
+    term with the query keep their search order behind the matches, so a
+    query worded differently from the results still gets context. Each kept
+    document carries its `relevance_score`.
+    """
+
+    def __init__(self, top_k: int = 40, token_budget: int = 12000):
+        self.top_k = top_k
+        self.token_budget = token_budget
+
+    def scores(self, query: str, docs: List[Dict]) -> np.ndarray:
+        query_terms = list(dict.fromkeys(_terms(query)))
+        if not docs or not query_terms:
+            return np.zeros(len(docs))
+        column = {term: j for j, term in enumerate(query_terms)}
+
+        tf = np.zeros((len(docs), len(query_terms)))
+        lengths = np.zeros(len(docs))
+        for i, doc in enumerate(docs):
+            for part, fields in (("title", TITLE_FIELDS), ("description", DESCRIPTION_FIELDS), ("tags", TAG_FIELDS)):
+                terms = _terms(_field_text(doc, fields))
+                weight = FIELD_WEIGHTS[part]
+                lengths[i] += weight * len(terms)
+                for term in terms:
+                    j = column.get(term)
+                    if j is not None:
+                        tf[i, j] += weight
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+        return (idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+    def select(self, query: str, docs: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """(kept documents with their scores, most relevant first; a report of the cut)"""
+        scores = self.scores(query, docs)
+        # Stable, so ties (and unmatched documents) stay in search order
+        order = np.argsort(-scores, kind="stable")
+
+        kept, used = [], 0
+        for i in order:
+            if self.top_k and len(kept) >= self.top_k:
+                break
+            doc = {**docs[i], "relevance_score": round(float(scores[i]), 4)}
+            cost = estimate_tokens(doc)
+            if self.token_budget and used + cost > self.token_budget:
+                continue
+            kept.append(doc)
+            used += cost
+
+        report = {
+            "documents_considered": len(docs),
+            "documents_kept": len(kept),
+            "estimated_tokens": used,
+            "token_budget": self.token_budget or None,
+            "top_k": self.top_k or None,
+        }
+        print(f"[Relevance] Kept {len(kept)}/{len(docs)} documents (~{used} tokens)")
+        return kept, report
+
+
+relevance_ranker = RelevanceRanker(
+    top_k=settings.SYNTHESIS_TOP_K,
+    token_budget=settings.SYNTHESIS_TOKEN_BUDGET,
+)
@@ -1,17 +1,27 @@
+import asyncio
 import json
+import re
 import time
-import requests
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import weakref
+import httpx
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from app.config.settings import settings
+from app.tools.browser_pool import USER_AGENT, browser_pool
+from app.tools.connector_registry import connector_registry
+from app.tools.html_parser import html_parser
+from app.tools.directory_index import DirectoryCrawler, directory_index
+from app.tools.entity_resolution import entity_resolver
+from app.utils.progress_events import emit_progress
+from app.utils.metrics import CONNECTOR_EMPTY_RESULTS, CONNECTOR_TIMEOUTS, atimed_fetch
+from app.utils.scrape_cache import scrape_cache
+from app.utils.http_cache import http_cache
+from app.utils.connector_health import connector_health
 
 # Configuration constants
 PH_API_TOKEN = settings.PH_API_TOKEN  
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # Scraping limits for optimal performance (tuned by 30+ years experience)
 # 20-25 is optimal: Balances coverage, execution time (~60-90 sec), and data quality
@@ -19,209 +29,566 @@ USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 YC_SCRAPE_LIMIT = 50  # Y Combinator: 20 startups = ~60-80 sec execution
 THUB_SCRAPE_LIMIT = 50  # T-Hub: 20 startups = ~60-80 sec execution
 
+# Hard deadline for one browser scrape; partial results are kept
+SCRAPE_TIMEOUT = 120
+# Deadline for a full-directory harvest by the index crawler
+DIRECTORY_CRAWL_TIMEOUT = 900
+# Per-source deadline for the async search path
+SOURCE_TIMEOUT = 130
+# Time a connector gets past its own deadline to close its browser page and
+# return partial results before it is cancelled
+DEADLINE_GRACE = 5
+# Devpost project pages: parallel fetches per host, per-request timeout, and
+# an overall deadline after which the pages fetched so far are returned
+DEVPOST_MAX_PER_HOST = 8
+DEVPOST_REQUEST_TIMEOUT = 15
+DEVPOST_DEADLINE = 30
+# HTTP-first directory extraction: per-request timeout, how long YC's public
+# Algolia search credentials (read from the companies page) are reused, and
+# the largest Algolia page
+DIRECTORY_HTTP_TIMEOUT = 15
+ALGOLIA_OPTS_TTL = 3600
+ALGOLIA_MAX_HITS_PER_PAGE = 1000
+# Product Hunt: posts per GraphQL page (the API's cap), pages per topic, topics
+# searched per query and topic names kept per post
+PH_PAGE_SIZE = 20
+PH_MAX_PAGES = 5
+PH_MAX_TOPICS = 3
+PH_MAX_TAGS = 5
+PH_STOPWORDS = frozenset(("and", "for", "the", "with", "app", "apps", "tool", "tools", "startup", "startups", "platform", "using", "based"))
+# Browser waits on DOM conditions: first cards after load, more cards after a scroll/page change
+FIRST_CARDS_TIMEOUT_MS = 15000
+MORE_CARDS_TIMEOUT_MS = 5000
+
+
+def _directory_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(headers={'User-Agent': USER_AGENT}, timeout=DIRECTORY_HTTP_TIMEOUT, follow_redirects=True)
+
+
+async def _first_matching(page, selectors: List[str], timeout: int = FIRST_CARDS_TIMEOUT_MS) -> Optional[str]:
+    """Waits until any of `selectors` matches and returns the first that does"""
+    try:
+        await page.wait_for_selector(", ".join(selectors), timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    for selector in selectors:
+        if await page.locator(selector).count() > 0:
+            return selector
+    return None
+
+
+async def _wait_for_more(page, selector: str, seen: int, timeout: int = MORE_CARDS_TIMEOUT_MS) -> bool:
+    """Waits until more than `seen` elements match `selector`"""
+    try:
+        await page.wait_for_function(
+            "([sel, n]) => document.querySelectorAll(sel).length > n",
+            arg=[selector, seen],
+            timeout=timeout
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def _wait_for_change(page, selector: str, first_text: Optional[str], timeout: int = MORE_CARDS_TIMEOUT_MS) -> bool:
+    """Waits until the first `selector` match shows different content (next page rendered)"""
+    try:
+        await page.wait_for_function(
+            "([sel, prev]) => { const el = document.querySelector(sel); return !!el && el.textContent !== prev; }",
+            arg=[selector, first_text],
+            timeout=timeout
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
 class BaseConnector(ABC):
+    # Registry name (also the metric/cache label) and extra `sources` keys
+    name: str = ""
+    aliases: Tuple[str, ...] = ()
+    # What a live fetch spends: "browser", "http", "api" or "none" (no I/O)
+    cost: str = "none"
+    # Scheduler limits across all analyses; 0 = unlimited
+    requests_per_minute: int = 0
+    max_concurrency: int = 0
+    # Cap on the per-source limit requested by search_all; 0 = no cap
+    max_limit: int = 0
+    # afetch_signals takes a `deadline` in seconds and returns what it has
+    # gathered by then instead of being cancelled
+    accepts_deadline: bool = False
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> Optional[List]:
+        """Results from local data that need no live fetch, or None"""
+        return None
+
     @abstractmethod
     def fetch_signals(self, query: str, limit: int = 5) -> List:
         pass
 
+    async def afetch_signals(self, query: str, limit: int = 5, fresh: bool = False) -> List:
+        """
+        Async variant used by the analysis pipeline. Connectors without a
+        native implementation run fetch_signals in a worker thread.
+        `fresh` has connectors with a local index or HTTP cache go back to
+        the source instead.
+        """
+        return await asyncio.to_thread(self.fetch_signals, query, limit)
+
 class YCombinatorConnector(BaseConnector):
     """
     Implements the 'Scroll and Wait' pattern to harvest YC Company data.
     Optimized: Limits scraping to first 30 links for performance efficiency.
-    Thread-safe: Runs in isolated thread to prevent AsyncIO event loop blocking.
+    Async: Runs on the shared browser pool and is cancelled at its deadline.
+    HTTP-first: queries the Algolia index behind the directory page and only
+    drives a browser when that returns nothing.
     """
+    name = "YC"
+    aliases = ("yc",)
+    # Browser fallbacks still queue on the browser pool
+    cost = "http" if settings.DIRECTORY_HTTP_FIRST else "browser"
+    requests_per_minute = 10
+    max_concurrency = 2
+    max_limit = YC_SCRAPE_LIMIT
+    accepts_deadline = True
+    # Overridable to point the HTTP path at a local stub; algolia_url
+    # defaults to the app's own host from the page's credentials
+    base_url = "https://www.ycombinator.com"
+    algolia_url: Optional[str] = None
+    algolia_index = "YCCompany_production"
+
+    def __init__(self):
+        self._algolia_opts: Optional[Dict] = None
+        self._algolia_fetched_at = 0.0
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> Optional[List]:
+        # Answer from the local directory index while it is fresh
+        return directory_index.lookup("YC", query, limit or YC_SCRAPE_LIMIT) or None
+
     def fetch_signals(self, query: str, limit: int = YC_SCRAPE_LIMIT) -> List:
+        # Blocking entry point for the sync search helpers
+        return asyncio.run(self.afetch_signals(query, limit))
+
+    async def afetch_signals(
+        self, query: str, limit: int = YC_SCRAPE_LIMIT, fresh: bool = False, deadline: float = SCRAPE_TIMEOUT
+    ) -> List:
+        indexed = None if fresh else self.lookup(query, limit)
+        if indexed:
+            return indexed
+        started = time.monotonic()
         # Apply global limit cap
         limit = min(limit, YC_SCRAPE_LIMIT)
+        if settings.DIRECTORY_HTTP_FIRST:
+            results, _ = await self._fetch_http(query, limit)
+            if results:
+                directory_index.upsert("YC", results)
+                return results
+        # The browser fallback gets what is left of the deadline
+        results, _ = await self._scrape(query, limit, timeout=max(0.0, deadline - (time.monotonic() - started)))
+        return results
+
+    async def crawl(self, limit: int) -> Tuple[List, bool]:
+        """Harvests the unfiltered directory for the local index; also says whether it read all of it"""
+        if settings.DIRECTORY_HTTP_FIRST:
+            results, complete = await self._fetch_http("", limit)
+            if results:
+                return results, complete
+        return await self._scrape("", limit, max_scroll_attempts=limit // 10 + 1, timeout=DIRECTORY_CRAWL_TIMEOUT)
+
+    async def _fetch_http(self, query: str, limit: int) -> Tuple[List, bool]:
+        """
+        Company search straight from Algolia, and whether every hit was read;
+        no results sends the caller to the browser.
+        """
         results = []
-        error = None
+        complete = False
+        try:
+            async with _directory_client() as client:
+                opts = await self._algolia_credentials(client)
+                if opts is None:
+                    print("[YC] No Algolia credentials on the directory page, falling back to the browser")
+                    return [], False
+                algolia_url = self.algolia_url or f"https://{opts['app']}-dsn.algolia.net"
+                search_url = f"{algolia_url}/1/indexes/{self.algolia_index}/query"
+                page = 0
+                while len(results) < limit:
+                    response = await client.post(
+                        search_url,
+                        headers={"X-Algolia-Application-Id": opts["app"], "X-Algolia-API-Key": opts["key"]},
+                        json={"query": query, "hitsPerPage": min(limit, ALGOLIA_MAX_HITS_PER_PAGE), "page": page}
+                    )
+                    if response.status_code in (401, 403):
+                        # Credentials rotated; read them from the page again next time
+                        self._algolia_opts = None
+                    response.raise_for_status()
+                    payload = response.json()
+                    results.extend(self._from_hit(hit) for hit in payload.get("hits", []) if hit.get("name"))
+                    page += 1
+                    if page >= payload.get("nbPages", 0):
+                        # Algolia stops paging at its pagination cap, so the
+                        # last page only ends the directory if nbHits agrees
+                        complete = len(results) >= payload.get("nbHits", len(results))
+                        break
+        except Exception as e:
+            print(f"[YC] HTTP extraction failed, falling back to the browser: {e}")
+            return [], False
+        print(f"[YC] HTTP extraction: {len(results[:limit])} startups")
+        return results[:limit], complete and len(results) <= limit
 
-        def run_scrape():
-            nonlocal results, error
-            try:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True, slow_mo=500)
-                    page = browser.new_page(user_agent=USER_AGENT)
-                    
-                    url = f"https://www.ycombinator.com/companies?q={query}"
-                    print(f"[YC] Scraping: {url} | Max limit: {limit}")
-                    page.goto(url, timeout=30000)
-                    
-                    # Optimized scroll logic with early termination
-                    previous_height = 0
-                    scroll_attempts = 0
-                    max_scroll_attempts = 5  # Prevent infinite scrolling
-                    
-                    while len(results) < limit and scroll_attempts < max_scroll_attempts:
-                        company_cards = page.locator('a._company_86jzd_338').all()
-                        
-                        if not company_cards:
-                            company_cards = page.locator('a[href^="/companies/"]').all()
+    async def _algolia_credentials(self, client: httpx.AsyncClient) -> Optional[Dict]:
+        """The search-only app id and key the directory page embeds for its own queries"""
+        if self._algolia_opts is not None and time.monotonic() - self._algolia_fetched_at < ALGOLIA_OPTS_TTL:
+            return self._algolia_opts
+        response = await client.get(f"{self.base_url}/companies")
+        response.raise_for_status()
+        match = re.search(r"AlgoliaOpts\s*=\s*(\{.*?\})", response.text)
+        opts = json.loads(match.group(1)) if match else None
+        if not opts or not opts.get("app") or not opts.get("key"):
+            return None
+        self._algolia_opts, self._algolia_fetched_at = opts, time.monotonic()
+        return opts
 
-                        for card in company_cards:
-                            if len(results) >= limit: 
-                                break
-                            
-                            try:
-                                name = card.locator('.coName').first.text_content()
-                                desc = card.locator('.coDescription').first.text_content()
-                                
-                                if card.locator('.coBatch').count() > 0:
-                                    batch = card.locator('.coBatch').first.text_content()
-                                else:
-                                    batch = "Unknown"
-                                
-                                # Deduplication
-                                if not any(r['name'] == name for r in results):
-                                    results.append({
-                                        "source": "Y Combinator",
-                                        "type": "supply_signal",
-                                        "name": name,
-                                        "description": desc,
-                                        "batch": batch,
-                                        "url": f"https://www.ycombinator.com{card.get_attribute('href')}"
-                                    })
-                            except Exception:
-                                continue
+    def _from_hit(self, hit: Dict) -> Dict:
+        return {
+            "source": "Y Combinator",
+            "type": "supply_signal",
+            "name": hit["name"],
+            "description": hit.get("one_liner") or "",
+            "batch": hit.get("batch") or "Unknown",
+            "url": f"{self.base_url}/companies/{hit.get('slug') or ''}"
+        }
 
-                        if len(results) >= limit:
-                            break
+    async def _scrape(self, query: str, limit: int, max_scroll_attempts: int = 5, timeout: float = SCRAPE_TIMEOUT) -> Tuple[List, bool]:
+        """
+        Scrolls the directory for company cards. The infinite scroll has no end
+        marker (no new cards may just be a slow page), so a scrape never
+        reports that it read the whole directory.
+        """
+        results = []
+        # Names already kept, for constant-time deduplication
+        names = set()
+
+        async def run_scrape():
+            async with browser_pool.page() as page:
+                url = f"{self.base_url}/companies?q={query}"
+                print(f"[YC] Scraping: {url} | Max limit: {limit}")
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                
+                # Wait for the first cards to render rather than a fixed delay
+                selector = await _first_matching(page, ['a._company_86jzd_338', 'a[href^="/companies/"]'])
+                if selector is None:
+                    return
+                
+                # Optimized scroll logic with early termination
+                seen = 0
+                scroll_attempts = 0  # Capped by max_scroll_attempts to prevent infinite scrolling
+                
+                while len(results) < limit and scroll_attempts < max_scroll_attempts:
+                    company_cards = await page.locator(selector).all()
+                    new_cards, seen = company_cards[seen:], len(company_cards)
 
-                        # Smart scroll with timeout
-                        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                        page.wait_for_timeout(1000)
+                    for card in new_cards:
+                        if len(results) >= limit: 
+                            break
                         
-                        new_height = page.evaluate("document.body.scrollHeight")
-                        if new_height == previous_height:
-                            break 
-                        previous_height = new_height
-                        scroll_attempts += 1
-                    
-                    browser.close()
-                    print(f"[YC] Completed: Scraped {len(results)} startups")
-                    
-            except Exception as e:
-                error = e
-                print(f"[YC] Error: {str(e)}")
-
-        # Run in isolated thread to avoid AsyncIO blocking
-        t = threading.Thread(target=run_scrape)
-        t.daemon = False
-        t.start()
-        t.join(timeout=120)  # 2-minute timeout per scraper thread
-        
-        if error:
-            print(f"[YC] Scraping failed: {error}")
-            return []
+                        try:
+                            name = await card.locator('.coName').first.text_content()
+                            desc = await card.locator('.coDescription').first.text_content()
+                            
+                            if await card.locator('.coBatch').count() > 0:
+                                batch = await card.locator('.coBatch').first.text_content()
+                            else:
+                                batch = "Unknown"
+                            
+                            # Deduplication
+                            if name not in names:
+                                names.add(name)
+                                results.append({
+                                    "source": "Y Combinator",
+                                    "type": "supply_signal",
+                                    "name": name,
+                                    "description": desc,
+                                    "batch": batch,
+                                    "url": f"{self.base_url}{await card.get_attribute('href')}"
+                                })
+                        except Exception:
+                            continue
 
-        return results[:limit]
+                    if len(results) >= limit:
+                        break
+
+                    # Scroll and wait for the next batch of cards; none means the list ended
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    if not await _wait_for_more(page, selector, seen):
+                        break
+                    scroll_attempts += 1
+
+        # Hard deadline: the scrape is cancelled and its browser context closed
+        try:
+            await asyncio.wait_for(run_scrape(), timeout=timeout)
+            print(f"[YC] Completed: Scraped {len(results)} startups")
+        except asyncio.TimeoutError:
+            print("[YC] Scrape timed out, returning partial results")
+            CONNECTOR_TIMEOUTS.labels("YC").inc()
+        except Exception as e:
+            print(f"[YC] Scraping failed: {e}")
+            raise
+
+        # Live results keep the index current between crawls
+        directory_index.upsert("YC", results)
+        return results[:limit], False
 
 class ProductHuntConnector(BaseConnector):
     """
     Implements GraphQL v2 API to fetch high-velocity launches.
+
+    The API has no post search, so the query is matched to topics first
+    (one batched lookup) and the top-voted posts in those topics are paged
+    by cursor up to the limit.
     """
-    def fetch_signals(self, query: str, limit: int = 5) -> List:
+    name = "Product Hunt"
+    aliases = ("ph", "producthunt")
+    cost = "api"
+    requests_per_minute = 30
+    max_concurrency = 2
+    url = "https://api.producthunt.com/v2/api/graphql"
+
+    def _has_token(self) -> bool:
         # Check if token is missing or default
         if not PH_API_TOKEN or PH_API_TOKEN == "YOUR_PRODUCT_HUNT_DEVELOPER_TOKEN":
             print("Warning: Product Hunt API Token missing.")
-            return []
+            return False
+        return True
 
-        url = "https://api.producthunt.com/v2/api/graphql"
-        headers = {"Authorization": f"Bearer {PH_API_TOKEN}"}
-        
-        graphql_query = """
-        {
-          posts(first: %d, order: VOTES_COUNT) {
-            edges {
-              node {
-                name
-                tagline
-                description
-                votesCount
-                commentsCount
-                website
-                topics {
-                  edges {
-                    node {
-                      name
-                    }
-                  }
-                }
-              }
-            }
-          }
+    def _search_terms(self, query: str) -> List[str]:
+        """The whole query plus its longest keywords, each looked up as a topic"""
+        words = [w for w in re.findall(r"[\w+#.-]+", query.lower()) if len(w) > 1 and w not in PH_STOPWORDS]
+        keywords = sorted(dict.fromkeys(words), key=len, reverse=True)[:PH_MAX_TOPICS]
+        phrase = " ".join(words)
+        return list(dict.fromkeys(([phrase] if phrase else []) + keywords))
+
+    def _topics_query(self, terms: List[str]) -> Tuple[str, Dict]:
+        # One aliased field per term, so all topic lookups share a request
+        fields = "\n".join(
+            f"t{i}: topics(query: $q{i}, first: 2, order: FOLLOWERS_COUNT) {{ edges {{ node {{ slug }} }} }}"
+            for i in range(len(terms))
+        )
+        params = ", ".join(f"$q{i}: String" for i in range(len(terms)))
+        return f"query Topics({params}) {{\n{fields}\n}}", {f"q{i}": term for i, term in enumerate(terms)}
+
+    def _posts_query(self, cursors: Dict[int, Optional[str]], slugs: List[Optional[str]], page_size: int) -> Tuple[str, Dict]:
+        # Only the fields _normalize reads; one aliased connection per topic, each at its own cursor
+        fields = "\n".join(
+            f"p{i}: posts(first: $first, topic: $topic{i}, after: $after{i}, order: VOTES) "
+            "{ pageInfo { endCursor hasNextPage } edges { node { ...PostFields } } }"
+            for i in cursors
+        )
+        params = ", ".join(["$first: Int"] + [f"$topic{i}: String, $after{i}: String" for i in cursors])
+        variables = {"first": page_size}
+        for i, cursor in cursors.items():
+            variables[f"topic{i}"] = slugs[i]
+            variables[f"after{i}"] = cursor
+        query = (
+            f"query Posts({params}) {{\n{fields}\n}}\n"
+            "fragment PostFields on Post { id name tagline votesCount commentsCount website "
+            f"topics(first: {PH_MAX_TAGS}) {{ edges {{ node {{ name }} }} }} }}"
+        )
+        return query, variables
+
+    def _normalize(self, node: dict) -> Dict:
+        topics = [t['node']['name'] for t in node['topics']['edges']]
+        return {
+            "source": "Product Hunt",
+            "type": "market_velocity",
+            "name": node['name'],
+            "pitch": node['tagline'],
+            "metrics": f"{node['votesCount']} votes, {node['commentsCount']} comments",
+            "tags": topics,
+            "url": node['website']
         }
-        """ % limit
+
+    async def _graphql(
+        self, client: httpx.AsyncClient, kind: str, query: str, variables: Dict, fresh: bool = False
+    ) -> Optional[Dict]:
+        # Identical queries are answered or revalidated by the HTTP cache, sparing the API quota
+        headers = {"Authorization": f"Bearer {PH_API_TOKEN}"}
+        response = await http_cache.request(
+            client, "POST", self.url, fresh=fresh, json={'query': query, 'variables': variables}, headers=headers
+        )
+        if response.status_code != 200:
+            print(f"Product Hunt API Error: {response.status_code}")
+            return None
+        payload = http_cache.parsed(response, kind, json.loads)
+        if payload.get('errors'):
+            print(f"Product Hunt API Error: {payload['errors'][0].get('message')}")
+        return payload.get('data') or None
+
+    async def _topic_slugs(self, client: httpx.AsyncClient, query: str, fresh: bool = False) -> List[str]:
+        terms = self._search_terms(query)
+        if not terms:
+            return []
+        data = await self._graphql(client, "product_hunt_topics", *self._topics_query(terms), fresh=fresh)
+        slugs = []
+        for i in range(len(terms)):
+            for edge in ((data or {}).get(f"t{i}") or {}).get('edges', []):
+                slugs.append(edge['node']['slug'])
+        return list(dict.fromkeys(slugs))[:PH_MAX_TOPICS]
+
+    async def _posts(
+        self, client: httpx.AsyncClient, slugs: List[Optional[str]], limit: int, fresh: bool = False
+    ) -> List[Dict]:
+        """Top-voted posts across `slugs`, paging every topic by cursor until `limit` are collected"""
+        posts: Dict[str, Dict] = {}
+        cursors: Dict[int, Optional[str]] = {i: None for i in range(len(slugs))}
+        for _ in range(PH_MAX_PAGES):
+            if not cursors or len(posts) >= limit:
+                break
+            page_size = min(PH_PAGE_SIZE, limit - len(posts))
+            data = await self._graphql(
+                client, "product_hunt_posts", *self._posts_query(cursors, slugs, page_size), fresh=fresh
+            )
+            if data is None:
+                break
+            for i in list(cursors):
+                connection = data.get(f"p{i}") or {}
+                for edge in connection.get('edges', []):
+                    posts.setdefault(edge['node']['id'], edge['node'])
+                page_info = connection.get('pageInfo') or {}
+                if page_info.get('hasNextPage') and page_info.get('endCursor'):
+                    cursors[i] = page_info['endCursor']
+                else:
+                    del cursors[i]
+        ranked = sorted(posts.values(), key=lambda node: node['votesCount'], reverse=True)
+        return ranked[:limit]
+
+    def fetch_signals(self, query: str, limit: int = 5) -> List:
+        # Blocking entry point for the sync search helpers
+        return asyncio.run(self.afetch_signals(query, limit))
+
+    async def afetch_signals(self, query: str, limit: int = 5, fresh: bool = False) -> List:
+        if not self._has_token():
+            return []
 
         try:
-            response = requests.post(url, json={'query': graphql_query}, headers=headers)
-            if response.status_code != 200:
-                print(f"Product Hunt API Error: {response.status_code}")
-                return []
-
-            data = response.json().get('data', {}).get('posts', {}).get('edges', [])
-            normalized = []
-            
-            for edge in data:
-                node = edge['node']
-                topics = [t['node']['name'] for t in node['topics']['edges']]
-                normalized.append({
-                    "source": "Product Hunt",
-                    "type": "market_velocity",
-                    "name": node['name'],
-                    "pitch": node['tagline'],
-                    "metrics": f"{node['votesCount']} votes, {node['commentsCount']} comments",
-                    "tags": topics,
-                    "url": node['website']
-                })
-            return normalized
+            async with httpx.AsyncClient(timeout=30) as client:
+                # Posts in the topics matching the query; overall top posts when none match
+                slugs = await self._topic_slugs(client, query, fresh) or [None]
+                posts = await self._posts(client, slugs, limit, fresh)
+            return [self._normalize(node) for node in posts]
         except Exception as e:
             print(f"Product Hunt connection failed: {e}")
-            return []
+            raise
 
 class DevpostConnector(BaseConnector):
     """
     Scrapes 'Built With' tags to identify Technical Momentum.
     """
+    name = "Devpost"
+    aliases = ("devpost",)
+    cost = "http"
+    requests_per_minute = 20
+    max_concurrency = 3
+    accepts_deadline = True
+    # Only the subtrees these selectors read are parsed
+    parser = html_parser
+    search_url = "https://devpost.com/software/search"
+
+    def __init__(self):
+        # Per-host caps on project page fetches, shared by every search on a
+        # loop: {loop: {host: Semaphore}}
+        self._host_slots = weakref.WeakKeyDictionary()
+
+    def _project_links(self, html: str, limit: Optional[int]) -> List[str]:
+        # Selector might need maintenance as Devpost updates UI
+        doc = self.parser.parse(html, targets=('.link-to-software',))
+        return doc.attrs('.link-to-software', 'href')[:limit]
+
+    def _parse_project(self, html: str, link: str) -> Dict:
+        doc = self.parser.parse(html, targets=('#app-title', '.large.mb-4', '#built-with li'))
+        
+        title = doc.text('#app-title', default="Unknown")
+        tagline = doc.text('.large.mb-4')
+        
+        built_with = doc.texts('#built-with li')
+        
+        return {
+            "source": "Devpost",
+            "type": "technical_signal",
+            "name": title,
+            "tagline": tagline,
+            "tech_stack": built_with,
+            "url": link
+        }
+
     def fetch_signals(self, query: str, limit: int = 5) -> List:
-        search_url = f"https://devpost.com/software/search?query={query}"
+        # Blocking entry point for the sync search helpers
+        return asyncio.run(self.afetch_signals(query, limit))
+
+    async def afetch_signals(self, query: str, limit: int = 5, fresh: bool = False, deadline: float = DEVPOST_DEADLINE) -> List:
+        started = time.monotonic()
         try:
-            resp = requests.get(search_url, headers={'User-Agent': USER_AGENT})
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            projects = []
-            # Selector might need maintenance as Devpost updates UI
-            project_links = [a['href'] for a in soup.select('.link-to-software')][:limit]
-            
-            for link in project_links:
-                try:
-                    p_resp = requests.get(link, headers={'User-Agent': USER_AGENT})
-                    p_soup = BeautifulSoup(p_resp.text, 'html.parser')
-                    
-                    title = p_soup.select_one('#app-title').text.strip() if p_soup.select_one('#app-title') else "Unknown"
-                    tagline = p_soup.select_one('.large.mb-4').text.strip() if p_soup.select_one('.large.mb-4') else ""
-                    
-                    built_with = [li.text.strip() for li in p_soup.select('#built-with li')]
-                    
-                    projects.append({
-                        "source": "Devpost",
-                        "type": "technical_signal",
-                        "name": title,
-                        "tagline": tagline,
-                        "tech_stack": built_with,
-                        "url": link
-                    })
-                except Exception:
-                    continue
-            return projects
+            # One keep-alive pool for the search page and every project page
+            async with httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                timeout=DEVPOST_REQUEST_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=DEVPOST_MAX_PER_HOST, max_keepalive_connections=DEVPOST_MAX_PER_HOST)
+            ) as client:
+                # params= URL-encodes the query (spaces, &, #, ...)
+                resp = await http_cache.request(client, "GET", self.search_url, fresh=fresh, params={"query": query})
+                project_links = http_cache.parsed(resp, "devpost_search", lambda html: self._project_links(html, None))
+                # Project pages get what is left of the deadline
+                remaining = min(DEVPOST_DEADLINE, deadline - (time.monotonic() - started))
+                return await self._fetch_projects(client, project_links[:limit], fresh, deadline=max(0.0, remaining))
         except Exception as e:
             print(f"Devpost scraping failed: {e}")
+            raise
+
+    async def _fetch_projects(
+        self, client: httpx.AsyncClient, links: List[str], fresh: bool = False, deadline: float = DEVPOST_DEADLINE
+    ) -> List:
+        """
+        Fetches project pages concurrently, at most DEVPOST_MAX_PER_HOST per
+        host across all concurrent searches. Pages still pending at
+        `deadline` are cancelled and the ones already parsed are returned in
+        search order.
+        """
+        if not links:
             return []
+        host_slots = self._host_slots.setdefault(asyncio.get_running_loop(), {})
+
+        async def fetch(link):
+            host = urlsplit(link).hostname or ""
+            slots = host_slots.get(host)
+            if slots is None:
+                slots = host_slots[host] = asyncio.Semaphore(DEVPOST_MAX_PER_HOST)
+            async with slots:
+                p_resp = await http_cache.request(client, "GET", link, fresh=fresh)
+            # Unchanged pages (fresh or 304) reuse the earlier parse
+            return http_cache.parsed(p_resp, "devpost_project", lambda html: self._parse_project(html, link))
+
+        tasks = [asyncio.create_task(fetch(link)) for link in links]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled requests unwind before the client closes
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if pending:
+            print(f"[Devpost] Deadline hit, returning {len(done)} of {len(tasks)} projects")
+
+        return [
+            task.result() for task in tasks
+            if task in done and not task.cancelled() and task.exception() is None
+        ]
 
 class RedditDorkGenerator(BaseConnector):
     """
     Generates 'Google Dork' URLs for high-intent social listening.
     """
+    name = "Reddit"
+    aliases = ("reddit",)
+
     def fetch_signals(self, query: str, limit: int = 5) -> List:
         dorks = [
             {"source": "Reddit", "type": "social_signal", "dork": f'site:reddit.com "{query}" "I hate doing"'},
@@ -231,193 +598,462 @@ class RedditDorkGenerator(BaseConnector):
         ]
         return dorks
 
+    async def afetch_signals(self, query: str, limit: int = 5, fresh: bool = False) -> List:
+        # Pure string building, no I/O to offload
+        return self.fetch_signals(query, limit)
+
 class THubConnector(BaseConnector):
     """
     Scrapes T-Hub (India's premier startup incubator) for emerging startups.
-    Optimized: Thread-safe implementation with pagination limits.
+    Optimized: Async scrape on the shared browser pool with pagination limits.
     Focus: Early-stage Indian startups and deep-tech innovations.
+    HTTP-first: reads the server-rendered directory HTML and only drives a
+    browser when it holds no startup cards.
     """
+    name = "T-Hub"
+    aliases = ("thub",)
+    # Browser fallbacks still queue on the browser pool
+    cost = "http" if settings.DIRECTORY_HTTP_FIRST else "browser"
+    requests_per_minute = 10
+    max_concurrency = 2
+    max_limit = THUB_SCRAPE_LIMIT
+    accepts_deadline = True
+    # Overridable to point the HTTP path at a local stub
+    base_url = "https://www.t-hub.co"
+    card_selectors = ['div[class*="startup-card"]', 'a[href*="/startups/"]']
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> Optional[List]:
+        # Answer from the local directory index while it is fresh
+        return directory_index.lookup("T-Hub", query, limit or THUB_SCRAPE_LIMIT) or None
+
     def fetch_signals(self, query: str, limit: int = THUB_SCRAPE_LIMIT) -> List:
+        # Blocking entry point for the sync search helpers
+        return asyncio.run(self.afetch_signals(query, limit))
+
+    async def afetch_signals(
+        self, query: str, limit: int = THUB_SCRAPE_LIMIT, fresh: bool = False, deadline: float = SCRAPE_TIMEOUT
+    ) -> List:
+        indexed = None if fresh else self.lookup(query, limit)
+        if indexed:
+            return indexed
+        started = time.monotonic()
         limit = min(limit, THUB_SCRAPE_LIMIT)
+        if settings.DIRECTORY_HTTP_FIRST:
+            results, _ = await self._fetch_http(query, limit)
+            if results:
+                directory_index.upsert("T-Hub", results)
+                return results
+        # The browser fallback gets what is left of the deadline
+        results, _ = await self._scrape(query, limit, timeout=max(0.0, deadline - (time.monotonic() - started)))
+        return results
+
+    async def crawl(self, limit: int) -> Tuple[List, bool]:
+        """Harvests the unfiltered directory for the local index; also says whether it read all of it"""
+        max_pages = limit // 15 + 1
+        if settings.DIRECTORY_HTTP_FIRST:
+            results, complete = await self._fetch_http("", limit, max_pages=max_pages)
+            if results:
+                return results, complete
+        return await self._scrape("", limit, max_pages=max_pages, timeout=DIRECTORY_CRAWL_TIMEOUT)
+
+    async def _fetch_http(self, query: str, limit: int, max_pages: int = 2) -> Tuple[List, bool]:
+        """
+        Startup cards from the server-rendered directory pages, and whether
+        paging reached the end; no results sends the caller to the browser.
+        """
         results = []
-        error = None
+        seen = set()
+        complete = False
+        try:
+            async with _directory_client() as client:
+                for page in range(1, max_pages + 1):
+                    params = {"search": query} if page == 1 else {"search": query, "page": page}
+                    response = await client.get(f"{self.base_url}/startups", params=params)
+                    response.raise_for_status()
+                    cards = self._parse_cards(response.text)
+                    new_cards = [card for card in cards if card["name"] not in seen]
+                    if not new_cards:
+                        # Only an empty page marks the end; one that repeats
+                        # earlier cards may be a server ignoring `page`
+                        complete = not cards
+                        break
+                    for card in new_cards:
+                        seen.add(card["name"])
+                        results.append(card)
+                    if len(results) >= limit:
+                        break
+        except Exception as e:
+            print(f"[T-Hub] HTTP extraction failed, falling back to the browser: {e}")
+            return [], False
+        if not results:
+            print("[T-Hub] No startup cards in the directory HTML, falling back to the browser")
+        else:
+            print(f"[T-Hub] HTTP extraction: {len(results[:limit])} startups")
+        return results[:limit], complete
 
-        def run_scrape():
-            nonlocal results, error
-            try:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True, slow_mo=500)
-                    page = browser.new_page(user_agent=USER_AGENT)
-                    
-                    # T-Hub startup directory search
-                    url = f"https://www.t-hub.co/startups?search={query}"
-                    print(f"[T-Hub] Scraping: {url} | Max limit: {limit}")
-                    page.goto(url, timeout=30000)
-                    page.wait_for_timeout(2000)
-                    
-                    # Pagination handling for T-Hub
-                    pages_scanned = 0
-                    max_pages = 2  # Limit to 2 pages (~30 startups)
-                    
-                    while len(results) < limit and pages_scanned < max_pages:
-                        try:
-                            # T-Hub startup cards selector
-                            startup_cards = page.locator('div[class*="startup-card"]').all()
-                            
-                            if not startup_cards:
-                                startup_cards = page.locator('a[href*="/startups/"]').all()
-                            
-                            for card in startup_cards:
-                                if len(results) >= limit:
-                                    break
-                                
-                                try:
-                                    # Extract startup info from T-Hub card
-                                    name_elem = card.locator('h3, h4, [class*="name"]').first
-                                    name = name_elem.text_content().strip() if name_elem.is_visible() else "Unknown"
-                                    
-                                    desc_elem = card.locator('p, [class*="description"]').first
-                                    description = desc_elem.text_content().strip() if desc_elem and desc_elem.is_visible() else "N/A"
-                                    
-                                    url_attr = card.get_attribute('href') or ""
-                                    
-                                    # Deduplication
-                                    if name != "Unknown" and not any(r['name'] == name for r in results):
-                                        results.append({
-                                            "source": "T-Hub",
-                                            "type": "supply_signal",
-                                            "name": name,
-                                            "description": description[:150],
-                                            "category": "Indian Startup",
-                                            "url": url_attr if url_attr.startswith('http') else f"https://www.t-hub.co{url_attr}"
-                                        })
-                                except Exception as e:
-                                    continue
-                            
+    def _parse_cards(self, html: str) -> List[Dict]:
+        # Same card selectors and fields as the browser scrape
+        doc = html_parser.parse(html)
+        cards = []
+        for selector in self.card_selectors:
+            cards = doc.each(selector)
+            if cards:
+                break
+        results = []
+        for card in cards:
+            name = card.text('h3, h4, [class*="name"]', default="Unknown")
+            if not name or name == "Unknown":
+                continue
+            url_attr = card.attr('href') or next(iter(card.attrs('a', 'href')), "")
+            results.append({
+                "source": "T-Hub",
+                "type": "supply_signal",
+                "name": name,
+                "description": card.text('p, [class*="description"]', default="N/A")[:150],
+                "category": "Indian Startup",
+                "url": url_attr if url_attr.startswith('http') else f"{self.base_url}{url_attr}"
+            })
+        return results
+
+    async def _scrape(self, query: str, limit: int, max_pages: int = 2, timeout: float = SCRAPE_TIMEOUT) -> Tuple[List, bool]:
+        """
+        Pages through the directory for startup cards, and says whether it got
+        past the last page. Only a missing Next button counts: a deadline, a
+        page that never changed or a pagination error leaves it partial.
+        """
+        results = []
+        # Names already kept, for constant-time deduplication
+        names = set()
+        complete = False
+
+        async def run_scrape():
+            nonlocal complete
+            async with browser_pool.page() as page:
+                # T-Hub startup directory search
+                url = f"{self.base_url}/startups?search={query}"
+                print(f"[T-Hub] Scraping: {url} | Max limit: {limit}")
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                
+                # Wait for the startup cards rather than a fixed delay
+                selector = await _first_matching(page, self.card_selectors)
+                if selector is None:
+                    return
+                
+                # Pagination handling for T-Hub
+                pages_scanned = 0  # max_pages defaults to 2 pages (~30 startups)
+                
+                while len(results) < limit and pages_scanned < max_pages:
+                    try:
+                        # T-Hub startup cards selector
+                        startup_cards = await page.locator(selector).all()
+                        
+                        for card in startup_cards:
                             if len(results) >= limit:
                                 break
                             
-                            # Navigate to next page if available
-                            next_btn = page.locator('a[aria-label*="next"], button:has-text("Next")').first
-                            if next_btn and next_btn.is_visible():
-                                next_btn.click()
-                                page.wait_for_timeout(1500)
-                                pages_scanned += 1
-                            else:
-                                break
+                            try:
+                                # Extract startup info from T-Hub card
+                                name_elem = card.locator('h3, h4, [class*="name"]').first
+                                name = (await name_elem.text_content()).strip() if await name_elem.is_visible() else "Unknown"
+                                
+                                desc_elem = card.locator('p, [class*="description"]').first
+                                description = (await desc_elem.text_content()).strip() if await desc_elem.is_visible() else "N/A"
+                                
+                                url_attr = await card.get_attribute('href') or ""
                                 
-                        except Exception as e:
-                            print(f"[T-Hub] Pagination error: {str(e)}")
+                                # Deduplication
+                                if name != "Unknown" and name not in names:
+                                    names.add(name)
+                                    results.append({
+                                        "source": "T-Hub",
+                                        "type": "supply_signal",
+                                        "name": name,
+                                        "description": description[:150],
+                                        "category": "Indian Startup",
+                                        "url": url_attr if url_attr.startswith('http') else f"{self.base_url}{url_attr}"
+                                    })
+                            except Exception as e:
+                                continue
+                        
+                        if len(results) >= limit:
                             break
-                    
-                    browser.close()
-                    print(f"[T-Hub] Completed: Scraped {len(results)} startups")
-                    
+                        
+                        # Navigate to next page if available
+                        next_btn = page.locator('a[aria-label*="next"], button:has-text("Next")').first
+                        if not await next_btn.is_visible():
+                            complete = True
+                            break
+                        first_text = await page.locator(selector).first.text_content()
+                        await next_btn.click()
+                        # Next page is ready once the first card changes
+                        if not await _wait_for_change(page, selector, first_text):
+                            break
+                        pages_scanned += 1
+                            
+                    except Exception as e:
+                        print(f"[T-Hub] Pagination error: {str(e)}")
+                        break
+
+        # Hard deadline: the scrape is cancelled and its browser context closed
+        try:
+            await asyncio.wait_for(run_scrape(), timeout=timeout)
+            print(f"[T-Hub] Completed: Scraped {len(results)} startups")
+        except asyncio.TimeoutError:
+            print("[T-Hub] Scrape timed out, returning partial results")
+            CONNECTOR_TIMEOUTS.labels("T-Hub").inc()
+            complete = False
+        except Exception as e:
+            print(f"[T-Hub] Connection error: {e}")
+            raise
+
+        # Live results keep the index current between crawls
+        directory_index.upsert("T-Hub", results)
+        return results[:limit], complete
+
+# Long-lived connector instances shared by every search; the order is the
+# order of results in search_all
+connector_registry.register(YCombinatorConnector())
+connector_registry.register(ProductHuntConnector())
+connector_registry.register(DevpostConnector())
+connector_registry.register(RedditDorkGenerator())
+connector_registry.register(THubConnector())
+
+# Background refreshes of stale cache entries, kept referenced until done
+_refresh_tasks = set()
+
+
+def _store(source: str, key: str, results: List) -> List:
+    # Empty results are not cached, so a query that found nothing is tried live again
+    if results:
+        scrape_cache.set(key, results, ttl=scrape_cache.ttl_for(source))
+    return results
+
+
+async def _afetch_live(source: str, connector, query: str, limit: Optional[int], fresh: bool = False) -> List:
+    """
+    Connector fetch behind the source's circuit breaker and the registry's
+    scheduler, feeding its health stats. Local index hits skip both; the
+    timeout, adapted to the source's observed p95, starts once the
+    scheduler has granted a slot. Connectors that accept a deadline get the
+    timeout as theirs and return partial results at it; the outer timeout
+    then only catches one that overruns it. `fresh` bypasses the index and
+    has the connector revalidate its HTTP cache.
+    """
+    indexed = None if fresh else connector.lookup(query, limit)
+    if indexed:
+        return indexed
+    connector_health.check(source)
+    timeout = connector_health.timeout_for(source, SOURCE_TIMEOUT)
+    deadline = timeout if connector.accepts_deadline else None
+    start = time.perf_counter()
+    try:
+        async with connector_registry.slot(connector):
+            start = time.perf_counter()
+            results = await asyncio.wait_for(
+                atimed_fetch(source, connector, query, limit, fresh, deadline=deadline),
+                timeout=timeout + DEADLINE_GRACE if deadline else timeout
+            )
+    except asyncio.TimeoutError:
+        CONNECTOR_TIMEOUTS.labels(source).inc()
+        connector_health.record(source, False, time.perf_counter() - start, timed_out=True)
+        raise asyncio.TimeoutError(f"timeout after {timeout:.1f}s") from None
+    except asyncio.CancelledError:
+        connector_health.abandon(source)
+        raise
+    except Exception:
+        connector_health.record(source, False, time.perf_counter() - start)
+        raise
+    # No matches is an answer, not an outage; only errors and timeouts trip the breaker
+    if not results:
+        CONNECTOR_EMPTY_RESULTS.labels(source).inc()
+    connector_health.record(source, True, time.perf_counter() - start, empty=not results)
+    return results
+
+
+async def acached_fetch(source: str, connector, query: str, limit: Optional[int] = None, fresh: bool = False) -> List:
+    """
+    Connector fetch through the scrape cache. Stale entries are returned at
+    once and refreshed in a background task; `fresh` skips the lookup.
+    Cached results are still served while the source's circuit is open.
+    """
+    key = scrape_cache.make_key(source, query, limit)
+    hit = None if fresh or scrape_cache.ttl_for(source) <= 0 else scrape_cache.get(key)
+    if hit is None:
+        return _store(source, key, await _afetch_live(source, connector, query, limit, fresh))
+
+    results, is_fresh = hit
+    if not is_fresh and scrape_cache.begin_refresh(key):
+        async def refresh():
+            try:
+                _store(source, key, await _afetch_live(source, connector, query, limit))
             except Exception as e:
-                error = e
-                print(f"[T-Hub] Connection error: {str(e)}")
-
-        # Execute in isolated thread
-        t = threading.Thread(target=run_scrape)
-        t.daemon = False
-        t.start()
-        t.join(timeout=120)  # 2-minute timeout
-        
-        if error:
-            print(f"[T-Hub] Scraping failed: {error}")
-            return []
+                print(f"[Scrape Cache] {source} refresh failed: {str(e)}")
+            finally:
+                scrape_cache.end_refresh(key)
 
-        return results[:limit]
+        task = asyncio.create_task(refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    return results
 
-def market_intel_search(query: str, sources: List[str] = ["yc", "ph", "devpost", "reddit", "thub"]):
+def market_intel_search(query: str, sources: List[str] = ["yc", "ph", "devpost", "reddit", "thub"], fresh: bool = False):
     """
     The Orchestrator function to be called by the Agent.
-    Multi-threaded execution for parallel source scraping.
+    Sources are resolved against the connector registry and fetched
+    concurrently under its scheduler; each keeps its default limit.
     """
-    aggregator = []
-    
-    # Map sources to connector instances
-    connector_map = {
-        "yc": YCombinatorConnector(),
-        "ph": ProductHuntConnector(),
-        "devpost": DevpostConnector(),
-        "reddit": RedditDorkGenerator(),
-        "thub": THubConnector()
-    }
-    
-    # Filter to only requested sources
-    active_sources = [s for s in sources if s in connector_map]
-    
+    active_sources = [connector.name for connector in connector_registry.resolve(sources)]
     if not active_sources:
         print("[Market Intel] No valid sources specified")
         return json.dumps([], indent=2)
-    
-    print(f"[Market Intel] Executing parallel scrape for: {', '.join(active_sources)}")
-    
-    # Execute all sources in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=len(active_sources), thread_name_prefix="MarketIntel") as executor:
-        futures = {
-            executor.submit(connector_map[source].fetch_signals, query): source 
-            for source in active_sources
-        }
-        
-        for future in as_completed(futures):
-            source = futures[future]
-            try:
-                results = future.result(timeout=130)  # 2+ min timeout per thread
-                aggregator.extend(results)
-                print(f"[Market Intel] {source.upper()}: Retrieved {len(results)} results")
-            except Exception as e:
-                print(f"[Market Intel] {source.upper()} failed: {str(e)}")
-    
+
+    aggregator = asyncio.run(asearch_all(query, limit=None, fresh=fresh, sources=active_sources))
     print(f"[Market Intel] Total aggregated results: {len(aggregator)}")
     return json.dumps(aggregator, indent=2)
 
-def search_all(query: str, limit: int = 5, types: Optional[List[str]] = None) -> List[Dict]:
+def _search_connectors(limit: Optional[int], sources: Optional[List[str]] = None) -> List[tuple]:
+    """(metric label, connector, limit) for each requested source, every registered one by default"""
+    return [
+        (connector.name, connector, min(limit, connector.max_limit) if limit and connector.max_limit else limit)
+        for connector in connector_registry.resolve(sources)
+    ]
+
+def _in_source_order(by_source: Dict[str, List]) -> List[Dict]:
+    # Stable order regardless of arrival, so identical searches build identical LLM prompts
+    order = [connector.name for connector in connector_registry.resolve()]
+    return [item for name in order for item in by_source.get(name, [])]
+
+def merge_source_results(by_source: Dict[str, List]) -> List[Dict]:
+    """Per-source results as one list in source order, the same startup from several sources merged"""
+    return entity_resolver.resolve(_in_source_order(by_source))
+
+def _report_source(source_name: str, results: Optional[List], error: Optional[str], types: Optional[List[str]]) -> List:
+    """Logs and emits the outcome of one source; returns its type-filtered results"""
+    if error is not None:
+        print(f"[Search All] {source_name} error: {error}")
+        emit_progress({"event": "source_failed", "source": source_name, "error": error})
+        return []
+    print(f"[Search All] {source_name}: {len(results)} results")
+    emit_progress({
+        "event": "source_done",
+        "source": source_name,
+        "count": len(results),
+        # Lets the progress stream show partial results before synthesis
+        "preview": [item.get("name") or item.get("dork") for item in results[:5]]
+    })
+    if types:
+        results = [item for item in results if item.get("type") in types]
+    return results
+
+def search_all(
+    query: str,
+    limit: int = 5,
+    types: Optional[List[str]] = None,
+    fresh: bool = False,
+    sources: Optional[List[str]] = None
+) -> List[Dict]:
+    """Blocking entry point for scripts: runs asearch_all on a fresh event loop"""
+    return asyncio.run(asearch_all(query, limit, types, fresh, sources=sources))
+
+# Sources left running after a streaming search stopped early
+_straggler_tasks = set()
+
+async def _afetch_source(name: str, connector, query: str, limit: Optional[int], fresh: bool):
+    """Returns (results, error) for one source; live fetches are bounded by the source's timeout"""
+    try:
+        return await acached_fetch(name, connector, query, limit, fresh), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+async def astream_search_all(
+    query: str,
+    limit: int = 5,
+    types: Optional[List[str]] = None,
+    fresh: bool = False,
+    first_k: Optional[int] = None,
+    deadline: Optional[float] = None,
+    sources: Optional[List[str]] = None
+) -> AsyncIterator[Tuple[str, List[Dict]]]:
     """
-    Unified search function with multi-threaded parallel execution.
-    Optimized for CPU utilization across all source connectors.
+    Runs the requested `sources` (all registered connectors by default)
+    concurrently on the event loop and yields (source, results) as each
+    completes, so downstream work can start on partial results. Stops
+    after `first_k` sources have reported or `deadline` seconds, whichever
+    comes first (by default it waits for every source). Sources still
+    running then keep going in the background (bounded by SOURCE_TIMEOUT)
+    to fill the scrape cache.
+    """
+    connectors = _search_connectors(limit, sources)
+    print(f"[Search All] Initiating async search across {len(connectors)} sources")
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline is not None else None
+    tasks = {
+        asyncio.create_task(_afetch_source(name, connector, query, conn_limit, fresh)): name
+        for name, connector, conn_limit in connectors
+    }
+    pending = set(tasks)
+    reported = 0
+    try:
+        while pending and (first_k is None or reported < first_k):
+            timeout = max(0.0, stop_at - loop.time()) if stop_at is not None else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"[Search All] Deadline of {deadline}s reached after {reported} sources")
+                break
+            for task in done:
+                source_name = tasks[task]
+                results, error = task.result()
+                reported += 1
+                yield source_name, _report_source(source_name, results, error, types)
+    finally:
+        for task in pending:
+            _straggler_tasks.add(task)
+            task.add_done_callback(_straggler_tasks.discard)
+
+async def asearch_all(
+    query: str,
+    limit: int = 5,
+    types: Optional[List[str]] = None,
+    fresh: bool = False,
+    first_k: Optional[int] = None,
+    deadline: Optional[float] = None,
+    sources: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Unified search used by the analysis pipeline: the results of
+    astream_search_all, collected in source order with the same startup
+    from several sources merged into one record. Cached results are used
+    unless `fresh` is set; `first_k` / `deadline` bound the wait.
     """
-    aggregator = []
-    
-    # Define all connectors
-    connectors = [
-        ("YC", YCombinatorConnector(), min(limit, YC_SCRAPE_LIMIT)),
-        ("Product Hunt", ProductHuntConnector(), limit),
-        ("Devpost", DevpostConnector(), limit),
-        ("Reddit", RedditDorkGenerator(), limit),
-        ("T-Hub", THubConnector(), min(limit, THUB_SCRAPE_LIMIT))
-    ]
-    
-    print(f"[Search All] Initiating parallel search across {len(connectors)} sources")
     start_time = time.time()
-    
-    # Execute all connectors in parallel thread pool
-    with ThreadPoolExecutor(max_workers=len(connectors), thread_name_prefix="SearchAll") as executor:
-        futures = {
-            executor.submit(connector.fetch_signals, query, conn_limit): name 
-            for name, connector, conn_limit in connectors
-        }
-        
-        for future in as_completed(futures):
-            source_name = futures[future]
-            try:
-                results = future.result(timeout=130)
-                aggregator.extend(results)
-                print(f"[Search All] {source_name}: {len(results)} results")
-            except Exception as e:
-                print(f"[Search All] {source_name} error: {str(e)}")
+    stream = astream_search_all(query, limit, types, fresh, first_k, deadline, sources)
+    by_source = {source: results async for source, results in stream}
+    aggregator = merge_source_results(by_source)
     
     elapsed = time.time() - start_time
     print(f"[Search All] Completed in {elapsed:.2f}s | Total: {len(aggregator)} results")
-    
-    # Filter by types if provided
-    if types:
-        aggregator = [item for item in aggregator if item.get("type") in types]
-        print(f"[Search All] After type filter: {len(aggregator)} results")
-    
     return aggregator
 
+# Keeps the local YC / T-Hub index current; started with the server
+def _scheduled_crawl(connector) -> Callable[[int], Awaitable[Tuple[List[Dict], bool]]]:
+    """The connector's directory harvest, waiting for a scheduler slot like its live fetches"""
+    async def harvest(limit: int) -> Tuple[List[Dict], bool]:
+        # Crawls count against the same concurrency cap, rate limit and cost
+        # budget as live searches instead of hitting the site on top of them
+        async with connector_registry.slot(connector):
+            return await connector.crawl(limit)
+    return harvest
+
+directory_crawler = DirectoryCrawler(
+    directory_index,
+    harvesters={
+        "YC": _scheduled_crawl(connector_registry.get("YC")),
+        "T-Hub": _scheduled_crawl(connector_registry.get("T-Hub")),
+    },
+    crawl_interval=settings.DIRECTORY_CRAWL_INTERVAL,
+    crawl_limit=settings.DIRECTORY_CRAWL_LIMIT,
+)
+
 # --- Tool Definition ---
 tools = [
     {
@@ -435,7 +1071,7 @@ tools = [
                     "sources": {
                         "type": "array",
                         "items": {"type": "string"},
-                        "description": "Specific data silos to mine."
+                        "description": "Specific data silos to mine (yc, ph, devpost, reddit, thub)."
                     }
                 },
                 "required": ["query"]
@@ -0,0 +1,257 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import settings
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "analyses.db")
+
+# Run the retention policy every N writes instead of on every insert
+EVICT_EVERY_N_WRITES = 50
+
+
+def _encode_cursor(timestamp: str, analysis_id: str) -> str:
+    raw = f"{timestamp}|{analysis_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, analysis_id = raw.split("|", 1)
+        return timestamp, analysis_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _serialize_result(result: Any) -> Any:
+    """Turns pydantic results (SynthOutput) into plain JSON-able data"""
+    if hasattr(result, "model_dump"):
+        return result.model_dump()
+    return result
+
+
+class AnalysisStore(ABC):
+    """
+    Storage backend for finished analyses.
+
+    History is returned newest first, one page at a time, using an opaque
+    keyset cursor so the cost of a page never depends on the table size.
+    """
+
+    @abstractmethod
+    def save(self, analysis_id: str, query: str, result: Any, timestamp: str):
+        pass
+
+    @abstractmethod
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def list_history(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        query_contains: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """Returns (items, next_cursor); next_cursor is None on the last page"""
+        pass
+
+    @abstractmethod
+    def evict(self) -> int:
+        """Applies the retention policy, returning the number of rows removed"""
+        pass
+
+
+class MemoryAnalysisStore(AnalysisStore):
+    """Process-local backend, useful for development and tests"""
+
+    def __init__(self, max_rows: int = 0, retention_days: int = 0):
+        self.max_rows = max_rows
+        self.retention_days = retention_days
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, analysis_id: str, query: str, result: Any, timestamp: str):
+        with self._lock:
+            self._rows[analysis_id] = {
+                "analysis_id": analysis_id,
+                "query": query,
+                "result": _serialize_result(result),
+                "timestamp": timestamp
+            }
+        self.evict()
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(analysis_id)
+
+    def list_history(self, limit=20, cursor=None, query_contains=None, since=None, until=None):
+        with self._lock:
+            rows = sorted(self._rows.values(), key=lambda r: (r["timestamp"], r["analysis_id"]), reverse=True)
+        if cursor:
+            key = _decode_cursor(cursor)
+            rows = [r for r in rows if (r["timestamp"], r["analysis_id"]) < key]
+        if query_contains:
+            needle = query_contains.lower()
+            rows = [r for r in rows if needle in r["query"].lower()]
+        if since:
+            rows = [r for r in rows if r["timestamp"] >= since]
+        if until:
+            rows = [r for r in rows if r["timestamp"] < until]
+
+        page = rows[:limit + 1]
+        items = [{"analysis_id": r["analysis_id"], "query": r["query"], "timestamp": r["timestamp"]} for r in page[:limit]]
+        next_cursor = _encode_cursor(items[-1]["timestamp"], items[-1]["analysis_id"]) if len(page) > limit else None
+        return items, next_cursor
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            if self.retention_days > 0:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+                for analysis_id in [k for k, r in self._rows.items() if r["timestamp"] < cutoff]:
+                    del self._rows[analysis_id]
+                    removed += 1
+            if self.max_rows > 0 and len(self._rows) > self.max_rows:
+                oldest = sorted(self._rows.values(), key=lambda r: (r["timestamp"], r["analysis_id"]))
+                for r in oldest[:len(self._rows) - self.max_rows]:
+                    del self._rows[r["analysis_id"]]
+                    removed += 1
+        return removed
+
+
+class SQLiteAnalysisStore(AnalysisStore):
+    """
+    Default backend. Results are stored as zlib-compressed JSON blobs and
+    history pages are served from the (timestamp, analysis_id) index.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_rows: int = 0, retention_days: int = 0):
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                analysis_id TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                result BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_timestamp
+                ON analyses (timestamp DESC, analysis_id DESC);
+        """)
+        self._conn.commit()
+        self.evict()
+
+    def save(self, analysis_id: str, query: str, result: Any, timestamp: str):
+        blob = zlib.compress(json.dumps(_serialize_result(result)).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (analysis_id, query, timestamp, result) VALUES (?, ?, ?, ?)",
+                (analysis_id, query, timestamp, blob)
+            )
+            self._conn.commit()
+            self._writes += 1
+            run_eviction = self._writes % EVICT_EVERY_N_WRITES == 0
+        if run_eviction:
+            self.evict()
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis_id, query, timestamp, result FROM analyses WHERE analysis_id = ?",
+                (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "analysis_id": row[0],
+            "query": row[1],
+            "timestamp": row[2],
+            "result": json.loads(zlib.decompress(row[3]).decode("utf-8"))
+        }
+
+    def list_history(self, limit=20, cursor=None, query_contains=None, since=None, until=None):
+        clauses = []
+        params: List[Any] = []
+        if cursor:
+            timestamp, analysis_id = _decode_cursor(cursor)
+            clauses.append("(timestamp, analysis_id) < (?, ?)")
+            params.extend([timestamp, analysis_id])
+        if query_contains:
+            clauses.append("query LIKE ? ESCAPE '\\'")
+            escaped = query_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT analysis_id, query, timestamp FROM analyses {where} "
+            "ORDER BY timestamp DESC, analysis_id DESC LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        items = [{"analysis_id": r[0], "query": r[1], "timestamp": r[2]} for r in rows[:limit]]
+        next_cursor = _encode_cursor(items[-1]["timestamp"], items[-1]["analysis_id"]) if len(rows) > limit else None
+        return items, next_cursor
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            if self.retention_days > 0:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+                removed += self._conn.execute("DELETE FROM analyses WHERE timestamp < ?", (cutoff,)).rowcount
+            if self.max_rows > 0:
+                removed += self._conn.execute(
+                    """DELETE FROM analyses WHERE analysis_id IN (
+                           SELECT analysis_id FROM analyses
+                           ORDER BY timestamp DESC, analysis_id DESC
+                           LIMIT -1 OFFSET ?
+                       )""",
+                    (self.max_rows,)
+                ).rowcount
+            self._conn.commit()
+        if removed:
+            print(f"[Analysis Store] Evicted {removed} analyses")
+        return removed
+
+
+def create_analysis_store() -> AnalysisStore:
+    """Builds the backend selected by ANALYSIS_STORE_BACKEND"""
+    backend = settings.ANALYSIS_STORE_BACKEND.lower()
+    if backend == "memory":
+        return MemoryAnalysisStore(
+            max_rows=settings.ANALYSIS_MAX_ROWS,
+            retention_days=settings.ANALYSIS_RETENTION_DAYS
+        )
+    if backend == "sqlite":
+        return SQLiteAnalysisStore(
+            db_path=settings.ANALYSIS_DB_PATH or DEFAULT_DB_PATH,
+            max_rows=settings.ANALYSIS_MAX_ROWS,
+            retention_days=settings.ANALYSIS_RETENTION_DAYS
+        )
+    raise ValueError(f"Unknown analysis store backend: {settings.ANALYSIS_STORE_BACKEND}")
@@ -0,0 +1,173 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from app.config.settings import settings
+from app.utils.metrics import CONNECTOR_CIRCUIT_STATE
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Latency samples needed before timeouts adapt
+MIN_SAMPLES = 5
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open"""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"circuit open, retrying in {retry_in:.0f}s")
+        self.source = source
+        self.retry_in = retry_in
+
+
+def _percentile(values, pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class _SourceHealth:
+    def __init__(self, window: int):
+        self.outcomes = deque(maxlen=window)  # (ok, latency_seconds, timed_out, empty)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.skipped = 0
+
+
+class ConnectorHealth:
+    """
+    Per-source health tracking for the connectors.
+
+    Keeps a rolling window of call outcomes (success rate, p50/p95
+    latency) and runs a circuit breaker per source: after
+    `failure_threshold` consecutive failures the source is skipped for
+    `cooldown` seconds, then a single probe call decides whether it
+    closes again. Only a call that raises or times out counts as a failure;
+    one that returns nothing is a success, tracked as an empty result, since
+    a niche query can legitimately have no matches. Timeouts follow the
+    observed p95 latency instead of fixed constants; timed-out calls count
+    at their timeout, so the limit grows back after a run of timeouts.
+    """
+
+    def __init__(
+        self,
+        window: int = 50,
+        failure_threshold: int = 5,
+        cooldown: float = 300,
+        timeout_multiplier: float = 2.0,
+        min_timeout: float = 10,
+    ):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self._sources: Dict[str, _SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, source: str) -> bool:
+        """Whether `source` may be called now; refused calls are counted as skips"""
+        with self._lock:
+            health = self._get(source)
+            if health.state == CLOSED:
+                return True
+            if health.state == OPEN and time.monotonic() - health.opened_at >= self.cooldown:
+                self._set_state(source, health, HALF_OPEN)
+            if health.state == HALF_OPEN and not health.probe_in_flight:
+                health.probe_in_flight = True
+                return True
+            health.skipped += 1
+            return False
+
+    def check(self, source: str):
+        """Raises CircuitOpenError when `source` should be skipped"""
+        if not self.allow(source):
+            with self._lock:
+                health = self._get(source)
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - health.opened_at))
+            raise CircuitOpenError(source, retry_in)
+
+    def record(self, source: str, ok: bool, latency: float, timed_out: bool = False, empty: bool = False):
+        with self._lock:
+            health = self._get(source)
+            health.outcomes.append((ok, latency, timed_out, empty))
+            health.probe_in_flight = False
+            if ok:
+                health.consecutive_failures = 0
+                if health.state != CLOSED:
+                    self._set_state(source, health, CLOSED)
+                return
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                health.opened_at = time.monotonic()
+                self._set_state(source, health, OPEN)
+
+    def abandon(self, source: str):
+        """Forgets an in-flight call that was cancelled before it had an outcome"""
+        with self._lock:
+            self._get(source).probe_in_flight = False
+
+    def timeout_for(self, source: str, default: float) -> float:
+        """`timeout_multiplier` x p95 latency, within [min_timeout, default]"""
+        with self._lock:
+            latencies = self._latencies(self._get(source).outcomes)
+        if len(latencies) < MIN_SAMPLES:
+            return default
+        return min(default, max(self.min_timeout, _percentile(latencies, 95) * self.timeout_multiplier))
+
+    def snapshot(self, default_timeout: Optional[float] = None) -> Dict[str, Any]:
+        with self._lock:
+            sources = list(self._sources.items())
+        report = {}
+        for source, health in sources:
+            outcomes = list(health.outcomes)
+            latencies = self._latencies(outcomes)
+            report[source] = {
+                "state": health.state,
+                "calls": len(outcomes),
+                "success_rate": sum(ok for ok, _, _, _ in outcomes) / len(outcomes) if outcomes else None,
+                "empty_rate": sum(empty for _, _, _, empty in outcomes) / len(outcomes) if outcomes else None,
+                "p50_s": _percentile(latencies, 50),
+                "p95_s": _percentile(latencies, 95),
+                "consecutive_failures": health.consecutive_failures,
+                "skipped": health.skipped,
+            }
+            if default_timeout is not None:
+                report[source]["timeout_s"] = self.timeout_for(source, default_timeout)
+        return report
+
+    @staticmethod
+    def _latencies(outcomes) -> list:
+        # Fast failures (errors) say nothing about how long the source needs
+        return [latency for ok, latency, timed_out, _ in outcomes if ok or timed_out]
+
+    def _get(self, source: str) -> _SourceHealth:
+        health = self._sources.get(source)
+        if health is None:
+            health = _SourceHealth(self.window)
+            self._sources[source] = health
+            CONNECTOR_CIRCUIT_STATE.labels(source).set(CIRCUIT_STATE_VALUES[CLOSED])
+        return health
+
+    def _set_state(self, source: str, health: _SourceHealth, state: str):
+        if health.state != state:
+            print(f"[Connector Health] {source}: circuit {health.state} -> {state}")
+        health.state = state
+        CONNECTOR_CIRCUIT_STATE.labels(source).set(CIRCUIT_STATE_VALUES[state])
+
+
+connector_health = ConnectorHealth(
+    window=settings.CONNECTOR_HEALTH_WINDOW,
+    failure_threshold=settings.CONNECTOR_FAILURE_THRESHOLD,
+    cooldown=settings.CONNECTOR_COOLDOWN,
+    timeout_multiplier=settings.CONNECTOR_TIMEOUT_MULTIPLIER,
+    min_timeout=settings.CONNECTOR_MIN_TIMEOUT,
+)
@@ -0,0 +1,303 @@
+import copy
+import email.utils
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import httpx
+from app.config.settings import settings
+from app.utils.metrics import HTTP_CACHE_REQUESTS
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "http_cache.db")
+
+# Purge entries past their retention every N writes
+PURGE_EVERY_N_WRITES = 100
+
+# Request headers that change the response and so are part of the key
+VARY_HEADERS = ("authorization", "accept", "accept-language")
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _freshness(headers: httpx.Headers, now: float, heuristic_ttl: int) -> Optional[float]:
+    """Seconds the response stays fresh, or None when it must not be stored"""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        return float(max_age.group(1))
+    date = _http_date(headers.get("date")) or now
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        return max(0.0, expires - date)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        # RFC 9111 heuristic: a tenth of the time since the last change
+        return min(heuristic_ttl, max(0.0, (date - last_modified) / 10))
+    return float(heuristic_ttl)
+
+
+def _has_errors(response: httpx.Response) -> bool:
+    """Whether a JSON body reports errors, as GraphQL does alongside a 200"""
+    if "json" not in response.headers.get("content-type", ""):
+        return False
+    try:
+        payload = json.loads(response.content)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and bool(payload.get("errors"))
+
+
+class CachedResponse:
+    """The parts of an httpx response the connectors read, served from the network or the cache"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, encoding: Optional[str], cache_status: str):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        # "fresh_hit", "revalidated", "miss" or "uncacheable"
+        self.cache_status = cache_status
+        self.body_hash = hashlib.sha256(content).hexdigest()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache under the HTTP connectors (Product Hunt, Devpost).
+
+    Responses are stored as zlib-compressed bodies in SQLite, with an
+    in-memory LRU in front. Within its freshness lifetime (Cache-Control
+    max-age, Expires, or a heuristic window when the server sends neither)
+    a response is served without a request; after that it is revalidated
+    with If-None-Match / If-Modified-Since, and a 304 only refreshes its
+    lifetime. parsed() memoizes what a connector extracts from a body by
+    its hash, so fresh hits and 304s skip parsing too. A `fresh` request
+    (or one sent with Cache-Control: no-cache) is always revalidated. A
+    JSON body carrying "errors" (GraphQL reports failures with a 200) is
+    never stored.
+
+    Callers route only idempotent requests through it, such as GraphQL
+    queries sent as POST.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DEFAULT_DB_PATH,
+        max_memory_entries: int = 256,
+        heuristic_ttl: int = 300,
+        retention: int = 604800,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_memory_entries = max_memory_entries
+        self.heuristic_ttl = heuristic_ttl
+        self.retention = retention
+        self.stats = {
+            "fresh_hits": 0, "revalidated": 0, "misses": 0, "uncacheable": 0,
+            "bytes_saved": 0, "parse_hits": 0, "parse_misses": 0,
+        }
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._parsed: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+
+        if enabled and db_path:
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fresh_until REAL NOT NULL,
+                    stored_at REAL NOT NULL,
+                    body BLOB NOT NULL
+                )
+            """)
+            self._conn.commit()
+            self.purge_expired()
+
+    @staticmethod
+    def make_key(method: str, url: str, headers: Dict[str, str], body: bytes) -> str:
+        vary = sorted((k.lower(), v) for k, v in headers.items() if k.lower() in VARY_HEADERS)
+        payload = json.dumps([method.upper(), url, vary, hashlib.sha256(body).hexdigest()])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def request(
+        self, client: httpx.AsyncClient, method: str, url: str, fresh: bool = False, **kwargs
+    ) -> CachedResponse:
+        """client.request(method, url, **kwargs) through the cache; `fresh` skips fresh hits"""
+        request = client.build_request(method, url, **kwargs)
+        if not self.enabled:
+            response = await client.send(request)
+            return CachedResponse(str(request.url), response.status_code, response.content, response.encoding, "uncacheable")
+
+        key = self.make_key(method, str(request.url), dict(request.headers), request.content)
+        entry = self._get(key)
+        now = time.time()
+        fresh = fresh or "no-cache" in request.headers.get("cache-control", "").lower()
+        if entry is not None and entry["fresh_until"] > now and not fresh:
+            return self._serve(entry, "fresh_hit")
+
+        if entry is not None:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+        response = await client.send(request)
+
+        if response.status_code == 304 and entry is not None:
+            lifetime = _freshness(response.headers, now, self.heuristic_ttl)
+            entry["fresh_until"] = now + (lifetime or 0.0)
+            entry["stored_at"] = now
+            entry["etag"] = response.headers.get("etag") or entry["etag"]
+            entry["last_modified"] = response.headers.get("last-modified") or entry["last_modified"]
+            self._put(key, entry)
+            return self._serve(entry, "revalidated")
+
+        lifetime = _freshness(response.headers, now, self.heuristic_ttl)
+        if response.status_code != 200 or lifetime is None or _has_errors(response):
+            self._count("uncacheable")
+            return CachedResponse(str(request.url), response.status_code, response.content, response.encoding, "uncacheable")
+
+        entry = {
+            "url": str(request.url),
+            "status": response.status_code,
+            "encoding": response.encoding,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fresh_until": now + lifetime,
+            "stored_at": now,
+            "body": zlib.compress(response.content),
+        }
+        self._put(key, entry)
+        self._count("misses")
+        return CachedResponse(entry["url"], response.status_code, response.content, response.encoding, "miss")
+
+    def parsed(self, response: CachedResponse, kind: str, parse: Callable[[str], Any]) -> Any:
+        """parse(response.text), memoized per (kind, url, body hash); returns a copy"""
+        key = (kind, response.url, response.body_hash)
+        with self._lock:
+            if key in self._parsed:
+                self._parsed.move_to_end(key)
+                self.stats["parse_hits"] += 1
+                return copy.deepcopy(self._parsed[key])
+        value = parse(response.text)
+        with self._lock:
+            self.stats["parse_misses"] += 1
+            if response.status_code == 200:
+                self._parsed[key] = value
+                while len(self._parsed) > self.max_memory_entries:
+                    self._parsed.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def purge_expired(self) -> int:
+        """Drops entries stored longer than `retention` ago; stale ones are kept for revalidation"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM http_cache WHERE stored_at <= ?", (time.time() - self.retention,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def snapshot(self) -> Dict[str, Any]:
+        served = self.stats["fresh_hits"] + self.stats["revalidated"]
+        requests = served + self.stats["misses"] + self.stats["uncacheable"]
+        return {
+            **self.stats,
+            "hit_rate": served / requests if requests else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _serve(self, entry: Dict, cache_status: str) -> CachedResponse:
+        content = zlib.decompress(entry["body"])
+        with self._lock:
+            # Neither a fresh hit nor a 304 downloads the body
+            self.stats["bytes_saved"] += len(content)
+        self._count("fresh_hits" if cache_status == "fresh_hit" else "revalidated")
+        return CachedResponse(entry["url"], entry["status"], content, entry["encoding"], cache_status)
+
+    def _count(self, result: str):
+        with self._lock:
+            self.stats[result] += 1
+        HTTP_CACHE_REQUESTS.labels(result).inc()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT * FROM http_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = {name: row[name] for name in row.keys() if name != "key"}
+                    self._remember(key, entry)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return dict(entry)
+        return None
+
+    def _put(self, key: str, entry: Dict):
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO http_cache
+                        (key, url, status, encoding, etag, last_modified, fresh_until, stored_at, body)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (key, entry["url"], entry["status"], entry["encoding"], entry["etag"],
+                      entry["last_modified"], entry["fresh_until"], entry["stored_at"], entry["body"]))
+                self._conn.commit()
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY_N_WRITES == 0
+            else:
+                purge = False
+        if purge:
+            self.purge_expired()
+
+    def _remember(self, key: str, entry: Dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+http_cache = HttpCache(
+    db_path=settings.HTTP_CACHE_DB_PATH or DEFAULT_DB_PATH,
+    max_memory_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+    heuristic_ttl=settings.HTTP_CACHE_HEURISTIC_TTL,
+    retention=settings.HTTP_CACHE_RETENTION,
+    enabled=settings.HTTP_CACHE_ENABLED,
+)
@@ -0,0 +1,308 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pydantic import BaseModel
+from app.utils.progress_events import ProgressBroker
+from app.utils.metrics import ANALYSES
+
+# Finished job records kept for /status; older ones fall back to the store
+MAX_FINISHED_JOBS = 1000
+
+# Assumed run time before any analysis has finished, for Retry-After hints
+DEFAULT_RUN_SECONDS = 60.0
+
+
+class AdmissionError(Exception):
+    """
+    Raised by submit() when a job cannot be admitted. `status_code` is 429
+    for per-client limits and 503 when the shared wait queue is full.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def analysis_key(query: str, **options) -> str:
+    """
+    Coalescing key for an analysis: the query with case, surrounding
+    whitespace and trailing punctuation normalized, plus any run options.
+    """
+    normalized = re.sub(r"\s+", " ", query).strip().rstrip(".?!").strip().lower()
+    payload = json.dumps({"query": normalized, **options}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisJob(BaseModel):
+    """Lifecycle record of a queued analysis"""
+    analysis_id: str
+    query: str
+    status: str = "queued"  # queued | running | done | failed
+    queued_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    stages: Dict[str, Dict[str, str]] = {}
+    error: Optional[str] = None
+    coalesced_with: Optional[str] = None
+    client_id: Optional[str] = None
+    fresh: bool = False
+
+
+class AnalysisJobQueue:
+    """
+    Bounded worker pool for analysis runs.
+
+    POST /analyze only enqueues a job; `num_workers` background tasks drain
+    the queue, run the pipeline through `runner` and hand the result to
+    `on_complete`, which runs in a worker thread so it may block (e.g. on a
+    database write). Job records stay available for the /status endpoint and,
+    when a broker is given, progress events are published for streaming.
+
+    Jobs whose `analysis_key` matches a queued or running job are not
+    enqueued again: they attach to that job, mirror its progress and
+    receive the same result.
+
+    Admission control: at most `num_workers` analyses run at once, at most
+    `max_queue_size` wait for a worker and each client may have at most
+    `max_per_client` analyses queued or running. 0 disables a limit.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable[Any]],
+        on_complete: Callable[[AnalysisJob, Any], None],
+        num_workers: int = 2,
+        events: Optional[ProgressBroker] = None,
+        coalesce: bool = True,
+        max_queue_size: int = 0,
+        max_per_client: int = 0,
+    ):
+        self.runner = runner
+        self.on_complete = on_complete
+        self.num_workers = max(1, num_workers)
+        self.events = events
+        self.coalesce = coalesce
+        self.max_queue_size = max_queue_size
+        self.max_per_client = max_per_client
+        self.jobs: Dict[str, AnalysisJob] = {}
+        self.stats = {
+            "submitted": 0,
+            "runs": 0,
+            "coalesced": 0,
+            "rejected_queue_full": 0,
+            "rejected_client_limit": 0,
+            "queue_wait_total_s": 0.0,
+            "queue_wait_max_s": 0.0,
+        }
+        self._active_by_client: Dict[str, int] = {}
+        self._avg_run_seconds = DEFAULT_RUN_SECONDS
+        self._inflight: Dict[str, str] = {}
+        self._followers: Dict[str, List[AnalysisJob]] = {}
+        self._queue: asyncio.Queue | None = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Spawns the worker tasks. Must be called from the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        if self.events is not None:
+            self.events.bind_loop(asyncio.get_running_loop())
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"analysis-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        print(f"[Job Queue] Started {self.num_workers} analysis workers")
+
+    async def stop(self):
+        """Cancels the workers; queued jobs that never started are dropped."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, analysis_id: str, query: str, client_id: Optional[str] = None, fresh: bool = False) -> AnalysisJob:
+        """
+        Registers a job and puts it on the queue without waiting for it.
+        Raises AdmissionError when a concurrency or queue limit is hit.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue has not been started")
+        job = AnalysisJob(
+            analysis_id=analysis_id,
+            query=query,
+            queued_at=datetime.now().isoformat(),
+            client_id=client_id,
+            fresh=fresh
+        )
+
+        key = analysis_key(query, fresh=fresh)
+        leader_id = self._inflight.get(key) if self.coalesce else None
+        leader = self.jobs.get(leader_id) if leader_id else None
+        if leader is not None:
+            # Followers add no work, so they bypass admission limits
+            self.jobs[analysis_id] = job
+            self.stats["submitted"] += 1
+            self._attach(job, leader)
+            return job
+
+        self._admit(client_id)
+        self.jobs[analysis_id] = job
+        self.stats["submitted"] += 1
+        if client_id:
+            self._active_by_client[client_id] = self._active_by_client.get(client_id, 0) + 1
+
+        if self.events is not None:
+            self.events.open(analysis_id)
+            self._publish(job, {"event": "status", "status": job.status})
+        if self.coalesce:
+            self._inflight[key] = analysis_id
+        self._queue.put_nowait(analysis_id)
+        return job
+
+    def get(self, analysis_id: str) -> Optional[AnalysisJob]:
+        return self.jobs.get(analysis_id)
+
+    def depth(self) -> int:
+        """Number of jobs waiting for a free worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus current queue state, for monitoring endpoints"""
+        runs = self.stats["runs"]
+        return {
+            **self.stats,
+            "queue_wait_avg_s": self.stats["queue_wait_total_s"] / runs if runs else 0.0,
+            "queue_depth": self.depth(),
+            "max_queue_size": self.max_queue_size,
+            "workers": self.num_workers,
+            "avg_run_s": self._avg_run_seconds,
+        }
+
+    def retry_after(self) -> int:
+        """Rough seconds until a worker frees up for a newly queued job"""
+        waves = self.depth() // self.num_workers + 1
+        return max(1, int(self._avg_run_seconds * waves))
+
+    def _admit(self, client_id: Optional[str]):
+        if client_id and self.max_per_client > 0:
+            if self._active_by_client.get(client_id, 0) >= self.max_per_client:
+                self.stats["rejected_client_limit"] += 1
+                raise AdmissionError(
+                    f"Too many analyses in progress for this client (limit {self.max_per_client})",
+                    status_code=429,
+                    retry_after=self.retry_after()
+                )
+        if self.max_queue_size > 0 and self.depth() >= self.max_queue_size:
+            self.stats["rejected_queue_full"] += 1
+            raise AdmissionError(
+                "Analysis queue is full, please retry later",
+                status_code=503,
+                retry_after=self.retry_after()
+            )
+
+    def _release(self, job: AnalysisJob):
+        if not job.client_id:
+            return
+        remaining = self._active_by_client.get(job.client_id, 0) - 1
+        if remaining > 0:
+            self._active_by_client[job.client_id] = remaining
+        else:
+            self._active_by_client.pop(job.client_id, None)
+
+    def _attach(self, job: AnalysisJob, leader: AnalysisJob):
+        """Makes `job` a follower of an identical in-flight `leader`"""
+        job.coalesced_with = leader.analysis_id
+        job.status = leader.status
+        job.started_at = leader.started_at
+        job.stages = {stage: dict(times) for stage, times in leader.stages.items()}
+        self._followers.setdefault(leader.analysis_id, []).append(job)
+        self.stats["coalesced"] += 1
+        if self.events is not None:
+            self.events.open(job.analysis_id, replay_from=leader.analysis_id)
+        print(f"[Job Queue] Analysis {job.analysis_id} coalesced with {leader.analysis_id}")
+
+    async def _worker(self, index: int):
+        while True:
+            analysis_id = await self._queue.get()
+            job = self.jobs.get(analysis_id)
+            try:
+                if job is not None:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _publish(self, job: AnalysisJob, event: dict):
+        if self.events is not None:
+            self.events.publish(job.analysis_id, event)
+
+    def _group(self, job: AnalysisJob) -> List[AnalysisJob]:
+        # Copy, since followers may attach while a broadcast is in progress
+        return [job] + list(self._followers.get(job.analysis_id, []))
+
+    def _set_status(self, job: AnalysisJob, status: str, error: Optional[str] = None):
+        now = datetime.now().isoformat()
+        for member in self._group(job):
+            member.status = status
+            member.error = error
+            if status == "running":
+                member.started_at = now
+            elif status in ("done", "failed"):
+                member.finished_at = now
+            self._publish(member, {"event": "status", "status": status, "error": error})
+        if status in ("done", "failed"):
+            ANALYSES.labels(status).inc()
+
+    async def _run(self, job: AnalysisJob):
+        self.stats["runs"] += 1
+        self._set_status(job, "running")
+        waited = (datetime.fromisoformat(job.started_at) - datetime.fromisoformat(job.queued_at)).total_seconds()
+        self.stats["queue_wait_total_s"] += waited
+        self.stats["queue_wait_max_s"] = max(self.stats["queue_wait_max_s"], waited)
+        run_started = time.monotonic()
+
+        def on_stage(stage: str, event: str):
+            now = datetime.now().isoformat()
+            for member in self._group(job):
+                member.stages.setdefault(stage, {})[f"{event}_at"] = now
+
+        def on_event(event: dict):
+            for member in self._group(job):
+                self._publish(member, event)
+
+        try:
+            try:
+                result = await self.runner(job.query, on_stage=on_stage, on_event=on_event, fresh=job.fresh)
+            finally:
+                # Later duplicates start a fresh run instead of attaching
+                self._inflight.pop(analysis_key(job.query, fresh=job.fresh), None)
+            for member in self._group(job):
+                await asyncio.to_thread(self.on_complete, member, result)
+            self._set_status(job, "done")
+        except asyncio.CancelledError:
+            self._set_status(job, "failed", "Cancelled")
+            raise
+        except Exception as e:
+            print(f"[Job Queue] Analysis {job.analysis_id} failed: {str(e)}")
+            traceback.print_exc()
+            self._set_status(job, "failed", str(e))
+        finally:
+            if self.events is not None:
+                for member in self._group(job):
+                    self.events.close(member.analysis_id)
+            self._followers.pop(job.analysis_id, None)
+            self._release(job)
+            # Smoothed run time drives the Retry-After estimate
+            self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * (time.monotonic() - run_started)
+            self._prune_finished()
+
+    def _prune_finished(self):
+        finished = [k for k, j in self.jobs.items() if j.status in ("done", "failed")]
+        for analysis_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[analysis_id]
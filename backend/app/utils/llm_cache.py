@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.config.settings import settings
+from app.utils.metrics import LLM_CACHE_REQUESTS
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "llm_cache.db")
+
+# Purge expired disk entries every N writes
+PURGE_EVERY_N_WRITES = 100
+
+
+class LLMCache:
+    """
+    Content-addressed cache for LLM responses.
+
+    Keys hash every request parameter (model, messages, tools, temperature,
+    ...), so only byte-identical requests share an entry. Lookups go to an
+    in-memory LRU first, then to a SQLite table of zlib-compressed JSON
+    values that survives restarts. Only temperature-0 requests are cached
+    unless the caller opts in (see cacheable()): replaying a sampled answer
+    would quietly make that call deterministic.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DEFAULT_DB_PATH,
+        max_memory_entries: int = 512,
+        default_ttl: int = 86400,
+        ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_memory_entries = max_memory_entries
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+
+        if enabled and db_path:
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL,
+                    value BLOB NOT NULL
+                )
+            """)
+            self._conn.commit()
+            self.purge_expired()
+
+    @staticmethod
+    def make_key(**request) -> str:
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cacheable(request: Dict[str, Any], cache: Optional[bool] = None) -> bool:
+        """`cache` when the caller decided, otherwise whether the request is temperature 0"""
+        if cache is not None:
+            return cache
+        return request.get("temperature") == 0
+
+    def ttl_for(self, call_site: str) -> int:
+        return self.ttls.get(call_site, self.default_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    LLM_CACHE_REQUESTS.labels("memory_hit").inc()
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires_at, value FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    value = json.loads(zlib.decompress(row[1]).decode("utf-8"))
+                    self._remember(key, row[0], value)
+                    self.stats["disk_hits"] += 1
+                    LLM_CACHE_REQUESTS.labels("disk_hit").inc()
+                    return value
+
+            self.stats["misses"] += 1
+            LLM_CACHE_REQUESTS.labels("miss").inc()
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        if not self.enabled:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self.stats["stores"] += 1
+            if self._conn is not None:
+                blob = zlib.compress(json.dumps(value).encode("utf-8"))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, blob)
+                )
+                self._conn.commit()
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY_N_WRITES == 0
+            else:
+                purge = False
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._conn.commit()
+        return removed
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+llm_cache = LLMCache(
+    db_path=settings.LLM_CACHE_DB_PATH or DEFAULT_DB_PATH,
+    max_memory_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    default_ttl=settings.LLM_CACHE_TTL,
+    ttls=settings.LLM_CACHE_TTLS,
+    enabled=settings.LLM_CACHE_ENABLED,
+)
+
@@ -0,0 +1,228 @@
+import asyncio
+import random
+from typing import Callable, Dict, Optional
+import httpx
+import openai
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+from app.config.settings import settings
+from app.utils.llm_cache import LLMCache, llm_cache
+from app.utils.metrics import LLM_RETRIES, LLM_THROTTLE_WAIT, track_llm_call
+from app.utils.rate_limit import TokenBucket
+
+# Errors worth retrying: provider throttling, timeouts, dropped connections, 5xx
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+
+class LLMStreamInterrupted(RuntimeError):
+    """A stream failed after some of its deltas were delivered, so it can't be retried"""
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential backoff, honouring Retry-After when given"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class LLMGateway:
+    """
+    Single entry point for every LLM call in the backend.
+
+    Wraps one pooled AsyncOpenAI client and adds, per call: the response
+    cache, a per-model token-bucket rate limit, a global concurrency cap,
+    a timeout and jittered retries on transient errors. Point LLM_BASE_URL
+    at any OpenAI-compatible server (e.g. a local stub) to test it, or pass
+    a `transport` (e.g. httpx.MockTransport) to replace the connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        cache: Optional[LLMCache] = None,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        requests_per_minute: int = 60,
+        rpm_overrides: Optional[Dict[str, int]] = None,
+        timeout: float = 120.0,
+        max_retries: int = 4,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        # One keep-alive pool shared by every call
+        self.http_client = httpx.AsyncClient(
+            transport=transport or httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                )
+            ),
+            timeout=timeout
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key or "missing",
+            base_url=base_url,
+            timeout=timeout,
+            # Retries are handled here so they also respect the rate limiter
+            max_retries=0,
+            http_client=self.http_client
+        )
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.rpm_overrides = rpm_overrides or {}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._buckets: Dict[str, TokenBucket] = {}
+        # Created lazily so the gateway can be built at import time
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def chat(self, call_site: str, cache: Optional[bool] = None, **request) -> ChatCompletion:
+        """
+        chat.completions.create(**request) through cache, limits and retries.
+        `cache` forces caching on or off; by default only temperature-0
+        requests are cached.
+        """
+        key = self._cache_key(request, cache)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return ChatCompletion.model_validate(cached)
+
+        with track_llm_call(call_site):
+            response = await self._with_retries(
+                call_site,
+                request["model"],
+                lambda: self.client.chat.completions.create(**request)
+            )
+
+        message = response.choices[0].message if response.choices else None
+        # Empty answers are usually transient failures; don't pin them
+        if key and message is not None and (message.content or message.tool_calls):
+            self.cache.set(key, response.model_dump(mode="json"), ttl=self.cache.ttl_for(call_site))
+        return response
+
+    async def stream_chat(
+        self,
+        call_site: str,
+        on_delta: Callable[[str], None],
+        cache: Optional[bool] = None,
+        **request
+    ) -> str:
+        """
+        Streams a completion, passing each text delta to `on_delta`, and
+        returns the full text. A cache hit is delivered as a single delta.
+        Only failures before the first delta are retried; a later one
+        raises LLMStreamInterrupted and nothing is cached. The timeout
+        applies to opening the stream and to each chunk. `cache` as in chat().
+        """
+        request = {**request, "stream": True}
+        key = self._cache_key(request, cache)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                on_delta(cached["content"])
+                return cached["content"]
+
+        parts = []
+
+        async def attempt():
+            parts.clear()
+            stream = None
+            try:
+                # Timed per step rather than as a whole: an answer that keeps
+                # streaming is not a timeout, a stalled one is
+                stream = await asyncio.wait_for(self.client.chat.completions.create(**request), timeout=self.timeout)
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+            except (*RETRYABLE_ERRORS, asyncio.TimeoutError) as e:
+                if stream is not None:
+                    # Hand the pooled connection back instead of leaving the response open
+                    await stream.close()
+                # Deltas already went out; a retry would duplicate them
+                if parts:
+                    raise LLMStreamInterrupted(f"LLM stream failed after partial output: {type(e).__name__}") from e
+                raise
+
+        with track_llm_call(call_site):
+            await self._with_retries(call_site, request["model"], attempt, timed=False)
+
+        content = "".join(parts)
+        if key and content:
+            self.cache.set(key, {"content": content}, ttl=self.cache.ttl_for(call_site))
+        return content
+
+    async def _with_retries(self, call_site: str, model: str, make_call, timed: bool = True):
+        """Runs make_call() with retries; `timed` bounds each attempt by the gateway timeout"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = self._bucket(model)
+
+        attempt = 0
+        while True:
+            # Throttled calls wait for a token before taking a concurrency
+            # slot, so one rate-limited model can't hold up the others
+            LLM_THROTTLE_WAIT.labels(model).observe(await bucket.acquire())
+            async with self._semaphore:
+                try:
+                    if timed:
+                        return await asyncio.wait_for(make_call(), timeout=self.timeout)
+                    return await make_call()
+                except (*RETRYABLE_ERRORS, asyncio.TimeoutError) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    error = e
+            # Back off outside the semaphore so other calls can proceed
+            delay = _retry_delay(attempt, error)
+            attempt += 1
+            LLM_RETRIES.labels(call_site).inc()
+            print(f"[LLM Gateway] {call_site}: {type(error).__name__}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def _cache_key(self, request: Dict, cache: Optional[bool]) -> Optional[str]:
+        if self.cache is None or not self.cache.cacheable(request, cache):
+            return None
+        return self.cache.make_key(**request)
+
+    def _bucket(self, model: str) -> TokenBucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            bucket = TokenBucket(self.rpm_overrides.get(model, self.requests_per_minute))
+            self._buckets[model] = bucket
+        return bucket
+
+
+llm_gateway = LLMGateway(
+    api_key=settings.GOOGLE_API_KEY,
+    base_url=settings.LLM_BASE_URL,
+    cache=llm_cache,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_connections=settings.LLM_MAX_CONNECTIONS,
+    requests_per_minute=settings.LLM_RPM,
+    rpm_overrides=settings.LLM_RPM_OVERRIDES,
+    timeout=settings.LLM_TIMEOUT,
+    max_retries=settings.LLM_MAX_RETRIES,
+)
@@ -0,0 +1,161 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Analyses take seconds to minutes, so buckets reach well past the defaults
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 90, 120, 180, 300)
+
+NODE_LATENCY = Histogram(
+    "nirnay_graph_node_duration_seconds",
+    "Duration of each master agent LangGraph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS
+)
+NODE_ERRORS = Counter(
+    "nirnay_graph_node_errors_total",
+    "Graph node invocations that raised",
+    ["node"]
+)
+
+CONNECTOR_LATENCY = Histogram(
+    "nirnay_connector_fetch_duration_seconds",
+    "Duration of each connector's fetch_signals call",
+    ["source"],
+    buckets=LATENCY_BUCKETS
+)
+CONNECTOR_RESULTS = Counter(
+    "nirnay_connector_results_total",
+    "Signals returned per source",
+    ["source"]
+)
+CONNECTOR_ERRORS = Counter(
+    "nirnay_connector_errors_total",
+    "Connector calls that raised",
+    ["source"]
+)
+CONNECTOR_TIMEOUTS = Counter(
+    "nirnay_connector_timeouts_total",
+    "Connector calls abandoned after their timeout",
+    ["source"]
+)
+CONNECTOR_EMPTY_RESULTS = Counter(
+    "nirnay_connector_empty_results_total",
+    "Connector calls that completed without returning any signal",
+    ["source"]
+)
+CONNECTOR_CIRCUIT_STATE = Gauge(
+    "nirnay_connector_circuit_state",
+    "Connector circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["source"]
+)
+CONNECTOR_SCHEDULER_WAIT = Histogram(
+    "nirnay_connector_scheduler_wait_seconds",
+    "Time a live connector fetch waited for its concurrency, budget and rate limit",
+    ["source"],
+    buckets=(0, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+LLM_LATENCY = Histogram(
+    "nirnay_llm_call_duration_seconds",
+    "Duration of LLM calls per call site",
+    ["call_site"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_ERRORS = Counter(
+    "nirnay_llm_call_errors_total",
+    "LLM calls that raised, per call site",
+    ["call_site"]
+)
+
+LLM_RETRIES = Counter(
+    "nirnay_llm_retries_total",
+    "LLM call retries after transient errors, per call site",
+    ["call_site"]
+)
+LLM_THROTTLE_WAIT = Histogram(
+    "nirnay_llm_throttle_wait_seconds",
+    "Time spent waiting on the per-model rate limiter",
+    ["model"],
+    buckets=(0, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+LLM_CACHE_REQUESTS = Counter(
+    "nirnay_llm_cache_requests_total",
+    "LLM cache lookups by result (memory_hit, disk_hit, miss)",
+    ["result"]
+)
+SCRAPE_CACHE_REQUESTS = Counter(
+    "nirnay_scrape_cache_requests_total",
+    "Connector result cache lookups by result (fresh_hit, stale_hit, miss)",
+    ["result"]
+)
+HTTP_CACHE_REQUESTS = Counter(
+    "nirnay_http_cache_requests_total",
+    "Connector HTTP requests by cache result (fresh_hits, revalidated, misses, uncacheable)",
+    ["result"]
+)
+
+QUEUE_DEPTH = Gauge(
+    "nirnay_analysis_queue_depth",
+    "Analyses waiting for a free worker"
+)
+ANALYSES = Counter(
+    "nirnay_analyses_total",
+    "Finished analyses by outcome",
+    ["status"]
+)
+
+
+@contextmanager
+def track_llm_call(call_site: str):
+    """Times an LLM call and counts it as an error if the block raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_ERRORS.labels(call_site).inc()
+        raise
+    finally:
+        LLM_LATENCY.labels(call_site).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_node(node: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        NODE_ERRORS.labels(node).inc()
+        raise
+    finally:
+        NODE_LATENCY.labels(node).observe(time.perf_counter() - start)
+
+
+async def atimed_fetch(
+    source: str, connector, query: str, limit: int | None = None, fresh: bool = False, deadline: float | None = None
+):
+    """
+    Awaits connector.afetch_signals while recording latency, result count
+    and errors for `source`. A None limit keeps the connector's default.
+    """
+    # Only passed when set, so connectors with a (query, limit) signature keep working
+    options = {"fresh": True} if fresh else {}
+    if deadline is not None:
+        options["deadline"] = deadline
+    start = time.perf_counter()
+    try:
+        if limit is None:
+            results = await connector.afetch_signals(query, **options)
+        else:
+            results = await connector.afetch_signals(query, limit, **options)
+    except Exception:
+        CONNECTOR_ERRORS.labels(source).inc()
+        raise
+    finally:
+        CONNECTOR_LATENCY.labels(source).observe(time.perf_counter() - start)
+    CONNECTOR_RESULTS.labels(source).inc(len(results))
+    return results
+
+
+def render_metrics():
+    """Returns (body, content_type) in the Prometheus text format"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,111 @@
+import asyncio
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List
+
+
+def emit_progress(event: dict):
+    """
+    Pushes a custom progress event into the LangGraph stream of the
+    current run. Outside of a graph run (CLI, direct tool calls) this is
+    a no-op, so callers never need to care where they are invoked from.
+    """
+    try:
+        from langgraph.config import get_stream_writer
+        writer = get_stream_writer()
+    except Exception:
+        return
+    if writer is None:
+        return
+    try:
+        writer(event)
+    except Exception:
+        pass
+
+
+class ProgressBroker:
+    """
+    Fan-out of per-analysis progress events to SSE subscribers.
+
+    Events are kept per analysis so late subscribers get a replay of what
+    already happened. `publish` may be called from worker threads.
+    """
+
+    def __init__(self, max_analyses: int = 200, max_events: int = 2000):
+        self.max_analyses = max_analyses
+        self.max_events = max_events
+        self._history: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._closed: set = set()
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def open(self, analysis_id: str, replay_from: str | None = None):
+        """
+        Starts recording events for an analysis. With `replay_from`, the
+        events another analysis already emitted are copied over first.
+        """
+        self._history[analysis_id] = list(self._history.get(replay_from, [])) if replay_from else []
+        self._closed.discard(analysis_id)
+        while len(self._history) > self.max_analyses:
+            old_id, _ = self._history.popitem(last=False)
+            self._closed.discard(old_id)
+
+    def publish(self, analysis_id: str, event: dict):
+        self._dispatch(self._append, analysis_id, event)
+
+    def close(self, analysis_id: str):
+        self._dispatch(self._finish, analysis_id)
+
+    def has(self, analysis_id: str) -> bool:
+        return analysis_id in self._history
+
+    async def subscribe(self, analysis_id: str) -> AsyncIterator[dict]:
+        """Yields past events, then live ones until the analysis finishes"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in list(self._history.get(analysis_id, [])):
+            queue.put_nowait(event)
+        if analysis_id in self._closed or analysis_id not in self._history:
+            queue.put_nowait(None)
+        else:
+            self._subscribers.setdefault(analysis_id, []).append(queue)
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            subscribers = self._subscribers.get(analysis_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                self._subscribers.pop(analysis_id, None)
+
+    def _dispatch(self, fn, *args):
+        # Hop onto the event loop when called from a graph worker thread
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is not None and running is not loop:
+            loop.call_soon_threadsafe(fn, *args)
+        else:
+            fn(*args)
+
+    def _append(self, analysis_id: str, event: dict):
+        history = self._history.get(analysis_id)
+        if history is None:
+            return
+        if len(history) < self.max_events:
+            history.append(event)
+        for queue in self._subscribers.get(analysis_id, []):
+            queue.put_nowait(event)
+
+    def _finish(self, analysis_id: str):
+        self._closed.add(analysis_id)
+        for queue in self._subscribers.get(analysis_id, []):
+            queue.put_nowait(None)
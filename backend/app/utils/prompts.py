@@ -110,5 +110,11 @@ Every startup idea must include:
 
 Avoid vague, copy-paste, or buzzword-only ideas.
 Think like a founder, not a brainstorm bot.
+
+Market research documents, most relevant first (relevance_score):
+{docs_array}
+
+Research summary:
+{summary_array}
  """
 
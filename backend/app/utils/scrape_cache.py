@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import settings
+from app.utils.metrics import SCRAPE_CACHE_REQUESTS
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "data", "scrape_cache.db")
+
+# Freshness per source in seconds; startup directories change slowly,
+# launches and hackathon projects faster. 0 disables caching for a source.
+DEFAULT_SOURCE_TTLS = {
+    "YC": 86400,
+    "T-Hub": 86400,
+    "Devpost": 21600,
+    "Product Hunt": 3600,
+    "Reddit": 0,
+}
+
+# Purge expired disk entries every N writes
+PURGE_EVERY_N_WRITES = 100
+
+
+class ScrapeCache:
+    """
+    Per-source cache for connector results.
+
+    Keys combine the source, the normalized query and the limit. An entry
+    is fresh for its source's TTL; for `stale_ttl` seconds after that it
+    is still served, flagged as stale, so the caller can return it at
+    once and refresh it in the background. Like the LLM cache, lookups go
+    to an in-memory LRU first and then to a SQLite table of compressed
+    JSON that survives restarts.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DEFAULT_DB_PATH,
+        max_memory_entries: int = 256,
+        default_ttl: int = 21600,
+        ttls: Optional[Dict[str, int]] = None,
+        stale_ttl: int = 604800,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_memory_entries = max_memory_entries
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.stale_ttl = stale_ttl
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "stores": 0, "refreshes": 0}
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+
+        if enabled and db_path:
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    key TEXT PRIMARY KEY,
+                    fresh_until REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    value BLOB NOT NULL
+                )
+            """)
+            self._conn.commit()
+            self.purge_expired()
+
+    @staticmethod
+    def make_key(source: str, query: str, limit: Optional[int]) -> str:
+        normalized = re.sub(r"\s+", " ", query).strip().lower()
+        payload = json.dumps([source, normalized, limit])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Returns (value, is_fresh), or None on a miss"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT fresh_until, expires_at, value FROM scrape_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1], json.loads(zlib.decompress(row[2]).decode("utf-8")))
+                    self._remember(key, entry)
+
+            if entry is None or entry[1] <= now:
+                self._memory.pop(key, None)
+                self.stats["misses"] += 1
+                SCRAPE_CACHE_REQUESTS.labels("miss").inc()
+                return None
+
+            self._memory.move_to_end(key)
+            fresh = entry[0] > now
+            self.stats["fresh_hits" if fresh else "stale_hits"] += 1
+            SCRAPE_CACHE_REQUESTS.labels("fresh_hit" if fresh else "stale_hit").inc()
+            return entry[2], fresh
+
+    def set(self, key: str, value: Any, ttl: int):
+        if not self.enabled or ttl <= 0:
+            return
+        now = time.time()
+        entry = (now + ttl, now + ttl + self.stale_ttl, value)
+        with self._lock:
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+            if self._conn is not None:
+                blob = zlib.compress(json.dumps(value).encode("utf-8"))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO scrape_cache (key, fresh_until, expires_at, value) VALUES (?, ?, ?, ?)",
+                    (key, entry[0], entry[1], blob)
+                )
+                self._conn.commit()
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY_N_WRITES == 0
+            else:
+                purge = False
+        if purge:
+            self.purge_expired()
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claims a background refresh for `key`; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def purge_expired(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM scrape_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._conn.commit()
+        return removed
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.stats["fresh_hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        hits = self.stats["fresh_hits"] + self.stats["stale_hits"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "refreshing": len(self._refreshing),
+        }
+
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+scrape_cache = ScrapeCache(
+    db_path=settings.SCRAPE_CACHE_DB_PATH or DEFAULT_DB_PATH,
+    max_memory_entries=settings.SCRAPE_CACHE_MAX_ENTRIES,
+    default_ttl=settings.SCRAPE_CACHE_TTL,
+    ttls={**DEFAULT_SOURCE_TTLS, **settings.SCRAPE_CACHE_TTLS},
+    stale_ttl=settings.SCRAPE_CACHE_STALE_TTL,
+    enabled=settings.SCRAPE_CACHE_ENABLED,
+)
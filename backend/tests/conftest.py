@@ -0,0 +1,15 @@
+import os
+import sys
+
+# Caches and indexes are module-level singletons built at import time;
+# keep test runs out of app/data
+for name in (
+    "ANALYSIS_DB_PATH",
+    "LLM_CACHE_DB_PATH",
+    "SCRAPE_CACHE_DB_PATH",
+    "HTTP_CACHE_DB_PATH",
+    "DIRECTORY_INDEX_DB_PATH",
+):
+    os.environ.setdefault(name, ":memory:")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
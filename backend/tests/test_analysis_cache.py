@@ -0,0 +1,81 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from openai.types.chat import ChatCompletion
+from app.agents import master_agent, web_intel_agent
+from app.utils.llm_cache import LLMCache
+from app.utils.llm_gateway import llm_gateway
+
+ANSWER = json.dumps({
+    "selected_agents": ["Web Intelligence Agent", "Report Generator Agent"],
+    "reason": "needs research and a report",
+    "final_summary": "Dental scheduling is crowded",
+    "recommendations": "Niche down",
+})
+
+
+def _completion(content=None, tool_calls=None):
+    return ChatCompletion.model_validate({
+        "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+        "choices": [{
+            "index": 0, "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content, "tool_calls": tool_calls},
+        }],
+    })
+
+
+class StubStream:
+    def __init__(self, text):
+        self.parts = [text[:10], text[10:]]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.parts:
+            raise StopAsyncIteration
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.parts.pop(0)))])
+
+    async def close(self):
+        pass
+
+
+class UpstreamLLM:
+    """chat.completions stand-in recording every request that reaches the provider"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, **request):
+        self.requests.append(request)
+        if request.get("stream"):
+            return StubStream(ANSWER)
+        if request.get("tools"):
+            arguments = json.dumps({"query": "AI scheduling for dentists", "limit": 5})
+            return _completion(tool_calls=[{
+                "id": "call-1", "type": "function",
+                "function": {"name": "search_web", "arguments": arguments},
+            }])
+        return _completion(ANSWER)
+
+
+async def _search(query, limit, types=None, fresh=False, **options):
+    yield "YC", [{"source": "Y Combinator", "name": "Dentr", "description": "AI scheduling for dentists", "url": "https://dentr.ai"}]
+    yield "Devpost", [{"source": "Devpost", "name": "ToothBot", "description": "Chatbot for dental clinics", "url": "https://devpost.com/software/toothbot"}]
+
+
+def test_repeated_analysis_makes_no_upstream_calls(monkeypatch):
+    upstream = UpstreamLLM()
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(chat=SimpleNamespace(completions=upstream)))
+    monkeypatch.setattr(llm_gateway, "cache", LLMCache(db_path=":memory:"))
+    monkeypatch.setattr(web_intel_agent, "astream_search_all", _search)
+
+    first = asyncio.run(master_agent.run_master_agent("AI for dentists"))
+    calls = len(upstream.requests)
+    second = asyncio.run(master_agent.run_master_agent("AI for dentists"))
+
+    # router, tool call, summary, master prompt, report and synthesis
+    assert calls == 6
+    assert len(upstream.requests) == calls
+    assert second == first
+    assert first.final_summary == "Dental scheduling is crowded"
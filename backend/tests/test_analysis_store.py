@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import pytest
+from app.utils.analysis_store import MemoryAnalysisStore, SQLiteAnalysisStore
+from app.utils.schemas import SynthOutput
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request):
+    def make(**options):
+        if request.param == "memory":
+            return MemoryAnalysisStore(**options)
+        return SQLiteAnalysisStore(db_path=":memory:", **options)
+    return make
+
+
+def _timestamp(minutes_ago):
+    return (datetime.now() - timedelta(minutes=minutes_ago)).isoformat()
+
+
+def _fill(store, count):
+    # Two analyses per timestamp, so pages must break ties by id
+    for i in range(count):
+        store.save(f"id-{i:02d}", f"query {i}", {"final_summary": str(i)}, _timestamp(count - i // 2))
+
+
+def test_saved_result_round_trips(make_store):
+    store = make_store()
+    output = SynthOutput(final_summary="Crowded market", recommendations="Niche down", tables=[], charts=[])
+    store.save("a", "AI for dentists", output, "2026-01-01T10:00:00")
+
+    assert store.get("a") == {
+        "analysis_id": "a", "query": "AI for dentists", "timestamp": "2026-01-01T10:00:00",
+        "result": output.model_dump(),
+    }
+    assert store.get("missing") is None
+
+
+def test_cursor_pages_cover_history_once_newest_first(make_store):
+    store = make_store()
+    _fill(store, 25)
+
+    pages, cursor = [], None
+    while True:
+        items, cursor = store.list_history(limit=10, cursor=cursor)
+        pages.append([item["analysis_id"] for item in items])
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    seen = [analysis_id for page in pages for analysis_id in page]
+    assert seen == [f"id-{i:02d}" for i in reversed(range(25))]
+
+
+def test_exact_page_has_no_next_cursor(make_store):
+    store = make_store()
+    _fill(store, 10)
+
+    items, cursor = store.list_history(limit=10)
+    assert len(items) == 10 and cursor is None
+
+
+def test_history_filters(make_store):
+    store = make_store()
+    store.save("a", "AI for dentists", {}, "2026-01-01T10:00:00")
+    store.save("b", "100% organic_food", {}, "2026-01-02T10:00:00")
+    store.save("c", "ai for farmers", {}, "2026-01-03T10:00:00")
+
+    def ids(**filters):
+        return [item["analysis_id"] for item in store.list_history(**filters)[0]]
+
+    assert ids(query_contains="AI FOR") == ["c", "a"]
+    # LIKE wildcards in the filter are literal text
+    assert ids(query_contains="0% o") == ["b"]
+    assert ids(query_contains="r_d") == []
+    assert ids(since="2026-01-02T00:00:00", until="2026-01-03T10:00:00") == ["b"]
+
+
+def test_invalid_cursor_is_rejected(make_store):
+    with pytest.raises(ValueError):
+        make_store().list_history(cursor="not-a-cursor")
+
+
+def test_eviction_keeps_the_newest_rows_within_retention(make_store):
+    store = make_store(max_rows=3, retention_days=1)
+    store.save("old", "stale", {}, (datetime.now() - timedelta(days=2)).isoformat())
+    _fill(store, 5)
+
+    store.evict()
+
+    assert [item["analysis_id"] for item in store.list_history()[0]] == ["id-04", "id-03", "id-02"]
+    assert store.get("old") is None
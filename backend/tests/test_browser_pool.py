@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.tools import browser_pool as browser_pool_module
+from app.tools.browser_pool import BrowserPool
+
+
+class StubContext:
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return SimpleNamespace()
+
+    async def close(self):
+        pass
+
+
+class StubBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return StubContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class StubPlaywright:
+    """async_playwright() stand-in counting starts and browser launches"""
+
+    def __init__(self):
+        self.starts = 0
+        self.launches = 0
+        self.chromium = SimpleNamespace(launch=self._launch)
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        self.starts += 1
+        return self
+
+    async def stop(self):
+        pass
+
+    async def _launch(self, **options):
+        self.launches += 1
+        return StubBrowser()
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    playwright = StubPlaywright()
+    monkeypatch.setattr(browser_pool_module, "async_playwright", playwright)
+    monkeypatch.setattr(browser_pool_module, "_chromium_rss_mb", lambda: None)
+    return playwright
+
+
+def test_pool_starts_on_first_page_and_launches_browsers_as_needed(playwright):
+    pool = BrowserPool(size=3)
+    assert pool.snapshot()["started"] is False
+
+    async def scenario():
+        assert playwright.starts == 0
+        async with pool.page():
+            pass
+        first = (playwright.starts, playwright.launches)
+        # Two scrapes at once need a second browser, never a third
+        async with pool.page(), pool.page():
+            pass
+        second = playwright.launches
+        await pool.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == (1, 1)
+    assert second == 2
+
+
+def test_start_warms_up_every_browser(playwright):
+    pool = BrowserPool(size=3)
+
+    async def scenario():
+        await pool.start()
+        launched = playwright.launches
+        async with pool.page():
+            pass
+        await pool.stop()
+        return launched
+
+    assert asyncio.run(scenario()) == 3
+    assert playwright.launches == 3
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from app.tools import web_tools
+from app.tools.web_tools import BaseConnector
+from app.utils import connector_health as health_module
+from app.utils.connector_health import CircuitOpenError, ConnectorHealth
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock the test moves by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(health_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once(clock):
+    health = ConnectorHealth(failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        health.record("YC", False, 0.1)
+    # A success in between resets the count
+    health.record("YC", True, 0.1)
+    for _ in range(3):
+        health.record("YC", False, 0.1)
+
+    with pytest.raises(CircuitOpenError) as refused:
+        health.check("YC")
+    assert refused.value.retry_in == 60
+
+    # After the cooldown one probe goes through; other calls wait for its outcome
+    clock[0] += 60
+    assert health.allow("YC")
+    assert not health.allow("YC")
+    health.record("YC", True, 0.1)
+    assert health.allow("YC")
+    assert health.snapshot()["YC"]["state"] == "closed"
+    assert health.snapshot()["YC"]["skipped"] == 2
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    health = ConnectorHealth(failure_threshold=1, cooldown=60)
+    health.record("YC", False, 0.1)
+    clock[0] += 60
+    assert health.allow("YC")
+    health.record("YC", False, 0.1)
+    assert health.snapshot()["YC"]["state"] == "open"
+    assert not health.allow("YC")
+
+
+def test_empty_results_do_not_trip_the_breaker():
+    health = ConnectorHealth(failure_threshold=2)
+    for _ in range(5):
+        health.record("Devpost", True, 0.1, empty=True)
+    assert health.allow("Devpost")
+    assert health.snapshot()["Devpost"]["empty_rate"] == 1.0
+
+
+def test_timeout_follows_p95_latency():
+    health = ConnectorHealth(timeout_multiplier=2.0, min_timeout=1.0)
+    for latency in (1, 2, 3, 4):
+        health.record("YC", True, latency)
+    # Too few samples to adapt
+    assert health.timeout_for("YC", 130) == 130
+
+    health.record("YC", True, 5)
+    assert health.timeout_for("YC", 130) == 10
+    # Errors are fast and say nothing about the time the source needs
+    for _ in range(10):
+        health.record("YC", False, 0.01)
+    assert health.timeout_for("YC", 130) == 10
+    # Never above the default nor below the floor
+    assert health.timeout_for("YC", 8) == 8
+    fast = ConnectorHealth(min_timeout=1.0)
+    for _ in range(5):
+        fast.record("PH", True, 0.01)
+    assert fast.timeout_for("PH", 130) == 1.0
+
+
+class SlowConnector(BaseConnector):
+    """Takes as long as it is allowed; deadline-aware when `accepts_deadline`"""
+    name = "Slow"
+
+    def __init__(self, accepts_deadline):
+        self.accepts_deadline = accepts_deadline
+        self.deadlines = []
+
+    def fetch_signals(self, query, limit=5):
+        return []
+
+    async def afetch_signals(self, query, limit=5, deadline=None):
+        self.deadlines.append(deadline)
+        if deadline is None:
+            await asyncio.sleep(10)
+        await asyncio.sleep(deadline)
+        return [{"name": "partial"}]
+
+
+@pytest.fixture
+def fast_health(monkeypatch):
+    # Five quick calls bring the adaptive timeout down to its 0.05s floor
+    health = ConnectorHealth(min_timeout=0.05)
+    for _ in range(5):
+        health.record("Slow", True, 0.01)
+    monkeypatch.setattr(web_tools, "connector_health", health)
+    return health
+
+
+def test_adaptive_timeout_is_the_connector_deadline(fast_health):
+    connector = SlowConnector(accepts_deadline=True)
+
+    results = asyncio.run(web_tools._afetch_live("Slow", connector, "ai", 5))
+
+    # The partial results survive instead of being cancelled with the fetch
+    assert results == [{"name": "partial"}]
+    assert connector.deadlines == [0.05]
+
+
+def test_connector_without_deadline_is_cancelled_at_the_timeout(fast_health):
+    connector = SlowConnector(accepts_deadline=False)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(web_tools._afetch_live("Slow", connector, "ai", 5))
+
+    assert connector.deadlines == [None]
+    assert fast_health.snapshot()["Slow"]["success_rate"] == 5 / 6
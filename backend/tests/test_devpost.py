@@ -0,0 +1,68 @@
+import asyncio
+import httpx
+import pytest
+from app.tools import web_tools
+from app.tools.web_tools import DEVPOST_MAX_PER_HOST, DevpostConnector
+
+
+class Devpost:
+    """Mock Devpost search and project pages that track concurrent project fetches"""
+
+    def __init__(self, projects=6):
+        self.projects = projects
+        self.searches = []
+        self.active = 0
+        self.peak = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/software/search":
+            self.searches.append(request.url)
+            links = "".join(
+                f'<a class="link-to-software" href="https://devpost.com/software/p{i}">P{i}</a>'
+                for i in range(self.projects)
+            )
+            return httpx.Response(200, text=f"<html>{links}</html>")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        name = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, text=f'<html><h1 id="app-title">{name}</h1><ul id="built-with"><li>python</li></ul></html>')
+
+
+@pytest.fixture
+def devpost(monkeypatch):
+    devpost = Devpost()
+    client = httpx.AsyncClient
+
+    def mock_client(**options):
+        options.pop("limits", None)
+        return client(transport=httpx.MockTransport(devpost.handle), **options)
+
+    monkeypatch.setattr(web_tools.httpx, "AsyncClient", mock_client)
+    return devpost
+
+
+def test_query_is_url_encoded(devpost):
+    results = asyncio.run(DevpostConnector().afetch_signals("ai & ml #1", 2, fresh=True))
+
+    assert [result["name"] for result in results] == ["p0", "p1"]
+    [url] = devpost.searches
+    assert url.params["query"] == "ai & ml #1"
+    # "&" and "#" are escaped rather than splitting the query string
+    assert list(url.params) == ["query"]
+
+
+def test_host_limit_is_shared_across_searches(devpost):
+    connector = DevpostConnector()
+
+    async def scenario():
+        return await asyncio.gather(*(connector.afetch_signals(f"q{i}", 6, fresh=True) for i in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert [len(found) for found in results] == [6, 6, 6]
+    # Three concurrent searches still share one cap on devpost.com
+    assert devpost.peak <= DEVPOST_MAX_PER_HOST
+    [slots] = connector._host_slots.values()
+    assert list(slots) == ["devpost.com"]
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.tools import web_tools
+from app.tools.web_tools import THubConnector, YCombinatorConnector
+
+ALGOLIA_PAGE = '<html><script>window.AlgoliaOpts = {"app":"TESTAPP","key":"search-key"};</script></html>'
+
+
+class Directory:
+    """Mock YC directory + Algolia search and T-Hub startup pages, behind httpx.MockTransport"""
+
+    def __init__(self, total_hits=45, thub_pages=2):
+        self.total_hits = total_hits
+        self.thub_pages = thub_pages
+        self.algolia_status = 200
+        self.algolia_opts = True
+        self.searches = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/companies":
+            return httpx.Response(200, text=ALGOLIA_PAGE if self.algolia_opts else "<html></html>")
+        if request.url.path.endswith("/query"):
+            body = json.loads(request.content)
+            self.searches.append((request.url.host, request.headers.get("x-algolia-api-key"), body))
+            if self.algolia_status != 200:
+                return httpx.Response(self.algolia_status, json={})
+            page, per_page = body["page"], body["hitsPerPage"]
+            first = page * per_page
+            hits = [
+                {"name": f"Co{i}", "one_liner": "AI for farms", "batch": "W24", "slug": f"co{i}"}
+                for i in range(first, min(first + per_page, self.total_hits))
+            ]
+            return httpx.Response(200, json={"hits": hits, "nbHits": self.total_hits, "nbPages": -(-self.total_hits // per_page)})
+        if request.url.path == "/startups":
+            page = int(request.url.params.get("page", "1"))
+            cards = "".join(
+                f'<div class="startup-card"><a href="/startups/s{page}-{i}"><h3>Startup {page}-{i}</h3></a><p>Desc {i}</p></div>'
+                for i in range(15 if page <= self.thub_pages else 0)
+            )
+            return httpx.Response(200, text=f"<html><nav><a href='/startups/apply'>Apply</a></nav>{cards}</html>")
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def directory(monkeypatch):
+    directory = Directory()
+    monkeypatch.setattr(
+        web_tools, "_directory_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(directory.handle), follow_redirects=True)
+    )
+    monkeypatch.setattr(web_tools.settings, "DIRECTORY_HTTP_FIRST", True)
+    return directory
+
+
+def _without_browser(connector):
+    """Swaps the browser scrape for a stub that records it was reached"""
+    calls = []
+
+    async def scrape(query, limit, **options):
+        calls.append(query)
+        return [{"name": "from-browser"}], False
+
+    connector._scrape = scrape
+    return calls
+
+
+def test_yc_reads_algolia_with_the_page_credentials(directory):
+    yc = YCombinatorConnector()
+    yc.algolia_url = "http://algolia.test"
+    browser = _without_browser(yc)
+
+    results = asyncio.run(yc.afetch_signals("farm robots", 5, fresh=True))
+
+    assert [result["name"] for result in results] == [f"Co{i}" for i in range(5)]
+    assert results[0] == {
+        "source": "Y Combinator", "type": "supply_signal", "name": "Co0", "description": "AI for farms",
+        "batch": "W24", "url": "https://www.ycombinator.com/companies/co0",
+    }
+    host, key, body = directory.searches[0]
+    assert (host, key, body["query"]) == ("algolia.test", "search-key", "farm robots")
+    assert browser == []
+
+
+def test_yc_pages_through_algolia_up_to_the_limit(directory):
+    yc = YCombinatorConnector()
+    yc.algolia_url = "http://algolia.test"
+    _without_browser(yc)
+
+    results, complete = asyncio.run(yc.crawl(40))
+
+    assert len(results) == 40
+    assert len({result["name"] for result in results}) == 40
+    # Stopping at the limit leaves hits unread
+    assert not complete
+
+
+def test_yc_crawl_is_complete_once_every_hit_is_read(directory):
+    yc = YCombinatorConnector()
+    yc.algolia_url = "http://algolia.test"
+    _without_browser(yc)
+
+    results, complete = asyncio.run(yc.crawl(1000))
+
+    assert len(results) == 45
+    assert complete
+
+
+def test_yc_falls_back_to_the_browser(directory):
+    yc = YCombinatorConnector()
+    yc.algolia_url = "http://algolia.test"
+    browser = _without_browser(yc)
+
+    directory.algolia_opts = False
+    assert asyncio.run(yc.afetch_signals("ai", 5, fresh=True)) == [{"name": "from-browser"}]
+
+    # Rejected credentials are dropped so the next search reads them again
+    directory.algolia_opts = True
+    directory.algolia_status = 403
+    assert asyncio.run(yc.afetch_signals("ai", 5, fresh=True)) == [{"name": "from-browser"}]
+    assert yc._algolia_opts is None
+    assert browser == ["ai", "ai"]
+
+
+def test_thub_reads_server_rendered_cards(directory):
+    thub = THubConnector()
+    browser = _without_browser(thub)
+
+    results = asyncio.run(thub.afetch_signals("fintech", 20, fresh=True))
+
+    assert len(results) == 20
+    assert results[0] == {
+        "source": "T-Hub", "type": "supply_signal", "name": "Startup 1-0", "description": "Desc 0",
+        "category": "Indian Startup", "url": "https://www.t-hub.co/startups/s1-0",
+    }
+    assert browser == []
+
+
+def test_thub_without_cards_falls_back_to_the_browser(directory):
+    directory.thub_pages = 0
+    thub = THubConnector()
+    browser = _without_browser(thub)
+
+    assert asyncio.run(thub.afetch_signals("fintech", 5, fresh=True)) == [{"name": "from-browser"}]
+    assert browser == ["fintech"]
+
+
+def test_thub_crawl_is_complete_only_on_an_empty_page(directory):
+    thub = THubConnector()
+    _without_browser(thub)
+
+    results, complete = asyncio.run(thub.crawl(1000))
+    assert len(results) == 30
+    assert complete
+
+    # Running out of pages before the directory ends is a partial harvest
+    results, complete = asyncio.run(thub.crawl(20))
+    assert len(results) == 20
+    assert not complete
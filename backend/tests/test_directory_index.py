@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from app.tools.directory_index import DirectoryCrawler, DirectoryIndex, _fts_query
+
+WORDS = (
+    "platform software data analytics payments developers teams automation cloud marketplace "
+    "health consumer fintech saas infrastructure security logistics education"
+).split()
+
+
+def _directory(size=200):
+    # Filler startups share common words; every tenth one also serves sales teams
+    records = []
+    for i in range(size):
+        description = " ".join(WORDS[(i + k) % len(WORDS)] for k in range(0, 15, 3))
+        if i % 10 == 0:
+            description += " for sales teams"
+        records.append({"name": f"Company {i}", "description": description, "url": f"https://example.com/{i}"})
+    records.append({"name": "TrialBase", "description": "Software to run clinical trials faster", "url": "https://trialbase.io"})
+    records.append({"name": "Dentr", "description": "AI scheduling for dentists", "url": "https://dentr.ai"})
+    return records
+
+
+@pytest.fixture
+def index():
+    index = DirectoryIndex(db_path=":memory:")
+    if not index.fts:
+        pytest.skip("SQLite built without FTS5")
+    index.upsert("YC", _directory())
+    index.mark_crawled("YC")
+    return index
+
+
+def test_fts_query_keeps_quoted_content_terms():
+    assert _fts_query("How to run clinical trials for AI?") == '"run" OR "clinical" OR "trials" OR "ai"'
+    assert _fts_query('the "a" of x') == ""
+    assert _fts_query("AI ai Ai") == '"ai"'
+
+
+def test_search_ranks_the_specific_match_first(index):
+    results = index.lookup("YC", "clinical trials", 10)
+    assert [result["name"] for result in results] == ["TrialBase"]
+    assert index.lookup("YC", "AI for dentists", 10)[0]["name"] == "Dentr"
+
+
+def test_hit_on_one_common_word_is_not_a_match(index):
+    # "sales" matches many filler rows, but that alone is too weak against the whole query
+    results = index.lookup("YC", "sales and clinical trials of Metformin", 10)
+    assert [result["name"] for result in results] == ["TrialBase"]
+    assert index.lookup("YC", "metformin", 10) == []
+
+
+def test_stale_or_disabled_index_is_not_used(index):
+    index.max_age = 0
+    assert index.lookup("YC", "clinical trials", 10) is None
+    assert DirectoryIndex(db_path=":memory:", enabled=False).lookup("YC", "clinical trials", 10) is None
+
+
+def test_complete_crawl_prunes_entries_that_left_the_directory(index):
+    async def harvest(limit):
+        return _directory(size=20), True
+
+    counts = asyncio.run(DirectoryCrawler(index, {"YC": harvest}, crawl_limit=1000).crawl("YC"))
+
+    assert counts["removed"] == 180
+    assert index.snapshot()["sources"]["YC"]["entries"] == 22
+
+
+def test_truncated_crawl_keeps_existing_entries(index):
+    crawled_at = index.crawled_at("YC")
+
+    async def harvest(limit):
+        # Fewer records than the limit, but the harvester gave up early
+        return _directory(size=20), False
+
+    counts = asyncio.run(DirectoryCrawler(index, {"YC": harvest}, crawl_limit=1000).crawl("YC"))
+
+    assert counts["removed"] == 0
+    assert index.snapshot()["sources"]["YC"]["entries"] == 202
+    # The source stays due for another crawl
+    assert index.crawled_at("YC") == crawled_at
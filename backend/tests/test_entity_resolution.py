@@ -0,0 +1,65 @@
+from app.tools.entity_resolution import EntityResolver, company_domain, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name("Open-AI, Inc.") == "openai"
+    assert normalize_name("  Café & Co ") == "cafeand"
+    assert normalize_name("Co") == "co"
+    assert normalize_name(None) == ""
+
+
+def test_company_domain_skips_directory_and_shared_hosts():
+    assert company_domain("https://www.acme.io/pricing") == "acme.io"
+    assert company_domain("https://www.ycombinator.com/companies/acme") is None
+    assert company_domain("https://github.com/acme/app") is None
+    assert company_domain("https://apps.apple.com/us/app/acme/id1") is None
+    assert company_domain(None) is None
+
+
+def test_same_startup_across_sources_is_merged():
+    records = [
+        {"source": "Y Combinator", "type": "supply_signal", "name": "Acme, Inc.", "description": "N/A",
+         "batch": "W24", "url": "https://www.ycombinator.com/companies/acme"},
+        {"source": "Product Hunt", "type": "supply_signal", "name": "Acme", "pitch": "Farm robots",
+         "tags": ["robotics"], "url": "https://acme.io"},
+        {"source": "Devpost", "type": "supply_signal", "name": "Acme Robots", "description": "Robots for farms",
+         "tags": ["ai", "robotics"], "url": "https://www.acme.io/"},
+    ]
+
+    [entity] = EntityResolver().resolve(records)
+
+    assert entity["name"] == "Acme, Inc."
+    assert entity["description"] == "Robots for farms"
+    assert entity["tags"] == ["robotics", "ai"]
+    assert entity["sources"] == ["Y Combinator", "Product Hunt", "Devpost"]
+    assert [item["source"] for item in entity["provenance"]] == entity["sources"]
+
+
+def test_exact_copies_are_dropped_and_counted():
+    record = {"source": "Devpost", "name": "Acme", "url": "https://devpost.com/software/acme"}
+    resolver = EntityResolver()
+
+    assert resolver.resolve([record, dict(record)]) == [record]
+    assert resolver.snapshot() == {"records": 2, "entities": 1, "exact_duplicates": 1, "merged": 0}
+
+
+def test_placeholder_names_and_shared_hosts_do_not_merge():
+    records = [
+        {"source": "Devpost", "name": "Unknown", "url": "https://devpost.com/software/a"},
+        {"source": "Devpost", "name": "Unknown", "url": "https://devpost.com/software/b"},
+        {"source": "T-Hub", "name": "N/A", "url": "https://t-hub.co/startups/c"},
+        {"source": "T-Hub", "name": "n/a", "url": "https://t-hub.co/startups/d"},
+        {"source": "Product Hunt", "name": "Alpha", "url": "https://github.com/alpha/app"},
+        {"source": "Product Hunt", "name": "Beta", "url": "https://github.com/beta/app"},
+    ]
+
+    assert len(EntityResolver().resolve(records)) == len(records)
+
+
+def test_records_without_keys_pass_through():
+    dorks = [
+        {"source": "Reddit", "type": "social_signal", "dork": 'site:reddit.com "x" "alternative to"'},
+        {"source": "Reddit", "type": "social_signal", "dork": 'site:reddit.com "x" "willing to pay"'},
+    ]
+
+    assert EntityResolver().resolve(dorks) == dorks
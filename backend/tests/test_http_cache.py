@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+from types import SimpleNamespace
+import httpx
+import pytest
+from app.utils import http_cache as http_cache_module
+from app.utils.http_cache import HttpCache, _freshness
+
+URL = "https://devpost.test/software/acme"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock of the HTTP cache, moved by hand"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(http_cache_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+class Origin:
+    """Serves `body` under an ETag; answers 304 when the client already has it"""
+
+    def __init__(self, body=b"<h1>Acme</h1>", cache_control="max-age=60"):
+        self.body = body
+        self.cache_control = cache_control
+        self.requests = []
+
+    @property
+    def etag(self):
+        return f'"{hashlib.sha1(self.body).hexdigest()[:8]}"'
+
+    def handle(self, request):
+        self.requests.append(request)
+        headers = {"etag": self.etag, "cache-control": self.cache_control, "content-type": "text/html"}
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=self.body)
+
+
+def _fetch(cache, origin, **options):
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(origin.handle)) as client:
+            return await cache.request(client, "GET", URL, **options)
+    return asyncio.run(fetch())
+
+
+def test_fresh_then_revalidated_with_the_stored_body(clock):
+    cache, origin = HttpCache(db_path=":memory:"), Origin()
+
+    assert _fetch(cache, origin).cache_status == "miss"
+    clock[0] += 30
+    hit = _fetch(cache, origin)
+    assert (hit.cache_status, len(origin.requests)) == ("fresh_hit", 1)
+
+    # Past max-age: a conditional request, and the 304 reuses the stored body
+    clock[0] += 31
+    revalidated = _fetch(cache, origin)
+    assert revalidated.cache_status == "revalidated"
+    assert revalidated.status_code == 200
+    assert revalidated.text == "<h1>Acme</h1>"
+    assert origin.requests[-1].headers["if-none-match"] == origin.etag
+    assert cache.snapshot()["bytes_saved"] == 2 * len(origin.body)
+
+    # The 304 renewed the lifetime
+    clock[0] += 30
+    assert _fetch(cache, origin).cache_status == "fresh_hit"
+    assert len(origin.requests) == 2
+
+
+def test_changed_page_replaces_the_entry(clock):
+    cache, origin = HttpCache(db_path=":memory:"), Origin()
+    _fetch(cache, origin)
+
+    clock[0] += 61
+    origin.body = b"<h1>Acme 2</h1>"
+    response = _fetch(cache, origin)
+
+    assert (response.cache_status, response.text) == ("miss", "<h1>Acme 2</h1>")
+    assert _fetch(cache, origin).cache_status == "fresh_hit"
+
+
+def test_fresh_requests_revalidate_even_while_fresh(clock):
+    cache, origin = HttpCache(db_path=":memory:"), Origin()
+    _fetch(cache, origin)
+
+    assert _fetch(cache, origin, fresh=True).cache_status == "revalidated"
+    assert _fetch(cache, origin, headers={"Cache-Control": "no-cache"}).cache_status == "revalidated"
+    assert len(origin.requests) == 3
+
+
+def test_uncacheable_responses_are_not_stored(clock):
+    cache = HttpCache(db_path=":memory:")
+
+    no_store = Origin(cache_control="no-store")
+    for _ in range(2):
+        assert _fetch(cache, no_store).cache_status == "uncacheable"
+    assert len(no_store.requests) == 2
+
+    def graphql_error(request):
+        return httpx.Response(200, json={"errors": [{"message": "rate limited"}]})
+
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(graphql_error)) as client:
+            return await cache.request(client, "POST", "https://api.test/graphql", json={"query": "{ posts }"})
+
+    assert asyncio.run(post()).cache_status == "uncacheable"
+    assert cache.snapshot()["memory_entries"] == 0
+
+
+def test_parse_is_memoized_across_fresh_hits_and_304s(clock):
+    cache, origin = HttpCache(db_path=":memory:"), Origin()
+    parses = []
+
+    def parse(html):
+        parses.append(html)
+        return {"title": html}
+
+    for _ in range(2):
+        assert cache.parsed(_fetch(cache, origin), "devpost_project", parse) == {"title": "<h1>Acme</h1>"}
+        clock[0] += 61
+
+    assert len(parses) == 1
+    assert cache.snapshot()["parse_hits"] == 1
+
+
+def test_stale_entries_are_kept_for_revalidation_until_retention(clock):
+    cache, origin = HttpCache(db_path=":memory:", retention=3600), Origin()
+    _fetch(cache, origin)
+
+    clock[0] += 1800
+    assert cache.purge_expired() == 0
+    clock[0] += 1800
+    assert cache.purge_expired() == 1
+
+
+def test_freshness_lifetime_from_headers():
+    now = 1_000_000.0
+    assert _freshness(httpx.Headers({"cache-control": "public, max-age=120"}), now, 300) == 120
+    assert _freshness(httpx.Headers({"cache-control": "no-cache"}), now, 300) == 0
+    assert _freshness(httpx.Headers({"cache-control": "no-store"}), now, 300) is None
+    expires = {"date": "Mon, 01 Jan 2024 00:00:00 GMT", "expires": "Mon, 01 Jan 2024 00:10:00 GMT"}
+    assert _freshness(httpx.Headers(expires), now, 300) == 600
+    # Heuristic: a tenth of the age of the last change, capped
+    modified = {"date": "Mon, 01 Jan 2024 00:10:00 GMT", "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert _freshness(httpx.Headers(modified), now, 300) == 60
+    assert _freshness(httpx.Headers(modified), now, 30) == 30
+    assert _freshness(httpx.Headers({}), now, 300) == 300
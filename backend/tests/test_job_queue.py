@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import pytest
+from app.utils.job_queue import AdmissionError, AnalysisJobQueue, analysis_key
+
+
+class GatedRunner:
+    """Pipeline stand-in: every run waits for `release` and returns the query"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = []
+
+    async def __call__(self, query, on_stage=None, on_event=None, fresh=False):
+        self.started.append(query)
+        on_stage("web_intel", "started")
+        await self.release.wait()
+        on_stage("web_intel", "finished")
+        return {"answer": query}
+
+
+async def _started_queue(runner, **options):
+    completed = {}
+    queue = AnalysisJobQueue(runner, lambda job, result: completed.setdefault(job.analysis_id, result), **options)
+    await queue.start()
+    return queue, completed
+
+
+async def _settle():
+    # Lets the workers pick up queued jobs and run completion callbacks,
+    # which happen in worker threads
+    await asyncio.sleep(0.05)
+
+
+def test_analysis_key_ignores_case_spacing_and_trailing_punctuation():
+    assert analysis_key("  AI for  farmers? ") == analysis_key("ai for farmers")
+    assert analysis_key("ai for farmers", fresh=True) != analysis_key("ai for farmers", fresh=False)
+
+
+def test_identical_queries_share_one_run():
+    async def scenario():
+        runner = GatedRunner()
+        queue, completed = await _started_queue(runner, num_workers=2)
+        leader = queue.submit("a", "AI for farmers")
+        await _settle()
+        follower = queue.submit("b", "ai for farmers?")
+        other = queue.submit("c", "AI for farmers", fresh=True)
+        await _settle()
+
+        assert follower.coalesced_with == "a"
+        assert follower.status == "running"
+        assert "web_intel" in follower.stages
+        assert other.coalesced_with is None
+
+        runner.release.set()
+        await _settle()
+        await queue.stop()
+        return runner, queue, completed, leader, follower
+
+    runner, queue, completed, leader, follower = asyncio.run(scenario())
+    assert runner.started == ["AI for farmers", "AI for farmers"]
+    assert completed["a"] == completed["b"] == {"answer": "AI for farmers"}
+    assert leader.status == follower.status == "done"
+    assert queue.stats["runs"] == 2 and queue.stats["coalesced"] == 1
+
+
+def test_finished_run_is_not_joined():
+    async def scenario():
+        runner = GatedRunner()
+        runner.release.set()
+        queue, _ = await _started_queue(runner)
+        queue.submit("a", "AI for farmers")
+        await _settle()
+        later = queue.submit("b", "AI for farmers")
+        await _settle()
+        await queue.stop()
+        return runner, later
+
+    runner, later = asyncio.run(scenario())
+    assert later.coalesced_with is None
+    assert len(runner.started) == 2
+
+
+def test_client_limit_rejects_with_429():
+    async def scenario():
+        runner = GatedRunner()
+        queue, _ = await _started_queue(runner, num_workers=1, max_per_client=2)
+        queue.submit("a", "query one", client_id="10.0.0.1")
+        queue.submit("b", "query two", client_id="10.0.0.1")
+        with pytest.raises(AdmissionError) as rejected:
+            queue.submit("c", "query three", client_id="10.0.0.1")
+        # Other clients and duplicates of an in-flight run are still admitted
+        queue.submit("d", "query three", client_id="10.0.0.2")
+        follower = queue.submit("e", "query one", client_id="10.0.0.1")
+
+        runner.release.set()
+        await _settle()
+        # Finished runs free the client's slots
+        queue.submit("f", "query four", client_id="10.0.0.1")
+        await queue.stop()
+        return queue, rejected.value, follower
+
+    queue, error, follower = asyncio.run(scenario())
+    assert error.status_code == 429 and error.retry_after >= 1
+    assert follower.coalesced_with == "a"
+    assert queue.stats["rejected_client_limit"] == 1
+
+
+def test_full_queue_rejects_with_503():
+    async def scenario():
+        runner = GatedRunner()
+        queue, _ = await _started_queue(runner, num_workers=1, max_queue_size=1)
+        queue.submit("a", "query one")
+        await _settle()  # a is running, the queue is empty again
+        queue.submit("b", "query two")
+        with pytest.raises(AdmissionError) as rejected:
+            queue.submit("c", "query three")
+        runner.release.set()
+        await _settle()
+        await queue.stop()
+        return queue, rejected.value
+
+    queue, error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert queue.stats["rejected_queue_full"] == 1
+    assert queue.stats["runs"] == 2
+
+
+def test_completion_callback_runs_off_the_event_loop():
+    async def scenario():
+        runner = GatedRunner()
+        runner.release.set()
+        threads = []
+        queue = AnalysisJobQueue(runner, lambda job, result: threads.append(threading.get_ident()))
+        await queue.start()
+        job = queue.submit("a", "AI for farmers")
+        await _settle()
+        await queue.stop()
+        return threads, job
+
+    threads, job = asyncio.run(scenario())
+    assert job.status == "done"
+    assert len(threads) == 1 and threads[0] != threading.get_ident()
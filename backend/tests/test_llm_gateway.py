@@ -0,0 +1,259 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import httpx
+import openai
+import pytest
+from app.utils import llm_gateway as gateway_module
+from app.utils.llm_cache import LLMCache
+from app.utils.llm_gateway import LLMGateway, LLMStreamInterrupted, _retry_delay
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StubStream:
+    """Yields `parts`, then stalls past the gateway timeout or raises `error`, if given"""
+
+    def __init__(self, parts, stall=False, error=None):
+        self.parts = list(parts)
+        self.stall = stall
+        self.error = error
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.parts:
+            return _chunk(self.parts.pop(0))
+        if self.stall:
+            await asyncio.sleep(10)
+        if self.error is not None:
+            raise self.error
+        raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+class StubCompletions:
+    """chat.completions stand-in that opens the scripted streams in turn"""
+
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.opened = []
+
+    async def create(self, **request):
+        stream = self.streams[len(self.opened)]
+        self.opened.append(stream)
+        return stream
+
+
+def _gateway(streams):
+    gateway = LLMGateway(
+        api_key="test",
+        base_url="http://llm.invalid",
+        cache=LLMCache(db_path=":memory:"),
+        timeout=0.2,
+        max_retries=2,
+    )
+    completions = StubCompletions(streams)
+    gateway.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return gateway, completions
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(gateway_module, "_retry_delay", lambda attempt, error: 0)
+
+
+def _stream(gateway, deltas, **request):
+    request = {"model": "test-model", "messages": [{"role": "user", "content": "hi"}], "temperature": 0, **request}
+    return asyncio.run(gateway.stream_chat("test", deltas.append, **request))
+
+
+def test_stall_after_partial_output_is_not_retried():
+    gateway, completions = _gateway([StubStream(["Hel"], stall=True), StubStream(["Hel", "lo"])])
+    deltas = []
+
+    with pytest.raises(LLMStreamInterrupted):
+        _stream(gateway, deltas)
+
+    assert deltas == ["Hel"]
+    assert len(completions.opened) == 1
+    assert completions.opened[0].closed
+    assert gateway.cache.snapshot()["stores"] == 0
+
+
+def test_error_after_partial_output_is_not_retried():
+    error = openai.APIConnectionError(request=httpx.Request("POST", "http://llm.invalid"))
+    gateway, completions = _gateway([StubStream(["Hel"], error=error), StubStream(["Hel", "lo"])])
+    deltas = []
+
+    with pytest.raises(LLMStreamInterrupted):
+        _stream(gateway, deltas)
+
+    assert deltas == ["Hel"]
+    assert len(completions.opened) == 1
+
+
+def test_failure_before_first_delta_is_retried_and_cached():
+    gateway, completions = _gateway([StubStream([], stall=True), StubStream(["Hel", "lo"])])
+    deltas = []
+
+    assert _stream(gateway, deltas) == "Hello"
+    assert deltas == ["Hel", "lo"]
+    assert len(completions.opened) == 2
+    assert completions.opened[0].closed
+
+    # The completed answer is replayed from the cache as a single delta
+    replayed = []
+    assert _stream(gateway, replayed) == "Hello"
+    assert replayed == ["Hello"]
+    assert len(completions.opened) == 2
+
+
+def test_sampled_stream_is_not_cached():
+    gateway, completions = _gateway([StubStream(["a"]), StubStream(["b"])])
+
+    assert _stream(gateway, [], temperature=0.7) == "a"
+    assert _stream(gateway, [], temperature=0.7) == "b"
+    assert gateway.cache.snapshot()["stores"] == 0
+
+
+def _completion_body(content):
+    return {
+        "id": "stub", "object": "chat.completion", "created": 0, "model": "test-model",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    }
+
+
+def _mock_gateway(handler, **options):
+    """A gateway whose connection pool is replaced by an httpx.MockTransport running `handler`"""
+    options = {"timeout": 5, "max_retries": 2, **options}
+    return LLMGateway(api_key="test", base_url="http://llm.test/v1", transport=httpx.MockTransport(handler), **options)
+
+
+def _chat(gateway, model="test-model"):
+    return gateway.chat("test", model=model, messages=[{"role": "user", "content": "hi"}])
+
+
+def test_chat_retries_transient_errors_then_succeeds():
+    statuses = [429, 503]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if statuses:
+            return httpx.Response(statuses.pop(0), json={"error": {"message": "busy"}})
+        return httpx.Response(200, json=_completion_body("ok"))
+
+    response = asyncio.run(_chat(_mock_gateway(handler)))
+
+    assert response.choices[0].message.content == "ok"
+    assert len(requests) == 3
+
+
+def test_chat_gives_up_after_max_retries_and_never_retries_client_errors():
+    requests = []
+
+    def throttled(request):
+        requests.append(request)
+        return httpx.Response(429, json={"error": {"message": "slow down"}})
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(_chat(_mock_gateway(throttled, max_retries=2)))
+    assert len(requests) == 3
+
+    requests.clear()
+
+    def rejected(request):
+        requests.append(request)
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(_chat(_mock_gateway(rejected)))
+    assert len(requests) == 1
+
+
+def test_retry_delay_honours_retry_after_and_caps_the_backoff():
+    # _retry_delay was imported before the autouse fixture swapped it out
+    request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+
+    def rate_limited(retry_after):
+        headers = {"retry-after": retry_after} if retry_after else {}
+        return openai.RateLimitError("busy", response=httpx.Response(429, headers=headers, request=request), body=None)
+
+    assert _retry_delay(0, rate_limited("3")) == 3
+    assert _retry_delay(0, rate_limited("600")) == gateway_module.BACKOFF_MAX_SECONDS
+    # Full jitter: anywhere up to base * 2^attempt, never above the cap
+    for attempt in range(10):
+        delay = _retry_delay(attempt, rate_limited(None))
+        assert 0 <= delay <= min(gateway_module.BACKOFF_MAX_SECONDS, 2 ** attempt)
+
+
+def test_rate_limit_is_per_model_and_does_not_block_other_models():
+    requested = []
+
+    def handler(request):
+        requested.append(json.loads(request.content)["model"])
+        return httpx.Response(200, json=_completion_body("ok"))
+
+    # 6 requests/minute leaves a burst of one; one slot means a throttled call
+    # holding it would stall everything else
+    gateway = _mock_gateway(handler, max_concurrency=1, rpm_overrides={"slow-model": 6})
+
+    async def scenario():
+        await _chat(gateway, "slow-model")
+        throttled = asyncio.create_task(_chat(gateway, "slow-model"))
+        await asyncio.wait_for(_chat(gateway, "fast-model"), timeout=1)
+        done = throttled.done()
+        throttled.cancel()
+        return done
+
+    assert asyncio.run(scenario()) is False
+    assert requested == ["slow-model", "fast-model"]
+    assert gateway._bucket("slow-model") is not gateway._bucket("fast-model")
+
+
+def test_concurrency_cap_bounds_calls_in_flight():
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json=_completion_body("ok"))
+
+    gateway = _mock_gateway(handler, max_concurrency=2, requests_per_minute=6000)
+
+    async def scenario():
+        return await asyncio.gather(*(_chat(gateway) for _ in range(6)))
+
+    assert len(asyncio.run(scenario())) == 6
+    assert in_flight["peak"] == 2
+
+
+def test_calls_share_one_pooled_client():
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        return httpx.Response(200, json=_completion_body("ok"))
+
+    gateway = _mock_gateway(handler)
+
+    async def scenario():
+        await asyncio.gather(*(_chat(gateway) for _ in range(3)))
+
+    asyncio.run(scenario())
+    # Every call went out through the gateway's own client and transport
+    assert gateway.client._client is gateway.http_client
+    assert hosts == ["llm.test"] * 3
+
+    # Without a transport the pool is sized by max_connections
+    pooled = LLMGateway(api_key="test", base_url="http://llm.test/v1", max_connections=7)
+    assert pooled.http_client._transport._pool._max_connections == 7
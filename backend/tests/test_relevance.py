@@ -0,0 +1,100 @@
+import pytest
+from app.tools.relevance import RelevanceRanker, estimate_tokens
+
+
+def _doc(name, description="", **fields):
+    return {"name": name, "description": description, "url": f"https://example.com/{name.lower()}", **fields}
+
+
+def _names(docs):
+    return [doc["name"] for doc in docs]
+
+
+def test_bm25_ranks_matching_title_then_more_terms_first():
+    docs = [
+        _doc("Acme", "Payroll for restaurants"),
+        _doc("Trialist", "Recruiting software for clinical research"),
+        _doc("Hub", "Clinical trials software for sponsors"),
+        _doc("Clinical Trials", "Software for sponsors"),
+    ]
+
+    kept, _ = RelevanceRanker().select("clinical trials", docs)
+
+    # Title terms outweigh the same terms in a description; both terms beat one
+    assert _names(kept) == ["Clinical Trials", "Hub", "Trialist", "Acme"]
+    assert kept[0]["relevance_score"] > kept[1]["relevance_score"] > kept[2]["relevance_score"] > 0
+    assert kept[3]["relevance_score"] == 0
+
+
+def test_rare_terms_weigh_more_than_common_ones():
+    docs = [_doc(f"Filler {i}", "ai platform") for i in range(8)] + [
+        _doc("Dentr", "scheduling for dentists"),
+        _doc("Aiplat", "ai platform ai platform"),
+    ]
+
+    kept, _ = RelevanceRanker().select("ai dentists", docs)
+
+    assert kept[0]["name"] == "Dentr"
+
+
+def test_ties_and_unmatched_documents_keep_search_order():
+    docs = [_doc("B", "unrelated"), _doc("A", "dental ai"), _doc("C", "dental ai"), _doc("D", "unrelated")]
+
+    kept, _ = RelevanceRanker().select("dental", docs)
+
+    assert _names(kept) == ["A", "C", "B", "D"]
+
+
+@pytest.mark.parametrize("query", ["", "the and of", "!!!"])
+def test_query_without_terms_keeps_search_order(query):
+    docs = [_doc("B"), _doc("A"), _doc("C")]
+
+    kept, report = RelevanceRanker(top_k=2).select(query, docs)
+
+    assert _names(kept) == ["B", "A"]
+    assert all(doc["relevance_score"] == 0 for doc in kept)
+    assert report["documents_kept"] == 2
+
+
+def test_empty_corpus():
+    ranker = RelevanceRanker()
+    assert len(ranker.scores("clinical trials", [])) == 0
+
+    kept, report = ranker.select("clinical trials", [])
+
+    assert kept == []
+    assert report["documents_considered"] == report["documents_kept"] == report["estimated_tokens"] == 0
+
+
+def test_top_k_keeps_the_best_documents():
+    docs = [_doc(f"Doc {i}", "dental " * i) for i in range(10)]
+
+    kept, report = RelevanceRanker(top_k=3, token_budget=0).select("dental", docs)
+
+    assert len(kept) == 3
+    assert all(doc["relevance_score"] > 0 for doc in kept)
+    assert report["top_k"] == 3 and report["token_budget"] is None
+
+
+def test_token_budget_skips_a_large_document_for_smaller_ones():
+    docs = [_doc("Big", "dental " * 400), _doc("Small", "dental clinic"), _doc("Tiny", "dental")]
+    small = estimate_tokens({**docs[1], "relevance_score": 0.0}) + estimate_tokens({**docs[2], "relevance_score": 0.0})
+
+    kept, report = RelevanceRanker(top_k=0, token_budget=small + 5).select("dental", docs)
+
+    assert "Big" not in _names(kept)
+    assert sorted(_names(kept)) == ["Small", "Tiny"]
+    assert report["estimated_tokens"] <= small + 5
+
+
+@pytest.mark.parametrize("top_k, token_budget", [(0, 0), (3, 0), (0, 100), (5, 300), (50, 12000)])
+def test_selection_never_exceeds_the_retrieved_documents(top_k, token_budget):
+    docs = [_doc(f"Doc {i}", "dental clinic software " * (i % 4)) for i in range(20)]
+
+    kept, report = RelevanceRanker(top_k=top_k, token_budget=token_budget).select("dental software", docs)
+
+    assert report["documents_kept"] == len(kept) <= report["documents_considered"] == len(docs)
+    if top_k:
+        assert len(kept) <= top_k
+    if token_budget:
+        assert report["estimated_tokens"] <= token_budget
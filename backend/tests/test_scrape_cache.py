@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.tools import web_tools
+from app.utils import scrape_cache as scrape_cache_module
+from app.utils.scrape_cache import ScrapeCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock of the scrape cache, moved by hand"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(scrape_cache_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_entry_goes_fresh_then_stale_then_expired(clock):
+    cache = ScrapeCache(db_path=":memory:", stale_ttl=100)
+    key = cache.make_key("YC", "AI  for Farmers", 5)
+    cache.set(key, [{"name": "Acme"}], ttl=60)
+
+    assert cache.get(key) == ([{"name": "Acme"}], True)
+    clock[0] += 60
+    assert cache.get(key) == ([{"name": "Acme"}], False)
+    clock[0] += 100
+    assert cache.get(key) is None
+    assert cache.snapshot()["fresh_hits"] == cache.snapshot()["stale_hits"] == cache.snapshot()["misses"] == 1
+
+
+def test_key_ignores_case_and_spacing_but_not_source_or_limit():
+    make_key = ScrapeCache.make_key
+    assert make_key("YC", "AI  for Farmers ", 5) == make_key("YC", "ai for farmers", 5)
+    assert make_key("YC", "ai", 5) != make_key("T-Hub", "ai", 5)
+    assert make_key("YC", "ai", 5) != make_key("YC", "ai", 10)
+
+
+def test_entries_outlive_the_memory_lru_on_disk(clock):
+    cache = ScrapeCache(db_path=":memory:", max_memory_entries=1)
+    cache.set("a", [1], ttl=60)
+    cache.set("b", [2], ttl=60)
+
+    assert cache.snapshot()["memory_entries"] == 1
+    assert cache.get("a") == ([1], True)
+
+
+def test_zero_ttl_is_not_stored(clock):
+    cache = ScrapeCache(db_path=":memory:")
+    cache.set("a", [1], ttl=0)
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def live(monkeypatch, clock):
+    """Scrape cache and live fetch stand-ins for acached_fetch; `live.results` is what the source returns next"""
+    cache = ScrapeCache(db_path=":memory:", ttls={"YC": 60}, stale_ttl=600)
+    live = SimpleNamespace(cache=cache, calls=0, results=[{"name": "v1"}], release=None)
+
+    async def fetch(source, connector, query, limit, fresh=False):
+        live.calls += 1
+        if live.release is not None:
+            await live.release.wait()
+        return live.results
+
+    monkeypatch.setattr(web_tools, "scrape_cache", cache)
+    monkeypatch.setattr(web_tools, "_afetch_live", fetch)
+    return live
+
+
+def test_stale_hit_is_served_at_once_and_refreshed_once_in_the_background(live, clock):
+    async def scenario():
+        assert await web_tools.acached_fetch("YC", None, "ai", 5) == [{"name": "v1"}]
+        clock[0] += 61
+        live.results = [{"name": "v2"}]
+        live.release = asyncio.Event()
+
+        # Both callers get the stale copy; only one refresh runs
+        first = await web_tools.acached_fetch("YC", None, "ai", 5)
+        second = await web_tools.acached_fetch("YC", None, "ai", 5)
+        await asyncio.sleep(0)
+        refreshing = live.cache.snapshot()["refreshing"]
+        live.release.set()
+        await asyncio.gather(*web_tools._refresh_tasks)
+        return first, second, refreshing, await web_tools.acached_fetch("YC", None, "ai", 5)
+
+    first, second, refreshing, refreshed = asyncio.run(scenario())
+    assert first == second == [{"name": "v1"}]
+    assert refreshing == 1
+    assert refreshed == [{"name": "v2"}]
+    assert live.calls == 2
+    assert live.cache.snapshot()["refreshes"] == 1
+
+
+def test_fresh_fetch_skips_the_cache_and_empty_results_are_not_stored(live):
+    asyncio.run(web_tools.acached_fetch("YC", None, "ai", 5))
+    asyncio.run(web_tools.acached_fetch("YC", None, "ai", 5, fresh=True))
+    assert live.calls == 2
+
+    live.results = []
+    asyncio.run(web_tools.acached_fetch("YC", None, "nothing", 5))
+    asyncio.run(web_tools.acached_fetch("YC", None, "nothing", 5))
+    assert live.calls == 4
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.agents import web_intel_agent
+from app.tools import web_tools
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Three stub sources that answer after their delay (seconds) and log when they finish"""
+    delays = {"A": 0.1, "B": 0.01, "C": 0.05}
+    finished = []
+
+    async def fetch(name, connector, query, limit, fresh):
+        await asyncio.sleep(delays[name])
+        finished.append(name)
+        return [{"source": name, "name": f"{name} startup"}], None
+
+    monkeypatch.setattr(web_tools, "_search_connectors", lambda limit, sources=None: [(name, None, limit) for name in delays])
+    monkeypatch.setattr(web_tools, "_afetch_source", fetch)
+    # Progress events are not under test (and the first one imports langgraph)
+    monkeypatch.setattr(web_tools, "emit_progress", lambda event: None)
+    return SimpleNamespace(delays=delays, finished=finished)
+
+
+async def _collect(**options):
+    return [source async for source, _ in web_tools.astream_search_all("ai", **options)]
+
+
+def test_sources_stream_in_as_they_finish(sources):
+    assert asyncio.run(_collect()) == ["B", "C", "A"]
+
+
+def test_first_k_stops_early_and_stragglers_keep_going(sources):
+    async def scenario():
+        reported = await _collect(first_k=2)
+        await asyncio.sleep(0.1)
+        return reported
+
+    assert asyncio.run(scenario()) == ["B", "C"]
+    # The straggler still finished in the background to fill the cache
+    assert sources.finished == ["B", "C", "A"]
+
+
+def test_deadline_leaves_slow_sources_out(sources):
+    sources.delays["A"] = 1.0
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        reported = await _collect(deadline=0.08)
+        return reported, loop.time() - started
+
+    reported, elapsed = asyncio.run(scenario())
+    assert reported == ["B", "C"]
+    assert elapsed < 0.5
+
+
+def _response(content=None, arguments=None):
+    tool_calls = [SimpleNamespace(function=SimpleNamespace(arguments=json.dumps(arguments)))] if arguments else None
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """web_intel_agent with a stub LLM and summary; a `gate` event holds the summary until set"""
+    summary = SimpleNamespace(documents=[], cancelled=False, gate=None)
+
+    async def chat(call_site, **request):
+        if call_site == "web_intel_tool_call":
+            return _response(arguments={"query": "ai for dentists", "limit": 5})
+        return _response(content="final answer")
+
+    async def synthesize_summary(query, documents):
+        summary.documents.append([doc["name"] for doc in documents])
+        try:
+            if summary.gate is not None:
+                await summary.gate.wait()
+        except asyncio.CancelledError:
+            summary.cancelled = True
+            raise
+        return {"summary": "ok"}
+
+    monkeypatch.setattr(web_intel_agent.llm_gateway, "chat", chat)
+    monkeypatch.setattr(web_intel_agent, "synthesize_summary", synthesize_summary)
+    monkeypatch.setattr(web_intel_agent.settings, "SEARCH_FIRST_K", 2)
+    return summary
+
+
+def _stream_of(*sources, error=None):
+    async def stream(query, limit, types=None, fresh=False, **options):
+        for name in sources:
+            yield name, [{"source": name, "name": f"{name} startup", "description": "ai for dentists"}]
+        if error is not None:
+            # Lets the early summary start before the search fails
+            await asyncio.sleep(0)
+            raise error
+    return stream
+
+
+def test_summary_starts_on_the_first_k_sources(monkeypatch, agent):
+    monkeypatch.setattr(web_intel_agent, "astream_search_all", _stream_of("YC", "Devpost", "T-Hub"))
+
+    result = asyncio.run(web_intel_agent.handle_user_query("AI for dentists"))
+
+    # One summary, written from the first two sources; the final prompt has all three
+    assert agent.documents == [["YC startup", "Devpost startup"]]
+    assert result["documents_retrieved"] == 3
+    assert result["documents_selected"] <= result["documents_retrieved"]
+    assert result["result"] == "final answer"
+
+
+def test_failed_search_cancels_the_early_summary(monkeypatch, agent):
+    monkeypatch.setattr(web_intel_agent, "astream_search_all", _stream_of("YC", "Devpost", error=RuntimeError("boom")))
+
+    async def scenario():
+        agent.gate = asyncio.Event()
+        with pytest.raises(RuntimeError):
+            await web_intel_agent.handle_user_query("AI for dentists")
+        await asyncio.sleep(0)
+        # Checked while the loop still runs, before asyncio.run cancels leftovers
+        return agent.cancelled
+
+    assert asyncio.run(scenario())
+    assert agent.documents == [["YC startup", "Devpost startup"]]
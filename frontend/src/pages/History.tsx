@@ -1,14 +1,37 @@
+import { useEffect, useState } from "react";
+import { useNavigate } from "react-router-dom";
 import DashboardLayout from "@/components/layout/DashboardLayout";
 import { Card } from "@/components/ui/card";
+import { Button } from "@/components/ui/button";
 import { Clock, FileText } from "lucide-react";
-
-const mockHistory = [
-  { id: 1, title: "Market Analysis Q4 2025", date: "2 hours ago" },
-  { id: 2, title: "Customer Sentiment Report", date: "Yesterday" },
-  { id: 3, title: "Supply Chain Optimization", date: "3 days ago" },
-];
+import api from "@/services/api";
 
 const History = () => {
+  const navigate = useNavigate();
+  const [items, setItems] = useState([]);
+  // null once the last page has been loaded
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+
+  const loadPage = async (cursor = null) => {
+    setLoading(true);
+    try {
+      const page = await api.getHistory(cursor);
+      setItems((current) => (cursor ? [...current, ...page.items] : page.items));
+      setNextCursor(page.next_cursor);
+      setError(null);
+    } catch (e) {
+      setError(e.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    loadPage();
+  }, []);
+
   return (
     <DashboardLayout>
       <div className="max-w-4xl mx-auto">
@@ -22,10 +45,15 @@ const History = () => {
         </div>
 
         <div className="space-y-4">
-          {mockHistory.map((item) => (
+          {error && <p className="text-sm text-destructive">{error}</p>}
+          {!loading && !error && items.length === 0 && (
+            <p className="text-sm text-muted-foreground">No analyses yet</p>
+          )}
+          {items.map((item) => (
             <Card
-              key={item.id}
+              key={item.analysis_id}
               className="p-4 bg-card border-border hover:border-primary/50 transition-colors cursor-pointer group"
+              onClick={() => navigate(`/report?id=${item.analysis_id}`)}
             >
               <div className="flex items-center gap-4">
                 <div className="w-10 h-10 rounded-lg bg-primary/10 flex items-center justify-center group-hover:bg-primary/20 transition-colors">
@@ -33,16 +61,21 @@ const History = () => {
                 </div>
                 <div className="flex-1">
                   <h3 className="font-medium text-foreground group-hover:text-primary transition-colors">
-                    {item.title}
+                    {item.query}
                   </h3>
                   <div className="flex items-center gap-1 text-sm text-muted-foreground">
                     <Clock className="w-3 h-3" />
-                    <span>{item.date}</span>
+                    <span>{new Date(item.timestamp).toLocaleString()}</span>
                   </div>
                 </div>
               </div>
             </Card>
           ))}
+          {nextCursor && (
+            <Button variant="outline" onClick={() => loadPage(nextCursor)} disabled={loading}>
+              {loading ? "Loading..." : "Load more"}
+            </Button>
+          )}
         </div>
       </div>
     </DashboardLayout>
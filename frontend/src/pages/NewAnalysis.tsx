@@ -1,14 +1,28 @@
+import { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import DashboardLayout from "@/components/layout/DashboardLayout";
 import { Textarea } from "@/components/ui/textarea";
 import { Button } from "@/components/ui/button";
 import { Sparkles } from "lucide-react";
+import { toast } from "@/hooks/use-toast";
+import api from "@/services/api";
 
 const NewAnalysis = () => {
   const navigate = useNavigate();
+  const [query, setQuery] = useState("");
+  const [submitting, setSubmitting] = useState(false);
 
-  const handleGenerateReport = () => {
-    navigate("/loading");
+  const handleGenerateReport = async () => {
+    if (!query.trim()) return;
+    setSubmitting(true);
+    try {
+      // 202 Accepted: the analysis is queued, progress is followed on /loading
+      const { analysis_id } = await api.submitAnalysis(query);
+      navigate(`/loading?id=${analysis_id}`);
+    } catch (error) {
+      toast({ title: "Could not start the analysis", description: error.message, variant: "destructive" });
+      setSubmitting(false);
+    }
   };
 
   return (
@@ -27,13 +41,15 @@ const NewAnalysis = () => {
           <div className="bg-card rounded-lg p-1">
             <Textarea
               placeholder="Describe the real-world problem you want to analyze..."
+              value={query}
+              onChange={(e) => setQuery(e.target.value)}
               className="min-h-[200px] bg-transparent border-0 resize-none focus-visible:ring-0 text-foreground placeholder:text-muted-foreground"
             />
           </div>
         </div>
 
         <div className="mt-6 flex justify-start">
-          <Button size="lg" className="gap-2 font-medium" onClick={handleGenerateReport}>
+          <Button size="lg" className="gap-2 font-medium" onClick={handleGenerateReport} disabled={submitting || !query.trim()}>
             <Sparkles className="w-4 h-4" />
             Generate Report
           </Button>
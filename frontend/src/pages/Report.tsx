@@ -2,9 +2,21 @@ import DashboardLayout from "@/components/layout/DashboardLayout";
 import { Card } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { ArrowLeft, Download, Share2 } from "lucide-react";
-import { Link } from "react-router-dom";
+import { Link, useSearchParams } from "react-router-dom";
+import { useEffect, useState } from "react";
+import api from "@/services/api";
 
 const Report = () => {
+  const [searchParams] = useSearchParams();
+  const analysisId = searchParams.get("id");
+  const [report, setReport] = useState(null);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    if (!analysisId) return;
+    api.getReport(analysisId).then(setReport).catch((e) => setError(e.message));
+  }, [analysisId]);
+
   return (
     <DashboardLayout>
       <div className="max-w-4xl mx-auto">
@@ -19,7 +31,9 @@ const Report = () => {
               <h1 className="font-display text-2xl font-bold">
                 Analysis <span className="gradient-text">Report</span>
               </h1>
-              <p className="text-sm text-muted-foreground">Generated just now</p>
+              <p className="text-sm text-muted-foreground">
+                {report ? new Date(report.timestamp).toLocaleString() : "Generated just now"}
+              </p>
             </div>
           </div>
           <div className="flex gap-2">
@@ -36,10 +50,21 @@ const Report = () => {
 
         <Card className="p-6 bg-card border-border">
           <h2 className="font-display text-xl font-semibold mb-4">Summary</h2>
-          <p className="text-muted-foreground leading-relaxed">
-            Your analysis has been completed successfully. This is where the AI-generated insights 
-            and recommendations will appear based on your input problem statement.
-          </p>
+          {error ? (
+            <p className="text-destructive">{error}</p>
+          ) : report ? (
+            <>
+              <p className="font-medium text-foreground mb-3">{report.query}</p>
+              <pre className="text-muted-foreground leading-relaxed whitespace-pre-wrap font-sans">
+                {typeof report.result === "string" ? report.result : JSON.stringify(report.result, null, 2)}
+              </pre>
+            </>
+          ) : (
+            <p className="text-muted-foreground leading-relaxed">
+              Your analysis has been completed successfully. This is where the AI-generated insights 
+              and recommendations will appear based on your input problem statement.
+            </p>
+          )}
         </Card>
 
         <Card className="p-6 bg-card border-border mt-4">
@@ -1,17 +1,53 @@
-import { useEffect } from "react";
-import { useNavigate } from "react-router-dom";
+import { useEffect, useState } from "react";
+import { useNavigate, useSearchParams } from "react-router-dom";
 import { Brain, Sparkles } from "lucide-react";
+import api from "@/services/api";
 
 const Progress = () => {
   const navigate = useNavigate();
+  const [searchParams] = useSearchParams();
+  const analysisId = searchParams.get("id");
+  // Pipeline stages in the order they started, from the progress stream
+  const [stages, setStages] = useState([]);
+  const [error, setError] = useState(null);
 
   useEffect(() => {
-    const timer = setTimeout(() => {
-      navigate("/report");
-    }, 3000);
+    if (!analysisId) {
+      navigate("/");
+      return;
+    }
+    let active = true;
+    // Closes the progress stream and stops polling when the page unmounts
+    const controller = new AbortController();
 
-    return () => clearTimeout(timer);
-  }, [navigate]);
+    const onEvent = (event) => {
+      if (!active) return;
+      if (event.event === "node_started") {
+        setStages((current) =>
+          current.some((stage) => stage.node === event.node) ? current : [...current, { node: event.node, done: false }]
+        );
+      } else if (event.event === "node_finished") {
+        setStages((current) => current.map((stage) => (stage.node === event.node ? { ...stage, done: true } : stage)));
+      }
+    };
+
+    api
+      .waitForAnalysis(analysisId, onEvent, controller.signal)
+      .then((status) => {
+        if (!active) return;
+        if (status.status === "done") {
+          navigate(`/report?id=${analysisId}`);
+        } else {
+          setError(status.error || "Analysis failed");
+        }
+      })
+      .catch((e) => active && setError(e.message));
+
+    return () => {
+      active = false;
+      controller.abort();
+    };
+  }, [analysisId, navigate]);
 
   return (
     <div className="min-h-screen bg-background flex items-center justify-center">
@@ -44,15 +80,17 @@ const Progress = () => {
 
         {/* Loading Steps */}
         <div className="mt-8 space-y-2 text-sm text-muted-foreground">
-          <p className="animate-fade-in" style={{ animationDelay: "0.5s" }}>
-            ✓ Understanding context...
-          </p>
-          <p className="animate-fade-in" style={{ animationDelay: "1s" }}>
-            ✓ Generating insights...
-          </p>
-          <p className="animate-fade-in opacity-50" style={{ animationDelay: "1.5s" }}>
-            ○ Preparing report...
-          </p>
+          {error ? (
+            <p className="text-destructive">{error}</p>
+          ) : stages.length === 0 ? (
+            <p className="animate-fade-in">○ Waiting for a worker...</p>
+          ) : (
+            stages.map((stage) => (
+              <p key={stage.node} className={`animate-fade-in${stage.done ? "" : " opacity-50"}`}>
+                {stage.done ? "✓" : "○"} {stage.node.replace(/_/g, " ")}...
+              </p>
+            ))
+          )}
         </div>
       </div>
 
@@ -1,5 +1,10 @@
 // API configuration for NIRNAY.AI backend
-const API_BASE_URL = process.env.REACT_APP_API_URL || "http://localhost:8000";
+const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
+
+// Analyses run in the background: /analyze answers 202 with an analysis_id
+// and the run ends in one of these statuses
+const FINAL_STATUSES = ["done", "failed"];
+const STATUS_POLL_MS = 2000;
 
 // Helper function to make API calls
 const apiCall = async (endpoint, options = {}) => {
@@ -24,27 +29,95 @@ const apiCall = async (endpoint, options = {}) => {
   }
 };
 
+// Resolves with the final /status of an analysis. Follows its SSE progress
+// stream (every event goes to onEvent) and falls back to polling /status
+// when the stream is unavailable. Aborting `signal` closes the stream, stops
+// polling and rejects with an AbortError.
+const waitForAnalysis = (analysisId, onEvent = null, signal = null) =>
+  new Promise((resolve, reject) => {
+    const aborted = () => reject(new DOMException("Analysis wait aborted", "AbortError"));
+    if (signal?.aborted) {
+      aborted();
+      return;
+    }
+    let pollTimer = null;
+
+    const poll = async () => {
+      try {
+        const status = await apiCall(`/status/${analysisId}`, { signal });
+        if (FINAL_STATUSES.includes(status.status)) {
+          resolve(status);
+        } else if (!signal?.aborted) {
+          pollTimer = setTimeout(poll, STATUS_POLL_MS);
+        }
+      } catch (error) {
+        reject(error);
+      }
+    };
+
+    const source = new EventSource(`${API_BASE_URL}/analyze/${analysisId}/events`);
+    signal?.addEventListener(
+      "abort",
+      () => {
+        source.close();
+        clearTimeout(pollTimer);
+        aborted();
+      },
+      { once: true }
+    );
+    const handle = (message) => {
+      const event = JSON.parse(message.data);
+      if (onEvent) onEvent(event);
+      if (event.event === "status" && FINAL_STATUSES.includes(event.status)) {
+        source.close();
+        // /status carries the stage timings the event does not
+        poll();
+      }
+    };
+    ["status", "node_started", "node_finished", "source_done", "source_failed", "token"].forEach((name) =>
+      source.addEventListener(name, handle)
+    );
+    source.onerror = () => {
+      source.close();
+      poll();
+    };
+  });
+
 // API endpoints
 export const api = {
   // Health check
   health: () => apiCall("/"),
 
-  // Submit analysis
-  submitAnalysis: (query) =>
+  // Submit analysis; fresh=true re-scrapes sources instead of using cached results
+  submitAnalysis: (query, fresh = false) =>
     apiCall("/analyze", {
       method: "POST",
-      body: JSON.stringify({ query }),
+      body: JSON.stringify({ query, fresh }),
     }),
 
+  // Poll analysis progress (queued / running / done / failed)
+  getStatus: (analysisId) =>
+    apiCall(`/status/${analysisId}`, {
+      method: "GET",
+    }),
+
+  // Live progress events (Server-Sent Events); caller closes the source
+  streamEvents: (analysisId) =>
+    new EventSource(`${API_BASE_URL}/analyze/${analysisId}/events`),
+
+  // Wait for a submitted analysis to finish (see waitForAnalysis)
+  waitForAnalysis,
+
   // Get report
   getReport: (analysisId) =>
     apiCall(`/report/${analysisId}`, {
       method: "GET",
     }),
 
-  // Get history
-  getHistory: () =>
-    apiCall("/history", {
+  // Get one page of history ({ items, next_cursor }); pass the previous
+  // page's next_cursor to continue, next_cursor is null on the last page
+  getHistory: (cursor = null, limit = 20) =>
+    apiCall(`/history?limit=${limit}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""}`, {
       method: "GET",
     }),
 };